@@ -0,0 +1,215 @@
+# allocation_audit.py
+import gc
+import os
+import time
+import tracemalloc
+from collections import deque
+from frame_profiler import percentile
+from report_writer import write_report
+
+_active_audit = None # AllocationAudit yang sedang berjalan; dibaca oleh count_allocation()
+
+def count_allocation(name, count=1):
+    """
+    Penghitung eksplisit untuk objek yang dibuat di jalur per frame (Rect dari Camera.apply, Surface baru
+    dari cache teks/transformasi, salinan list sprite). Saat audit mati biayanya hanya satu cek None.
+    """
+    audit = _active_audit
+    if audit is not None:
+        counters = audit._frame_counters
+        counters[name] = counters.get(name, 0) + count
+
+
+class AllocationAudit:
+    """
+    Mode audit alokasi per frame, dipakai sebagai target "nol alokasi" untuk mengurangi tekanan GC.
+    Selama aktif, tracemalloc mencatat alokasi Python dan di akhir tiap frame snapshot dibandingkan dengan
+    snapshot frame sebelumnya; blok baru dikelompokkan per modul tempat alokasi terjadi (subsistem).
+    Snapshot hanya melihat objek yang masih hidup di akhir frame, jadi objek sementara terlihat lewat
+    penghitung count_allocation(), puncak memori di dalam frame dan jumlah koleksi GC (gc.callbacks).
+    Frame yang jumlah objeknya (blok baru + penghitung) atau puncak bytenya melewati ambang dicatat;
+    N laporan terakhir ditulis ke log saat berhenti (log ditimpa, jadi hanya berisi audit terakhir seperti
+    log watchdog) dan summary() merangkum rata-rata per state.
+    """
+    TOP_SUBSYSTEMS = 8
+
+    def __init__(self, threshold_objects=200, threshold_bytes=64 * 1024, trace_frames=1, max_reports=20, log_path=None):
+        self.threshold_objects = threshold_objects
+        self.threshold_bytes = threshold_bytes
+        self.trace_frames = trace_frames
+        self.log_path = log_path
+        self.reports = deque(maxlen=max_reports)
+        self.flagged_frames = 0
+        self.active = False
+        self._frame_counters = {}  # nama penghitung -> jumlah dalam frame berjalan
+        self._states = {}          # label state -> akumulasi per frame
+        self._previous = {}       # nama file -> (blok, byte) hidup di akhir frame sebelumnya
+        self._ignored_files = set()
+        self._started_tracemalloc = False
+        self._frame_open = False
+        self._frame_number = 0
+        self._frame_base_bytes = 0
+        self._gc_collections = [0, 0, 0]
+        self._gc_seconds = 0.0
+        self._gc_start = 0.0
+        self._started_at = None
+
+    def toggle(self):
+        if self.active: self.stop()
+        else: self.start()
+        return self.active
+
+    def start(self):
+        global _active_audit
+        if self.active: return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames); self._started_tracemalloc = True
+        # Alokasi milik tracemalloc/audit sendiri (snapshot, laporan) dan mesin impor bukan bagian dari game
+        self._ignored_files = {tracemalloc.__file__, __file__, "<frozen importlib._bootstrap>",
+                               "<frozen importlib._bootstrap_external>", "<unknown>"}
+        self._previous = self._live_blocks_by_file()
+        self._states = {}; self.reports.clear(); self.flagged_frames = 0; self._frame_number = 0
+        self._frame_counters.clear(); self._frame_open = False
+        self._started_at = time.time()
+        gc.callbacks.append(self._gc_callback)
+        self.active = True
+        _active_audit = self
+        print(f"--- AllocationAudit: Audit alokasi dimulai (ambang {self.threshold_objects} objek / {self.threshold_bytes // 1024} KB per frame). ---")
+
+    def stop(self, write_log=True):
+        global _active_audit
+        if not self.active: return
+        self.active = False
+        if _active_audit is self: _active_audit = None
+        if self._gc_callback in gc.callbacks: gc.callbacks.remove(self._gc_callback)
+        self._previous = {}
+        if self._started_tracemalloc:
+            tracemalloc.stop(); self._started_tracemalloc = False
+        print(f"--- AllocationAudit: Audit dihentikan setelah {self._frame_number} frame, {self.flagged_frames} frame melewati ambang. ---")
+        for line in self.format_summary(): print(f"    {line}")
+        if write_log and self.log_path and self.reports: self.write_log(self.log_path)
+
+    # --- Batas frame ---
+    def begin_frame(self):
+        if not self.active: return
+        self._frame_counters.clear()
+        self._gc_collections = [0, 0, 0]; self._gc_seconds = 0.0
+        tracemalloc.reset_peak()
+        self._frame_base_bytes = tracemalloc.get_traced_memory()[0]
+        self._frame_open = True
+
+    def end_frame(self, label=None):
+        """Membandingkan snapshot dengan frame sebelumnya; mengembalikan dict hasil frame (atau None jika audit mati)."""
+        if not self.active or not self._frame_open: return None
+        self._frame_open = False # Koleksi GC akibat snapshot di bawah tidak dihitung ke frame
+        transient_bytes = max(0, tracemalloc.get_traced_memory()[1] - self._frame_base_bytes)
+        current = self._live_blocks_by_file()
+        subsystems = {}; new_blocks = 0; new_bytes = 0
+        for filename, (count, size) in current.items():
+            previous_count, previous_size = self._previous.get(filename, (0, 0))
+            if count <= previous_count: continue
+            name = self._subsystem_name(filename)
+            blocks, total_size = subsystems.get(name, (0, 0))
+            size_diff = max(0, size - previous_size)
+            subsystems[name] = (blocks + count - previous_count, total_size + size_diff)
+            new_blocks += count - previous_count; new_bytes += size_diff
+        self._previous = current
+        self._frame_number += 1
+        counters = dict(self._frame_counters)
+        frame = {"frame": self._frame_number, "label": label, "objects": new_blocks + sum(counters.values()),
+                 "new_blocks": new_blocks, "new_bytes": new_bytes, "transient_bytes": transient_bytes,
+                 "gc_collections": tuple(self._gc_collections), "gc_ms": self._gc_seconds * 1000.0,
+                 "subsystems": subsystems, "counters": counters}
+        self._accumulate(frame)
+        if frame["objects"] > self.threshold_objects or transient_bytes > self.threshold_bytes:
+            self.flagged_frames += 1
+            frame["time"] = time.time()
+            self.reports.append(frame)
+            top = max(subsystems.items(), key=lambda item: item[1][0])[0] if subsystems else "-"
+            print(f"--- AllocationAudit: Frame #{frame['frame']} ({label}) {frame['objects']} objek, "
+                  f"puncak {transient_bytes / 1024:.1f} KB, GC {sum(frame['gc_collections'])}x, terbanyak: {top} ---")
+        return frame
+
+    def _live_blocks_by_file(self):
+        """Snapshot tracemalloc dikelompokkan per file (lebih murah daripada filter_traces per trace)."""
+        ignored = self._ignored_files
+        return {stat.traceback[0].filename: (stat.count, stat.size)
+                for stat in tracemalloc.take_snapshot().statistics('filename') if stat.traceback[0].filename not in ignored}
+
+    @staticmethod
+    def _subsystem_name(filename):
+        return os.path.splitext(os.path.basename(filename))[0] or filename
+
+    def _gc_callback(self, phase, info):
+        if not self._frame_open: return
+        if phase == "start": self._gc_start = time.perf_counter()
+        else:
+            self._gc_collections[info.get("generation", 0)] += 1
+            self._gc_seconds += time.perf_counter() - self._gc_start
+
+    def _accumulate(self, frame):
+        totals = self._states.get(frame["label"])
+        if totals is None:
+            totals = self._states[frame["label"]] = {"objects": [], "new_blocks": 0, "transient_bytes": 0, "gc_collections": [0, 0, 0],
+                                                     "gc_ms": 0.0, "flagged": 0, "subsystems": {}, "counters": {}}
+        totals["objects"].append(frame["objects"])
+        totals["new_blocks"] += frame["new_blocks"]; totals["transient_bytes"] += frame["transient_bytes"]
+        for generation, count in enumerate(frame["gc_collections"]): totals["gc_collections"][generation] += count
+        totals["gc_ms"] += frame["gc_ms"]
+        if frame["objects"] > self.threshold_objects or frame["transient_bytes"] > self.threshold_bytes: totals["flagged"] += 1
+        for name, (blocks, _) in frame["subsystems"].items(): totals["subsystems"][name] = totals["subsystems"].get(name, 0) + blocks
+        for name, count in frame["counters"].items(): totals["counters"][name] = totals["counters"].get(name, 0) + count
+
+    # --- Laporan ---
+    def summary(self):
+        """{state: {...}} dengan rata-rata per frame; dipakai headless_runner sebagai target yang bisa diukur."""
+        result = {}
+        for label, totals in self._states.items():
+            frames = len(totals["objects"]); objects = sorted(totals["objects"])
+            subsystems = sorted(totals["subsystems"].items(), key=lambda item: -item[1])[:self.TOP_SUBSYSTEMS]
+            result[label] = {
+                "frames": frames,
+                "objects_mean": sum(objects) / frames, "objects_p95": percentile(objects, 0.95), "objects_max": objects[-1],
+                "new_blocks_mean": totals["new_blocks"] / frames,
+                "transient_kb_mean": totals["transient_bytes"] / frames / 1024.0,
+                "gc_collections": list(totals["gc_collections"]), "gc_ms": totals["gc_ms"],
+                "flagged_frames": totals["flagged"],
+                "subsystems": {name: blocks / frames for name, blocks in subsystems},
+                "counters": {name: count / frames for name, count in sorted(totals["counters"].items(), key=lambda item: -item[1])},
+            }
+        return result
+
+    def format_summary(self):
+        lines = []
+        for label, values in self.summary().items():
+            lines.append(f"{label}: {values['frames']} frame, objek/frame rata-rata {values['objects_mean']:.1f} "
+                         f"(p95 {values['objects_p95']}, maks {values['objects_max']}), puncak {values['transient_kb_mean']:.1f} KB, "
+                         f"GC gen0/1/2 {'/'.join(str(count) for count in values['gc_collections'])} ({values['gc_ms']:.1f} ms), "
+                         f"{values['flagged_frames']} frame lewat ambang")
+            if values["counters"]:
+                lines.append("  Penghitung/frame: " + ", ".join(f"{name} {count:.1f}" for name, count in values["counters"].items()))
+            if values["subsystems"]:
+                lines.append("  Blok baru/frame: " + ", ".join(f"{name} {blocks:.1f}" for name, blocks in values["subsystems"].items()))
+        return lines
+
+    def format_reports(self):
+        reports = list(self.reports)
+        lines = [f"=== Fishing Mania: audit alokasi {time.strftime('%Y-%m-%d %H:%M:%S')} "
+                 f"(ambang {self.threshold_objects} objek / {self.threshold_bytes // 1024} KB, {self._frame_number} frame, "
+                 f"{self.flagged_frames} lewat ambang, {len(reports)} laporan terakhir) ==="]
+        lines.extend(self.format_summary())
+        for report in reports:
+            lines.append("")
+            lines.append(f"Frame #{report['frame']} state={report['label']} {report['objects']} objek "
+                         f"({report['new_blocks']} blok baru, {report['new_bytes'] / 1024:.1f} KB), puncak {report['transient_bytes'] / 1024:.1f} KB, "
+                         f"GC {'/'.join(str(count) for count in report['gc_collections'])} ({report['gc_ms']:.1f} ms) "
+                         f"({time.strftime('%H:%M:%S', time.localtime(report['time']))})")
+            subsystems = sorted(report["subsystems"].items(), key=lambda item: -item[1][0])[:self.TOP_SUBSYSTEMS]
+            if subsystems:
+                lines.append("  Subsistem: " + ", ".join(f"{name} {blocks} blok/{size / 1024:.1f} KB" for name, (blocks, size) in subsystems))
+            if report["counters"]:
+                lines.append("  Penghitung: " + ", ".join(f"{name} {count}" for name, count in sorted(report["counters"].items(), key=lambda item: -item[1])))
+        return "\n".join(lines) + "\n"
+
+    def write_log(self, path):
+        return write_report(path, self.format_reports(), "AllocationAudit", f"{len(self.reports)} laporan frame")
@@ -0,0 +1,91 @@
+# asset_cache.py
+import os
+import threading
+from collections import OrderedDict
+
+class AssetCache:
+    """
+    Cache surface bersama untuk seluruh proses, dipakai oleh Config.load_image.
+    Kunci: (path, scale, use_alpha). Surface yang dikembalikan DIBAGI oleh semua pemanggil,
+    jadi anggap read-only (gunakan .copy() jika ingin menggambar di atasnya).
+    Jika total byte melebihi budget, entri yang paling lama tidak dipakai dibuang (LRU).
+    """
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self._entries = OrderedDict() # key -> (surface, ukuran_byte)
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+
+    @staticmethod
+    def make_key(path, scale, use_alpha):
+        # scale bisa berupa faktor (float) atau ukuran target (lebar, tinggi)
+        if isinstance(scale, (tuple, list)):
+            scale_key = (int(scale[0]), int(scale[1]))
+        else:
+            scale_key = float(scale)
+        return (os.path.normpath(path), scale_key, bool(use_alpha))
+
+    @staticmethod
+    def surface_bytes(surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, surface):
+        size = self.surface_bytes(surface)
+        with self._lock:
+            old_entry = self._entries.pop(key, None)
+            if old_entry is not None:
+                self.bytes -= old_entry[1]
+            self._entries[key] = (surface, size)
+            self.bytes += size
+            self._evict_over_budget(keep_key=key)
+        return surface
+
+    def _evict_over_budget(self, keep_key=None):
+        # Entri yang baru dimasukkan tidak pernah dibuang, walau ukurannya sendiri melebihi budget
+        while self.bytes > self.budget_bytes and len(self._entries) > 1:
+            oldest_key = next(iter(self._entries))
+            if oldest_key == keep_key:
+                break
+            _, size = self._entries.pop(oldest_key)
+            self.bytes -= size
+            self.evictions += 1
+
+    def set_budget(self, budget_bytes):
+        with self._lock:
+            self.budget_bytes = budget_bytes
+            self._evict_over_budget()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+                "bytes": self.bytes,
+                "budget_bytes": self.budget_bytes,
+            }
@@ -0,0 +1,228 @@
+# audio_manager.py
+import os
+import sys
+import subprocess
+import threading
+from collections import OrderedDict
+import pygame
+
+class AudioManager:
+    """
+    Efek suara dan musik di satu tempat.
+    - SFX di-decode sekali menjadi Sound dan diputar lewat kumpulan channel yang dicadangkan
+      (pygame.mixer.set_reserved), dengan batas suara per efek dan prioritas: jika semua channel
+      terpakai, suara berprioritas lebih rendah (atau sama, yang tertua) dihentikan.
+    - Musik di-decode penuh menjadi Sound di latar belakang, lalu diputar bergantian di dua channel
+      musik sehingga bisa crossfade. Trek yang belum siap tidak menahan frame: musik lama tetap
+      jalan sampai trek baru selesai di-decode. SDL_mixer mengunci mixer selama decode, sehingga
+      play() di thread utama ikut menunggu; karena itu decode dikerjakan proses pembantu
+      (MUSIC_DECODE_SUBPROCESS) yang mengirim PCM mentah lewat pipe.
+    Jika mixer tidak aktif, semua metode menjadi no-op.
+    """
+    def __init__(self, config):
+        self.config = config
+        self.enabled = pygame.mixer.get_init() is not None
+        self.sfx_volume = config.SFX_VOLUME
+        self.music_volume = config.MUSIC_VOLUME
+        self.crossfade_ms = config.MUSIC_CROSSFADE_MS
+        self.max_voices_per_sfx = config.SFX_MAX_VOICES
+        self._sounds = {}                # nama efek -> Sound
+        self._voices = {}                # indeks channel -> (prioritas, urutan mulai, nama efek)
+        self._play_counter = 0
+        self._tracks = OrderedDict()     # nama file musik -> (Sound, byte); LRU
+        self._track_bytes = 0
+        self._decoding = set()
+        self._decode_queue = []
+        self._lock = threading.Lock()
+        self._worker_running = False
+        self.current_track = None        # Trek yang sedang (atau akan segera) diputar
+        self._pending_track = None       # Diminta tetapi belum selesai di-decode
+        self._music_channel_index = 0
+        self.stats_counters = {"sfx_played": 0, "sfx_dropped": 0, "sfx_stolen": 0, "tracks_decoded": 0, "track_evictions": 0}
+        if not self.enabled:
+            print("--- AudioManager: Mixer tidak aktif. Audio dinonaktifkan. ---")
+            return
+        sfx_channel_count = config.SFX_CHANNELS
+        total_channels = max(pygame.mixer.get_num_channels(), sfx_channel_count + 2 + 2)
+        pygame.mixer.set_num_channels(total_channels)
+        pygame.mixer.set_reserved(sfx_channel_count + 2) # Channel 0..n-1 untuk SFX, dua berikutnya untuk musik
+        self._sfx_channels = [pygame.mixer.Channel(i) for i in range(sfx_channel_count)]
+        self._music_channels = [pygame.mixer.Channel(sfx_channel_count), pygame.mixer.Channel(sfx_channel_count + 1)]
+        self.preload_sfx(config.SFX_FILES)
+
+    # --- Efek suara ---
+    def preload_sfx(self, sfx_files):
+        """Decode semua efek sekali (file kecil, dilakukan saat startup)."""
+        if not self.enabled: return
+        for name, filename in sfx_files.items():
+            sound = self.config.load_sound(os.path.join(self.config.SOUND_PATH, filename))
+            if sound is None:
+                print(f"--- AudioManager WARN: Efek '{name}' ({filename}) tidak bisa dimuat. ---")
+                continue
+            self._sounds[name] = sound
+
+    def _active_voices(self):
+        for index in [index for index, channel in enumerate(self._sfx_channels) if not channel.get_busy()]:
+            self._voices.pop(index, None)
+        return self._voices
+
+    def play_sfx(self, name, priority=0, volume=1.0):
+        """Memutar efek. Mengembalikan True jika diputar, False jika dibuang karena batas suara/prioritas."""
+        sound = self._sounds.get(name) if self.enabled else None
+        if sound is None: return False
+        voices = self._active_voices()
+        same_sound = sorted((voice[1], index) for index, voice in voices.items() if voice[2] == name)
+        if len(same_sound) >= self.max_voices_per_sfx:
+            target_index = same_sound[0][1] # Batas suara per efek: ganti suara tertua dari efek yang sama
+        else:
+            free = [index for index in range(len(self._sfx_channels)) if index not in voices]
+            if free: target_index = free[0]
+            else:
+                # Semua channel terpakai: curi yang prioritasnya paling rendah (tertua bila sama)
+                victim_index, victim = min(voices.items(), key=lambda item: (item[1][0], item[1][1]))
+                if victim[0] > priority:
+                    self.stats_counters["sfx_dropped"] += 1
+                    return False
+                target_index = victim_index
+                self.stats_counters["sfx_stolen"] += 1
+        channel = self._sfx_channels[target_index]
+        channel.stop()
+        channel.set_volume(self.sfx_volume * volume)
+        channel.play(sound)
+        self._play_counter += 1
+        voices[target_index] = (priority, self._play_counter, name)
+        self.stats_counters["sfx_played"] += 1
+        return True
+
+    # --- Musik ---
+    def prepare_music(self, filenames, replace_queued=False):
+        """
+        Menjadwalkan decode trek di thread latar belakang agar siap saat dibutuhkan. Dengan replace_queued,
+        trek lain yang masih antre (belum mulai di-decode) dibatalkan karena sudah tidak dibutuhkan; trek yang
+        sedang/akan diputar (current_track, _pending_track yang ditunggu update()) tidak pernah dibatalkan.
+        """
+        if not self.enabled: return
+        with self._lock:
+            if replace_queued:
+                keep = set(filenames) | {self.current_track, self._pending_track}
+                self._decode_queue = [filename for filename in self._decode_queue if filename in keep]
+            for filename in filenames:
+                if filename and filename not in self._tracks and filename not in self._decoding and filename not in self._decode_queue:
+                    self._decode_queue.append(filename)
+            if not self._decode_queue or self._worker_running: return
+            self._worker_running = True
+            threading.Thread(target=self._decode_worker, name="MusicDecode", daemon=True).start()
+
+    def _decode_worker(self):
+        while True:
+            with self._lock:
+                if not self._decode_queue:
+                    self._worker_running = False
+                    return
+                filename = self._decode_queue.pop(0)
+                self._decoding.add(filename)
+            path = os.path.join(self.config.SOUND_PATH, filename)
+            sound = self._decode_in_subprocess(path) if self.config.MUSIC_DECODE_SUBPROCESS else None
+            if sound is None: sound = self.config.load_sound(path) # Cadangan: decode di proses ini
+            with self._lock:
+                self._decoding.discard(filename)
+                if sound is None:
+                    print(f"--- AudioManager WARN: Musik '{path}' tidak bisa dimuat. ---")
+                    continue
+                size = self._sound_bytes(sound)
+                self._tracks[filename] = (sound, size)
+                self._track_bytes += size
+                self.stats_counters["tracks_decoded"] += 1
+                self._evict_tracks()
+
+    def _decode_in_subprocess(self, path):
+        """Decode di proses terpisah dengan format mixer yang sama. None jika gagal."""
+        if not os.path.exists(path): return None
+        frequency, sample_format, channels = pygame.mixer.get_init()
+        command = [sys.executable, os.path.abspath(__file__), "--decode", path, str(frequency), str(sample_format), str(channels)]
+        environment = dict(os.environ, SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+        try:
+            result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=environment, timeout=120)
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"--- AudioManager WARN: Proses decode gagal dijalankan ({e}). Decode di proses utama. ---")
+            return None
+        if result.returncode != 0 or not result.stdout:
+            print(f"--- AudioManager WARN: Proses decode '{path}' gagal: {result.stderr.decode(errors='replace').strip()[-200:]} ---")
+            return None
+        return pygame.mixer.Sound(buffer=result.stdout)
+
+    @staticmethod
+    def _sound_bytes(sound):
+        """Ukuran PCM hasil decode, dihitung dari format mixer (tanpa menyalin buffer)."""
+        frequency, sample_format, channels = pygame.mixer.get_init()
+        return int(sound.get_length() * frequency * channels * (abs(sample_format) // 8))
+
+    def _evict_tracks(self):
+        protected = {self.current_track, self._pending_track}
+        while self._track_bytes > self.config.MUSIC_CACHE_MAX_BYTES:
+            victim = next((name for name in self._tracks if name not in protected), None)
+            if victim is None: break
+            _, size = self._tracks.pop(victim)
+            self._track_bytes -= size
+            self.stats_counters["track_evictions"] += 1
+
+    def play_music(self, filename):
+        """Beralih ke trek ini (crossfade). None = fade out. Tidak pernah menunggu decode."""
+        if not self.enabled: return
+        if filename == self.current_track and (self._pending_track == filename or self._music_channels[self._music_channel_index].get_busy()):
+            return
+        if not filename:
+            self._pending_track = None; self.current_track = None
+            for channel in self._music_channels: channel.fadeout(self.crossfade_ms)
+            return
+        self.current_track = filename
+        with self._lock: ready = filename in self._tracks
+        if ready: self._start_track(filename)
+        else:
+            self._pending_track = filename # Musik lama tetap jalan; update() beralih setelah decode selesai
+            self.prepare_music([filename])
+
+    def _start_track(self, filename):
+        with self._lock:
+            sound, _ = self._tracks[filename]
+            self._tracks.move_to_end(filename)
+        self._pending_track = None
+        old_channel = self._music_channels[self._music_channel_index]
+        self._music_channel_index = 1 - self._music_channel_index
+        new_channel = self._music_channels[self._music_channel_index]
+        if old_channel.get_busy(): old_channel.fadeout(self.crossfade_ms)
+        new_channel.set_volume(self.music_volume)
+        new_channel.play(sound, loops=-1, fade_ms=self.crossfade_ms)
+
+    def update(self):
+        """Dipanggil tiap frame: memulai trek yang ditunggu begitu decode-nya selesai."""
+        if not self.enabled or self._pending_track is None: return
+        with self._lock: ready = self._pending_track in self._tracks
+        if ready: self._start_track(self._pending_track)
+
+    def wait_idle(self, timeout=None):
+        """Menunggu antrean decode kosong (untuk tes/benchmark)."""
+        import time
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            with self._lock:
+                if not self._worker_running: return True
+            if deadline is not None and time.perf_counter() > deadline: return False
+            time.sleep(0.01)
+
+    def stats(self):
+        with self._lock:
+            result = dict(self.stats_counters)
+            result.update({"tracks_cached": len(self._tracks), "track_mb": self._track_bytes / (1024 * 1024),
+                           "current_track": self.current_track, "pending_track": self._pending_track})
+        return result
+
+
+def _decode_main(argv):
+    """Proses pembantu: decode satu file ke PCM mentah (format mixer induk) dan tulis ke stdout."""
+    path, frequency, sample_format, channels = argv
+    pygame.mixer.init(int(frequency), int(sample_format), int(channels), allowedchanges=0)
+    sys.stdout.buffer.write(pygame.mixer.Sound(path).get_raw())
+
+if __name__ == "__main__" and sys.argv[1:2] == ["--decode"]:
+    _decode_main(sys.argv[2:])
@@ -0,0 +1,34 @@
+# background_strip.py
+import pygame
+
+class BackgroundStrip:
+    """
+    Latar memancing yang berulang secara horizontal, dipanggang sekali menjadi satu strip
+    selebar (lebar_tile + lebar_layar). Jendela mana pun selebar layar selalu muat di dalam strip,
+    jadi tiap frame cukup satu blit dengan area rect (Rect yang sama dipakai ulang) tanpa overdraw.
+    """
+    def __init__(self, tile_surface, view_width):
+        self.tile_surface = tile_surface
+        self.tile_width = tile_surface.get_width()
+        self.view_width = view_width
+        self.height = tile_surface.get_height()
+        strip_width = self.tile_width + view_width
+        # Format piksel sama dengan tile; surface baru berisi nol, jadi BLEND_RGBA_ADD menyalin piksel (termasuk alpha) apa adanya
+        self.strip = pygame.Surface((strip_width, self.height), tile_surface.get_flags() & pygame.SRCALPHA, tile_surface)
+        for x in range(0, strip_width, self.tile_width):
+            self.strip.blit(tile_surface, (x, 0), special_flags=pygame.BLEND_RGBA_ADD)
+        self._area = pygame.Rect(0, 0, view_width, self.height)
+
+    def matches(self, tile_surface, view_width):
+        return tile_surface is self.tile_surface and view_width == self.view_width
+
+    def draw(self, screen, origin_world_x, camera_left, screen_y):
+        """
+        Menggambar jendela yang terlihat. origin_world_x: posisi dunia tempat tile pertama mulai,
+        camera_left: tepi kiri kamera di dunia, screen_y: posisi layar tepi atas latar.
+        """
+        self._area.x = (camera_left - origin_world_x) % self.tile_width
+        screen.blit(self.strip, (0, screen_y), self._area)
+
+    def estimate_bytes(self):
+        return self.strip.get_width() * self.strip.get_height() * self.strip.get_bytesize()
@@ -0,0 +1,217 @@
+# bake_assets.py
+"""
+Memanggang aset secara offline: setiap varian gambar yang diminta game lewat Config.load_image
+(ukuran layar, skala ikan/kapal, dll. dibaca dari Config) disimpan sudah terskala sebagai piksel
+mentah di folder cache, beserta manifest berisi hash konten sumber dan hasil panggangan.
+Saat runtime Config.load_image memakai varian panggangan jika manifest cocok, dan kembali ke
+pemuatan biasa (decode + scale) jika tidak.
+
+    python bake_assets.py [--output DIR] [--verbose]
+"""
+import os
+import json
+import hashlib
+import argparse
+import threading
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+COLORKEY_CANDIDATES = ((255, 0, 255), (0, 255, 0), (1, 2, 3), (254, 1, 253))
+
+def file_sha1(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''): digest.update(block)
+    return digest.hexdigest()
+
+def variant_key(path, scale, use_alpha):
+    """Kunci manifest, sama dengan kunci AssetCache tetapi berupa string agar bisa disimpan di JSON."""
+    from asset_cache import AssetCache
+    norm_path, scale_key, alpha_key = AssetCache.make_key(path, scale, use_alpha)
+    scale_text = f"{scale_key[0]}x{scale_key[1]}" if isinstance(scale_key, tuple) else repr(scale_key)
+    return f"{norm_path.replace(os.sep, '/')}|{scale_text}|{'alpha' if alpha_key else 'opaque'}"
+
+
+def collect_bake_jobs(config):
+    """Daftar (path, scale, use_alpha) yang diminta game saat berjalan, dihitung dari Config."""
+    from game_map import GameMap
+    from fish import Fish
+    screen_size = (config.SCREEN_WIDTH, config.SCREEN_HEIGHT)
+    boat_path = os.path.join(config.ASSET_PATH, "Player", "kapal laut.png")
+    jobs = [
+        (os.path.join(config.BACKGROUND_PATH, "TampilanAwal.png"), screen_size, False), # Semua menu
+        (os.path.join(config.BACKGROUND_PATH, "Peta Lautan.png"), screen_size, True),   # Peta dunia
+        (os.path.join(config.BACKGROUND_PATH, "bg_baru.webp"), 1.0, False),             # Daratan (jika chunk nonaktif)
+        (boat_path, config.BOAT_IMAGE_SCALE, True),
+        (boat_path, config.MAP_BOAT_IMAGE_SCALE, True),
+    ]
+    for location in GameMap.LOCATIONS.values():
+        bg_path = os.path.join(config.BACKGROUND_PATH, location.get("background_file", ""))
+        jobs.append((bg_path, 1.0, True))
+        if os.path.exists(bg_path):
+            original_size = pygame.image.load(bg_path).get_size()
+            scaled_size = GameMap.scaled_background_size(original_size, config.SCREEN_WIDTH)
+            if scaled_size != original_size: jobs.append((bg_path, scaled_size, True))
+        for fish_data in location.get("fish_data_list", []):
+            jobs.append((Fish.get_image_path(fish_data, config), config.FISH_IMAGE_SCALE, True))
+    unique_jobs = []
+    for job in jobs:
+        if job not in unique_jobs: unique_jobs.append(job)
+    return unique_jobs
+
+
+def analyze_alpha(image):
+    """Mengembalikan 'opaque' (tanpa transparansi), 'binary' (alpha hanya 0/255, cocok untuk colorkey) atau 'alpha'."""
+    if not image.get_flags() & pygame.SRCALPHA: return 'opaque'
+    pixel_count = image.get_width() * image.get_height()
+    fully_opaque = pygame.mask.from_surface(image, 254).count()
+    if fully_opaque == pixel_count: return 'opaque'
+    if pygame.mask.from_surface(image, 0).count() == fully_opaque: return 'binary'
+    return 'alpha'
+
+def pick_colorkey(image):
+    """Warna yang tidak dipakai piksel terlihat mana pun, atau None."""
+    visible = pygame.mask.from_surface(image, 0)
+    for color in COLORKEY_CANDIDATES:
+        used = pygame.mask.from_threshold(image, color + (255,), (1, 1, 1, 255))
+        if used.overlap_area(visible, (0, 0)) == 0: return color
+    return None
+
+def bake_variant(config, path, scale, use_alpha, output_dir):
+    """Memanggang satu varian. Mengembalikan entri manifest, atau None jika sumber tidak bisa dimuat."""
+    if not os.path.exists(path): return None
+    image, is_placeholder = config._load_image_from_disk(path, scale, use_alpha)
+    if is_placeholder: return None
+    kind = analyze_alpha(image) if use_alpha else 'opaque'
+    colorkey = pick_colorkey(image) if kind == 'binary' else None
+    if kind == 'opaque':
+        pixel_format = "RGB"; pixels = pygame.image.tobytes(image, "RGB")
+    elif colorkey is not None:
+        # Piksel transparan diganti warna kunci; saat runtime surface diberi colorkey + RLEACCEL
+        keyed = pygame.Surface(image.get_size()); keyed.fill(colorkey); keyed.blit(image, (0, 0))
+        pixel_format = "RGB"; pixels = pygame.image.tobytes(keyed, "RGB")
+    else:
+        kind = 'alpha'; pixel_format = "RGBA"; pixels = pygame.image.tobytes(image, "RGBA")
+    pixels_sha1 = hashlib.sha1(pixels).hexdigest()
+    file_name = f"{pixels_sha1[:20]}.{pixel_format.lower()}"
+    with open(os.path.join(output_dir, file_name), 'wb') as f: f.write(pixels)
+    stat = os.stat(path)
+    return {
+        "source": path.replace(os.sep, '/'),
+        "source_sha1": file_sha1(path),
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "file": file_name,
+        "file_sha1": pixels_sha1,
+        "size": list(image.get_size()),
+        "format": pixel_format,
+        "kind": kind,
+        "colorkey": list(colorkey) if colorkey else None,
+    }
+
+def bake_all(config, output_dir=None, verbose=False):
+    """Memanggang semua varian dari collect_bake_jobs ke output_dir dan menulis manifest-nya."""
+    from save_writer import write_json_atomic
+    output_dir = output_dir or config.BAKED_ASSET_DIRECTORY
+    os.makedirs(output_dir, exist_ok=True)
+    assets = {}
+    for path, scale, use_alpha in collect_bake_jobs(config):
+        entry = bake_variant(config, path, scale, use_alpha, output_dir)
+        if entry is None:
+            if verbose: print(f"--- bake_assets: Lewati '{path}' (tidak ditemukan / gagal dimuat) ---")
+            continue
+        assets[variant_key(path, scale, use_alpha)] = entry
+        if verbose: print(f"--- bake_assets: {path} @ {scale} -> {entry['file']} ({entry['kind']}, {entry['size'][0]}x{entry['size'][1]}) ---")
+    write_json_atomic(os.path.join(output_dir, MANIFEST_NAME), {
+        "version": MANIFEST_VERSION,
+        "screen_size": [config.SCREEN_WIDTH, config.SCREEN_HEIGHT],
+        "assets": assets,
+    })
+    referenced = {entry["file"] for entry in assets.values()}
+    for name in os.listdir(output_dir): # Buang hasil panggangan lama yang tidak lagi direferensikan
+        if name != MANIFEST_NAME and name not in referenced and os.path.splitext(name)[1] in ('.rgb', '.rgba'):
+            os.remove(os.path.join(output_dir, name))
+    return assets
+
+
+class BakedAssets:
+    """
+    Sisi runtime: membaca manifest sekali, lalu load() memberi surface panggangan yang sudah di-convert
+    (colorkey + RLEACCEL untuk aset ber-alpha biner), atau None jika varian tidak ada / sumbernya
+    berubah / isi file tidak cocok dengan hash. Sumber dicek lewat ukuran+mtime, dan hash isi hanya
+    dihitung ulang jika mtime berbeda (misal setelah git checkout).
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._source_ok = {} # path sumber -> hasil verifikasi (dicek sekali per proses)
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        try:
+            with open(os.path.join(directory, MANIFEST_NAME), 'r') as f: manifest = json.load(f)
+            self.assets = manifest.get("assets", {}) if manifest.get("version") == MANIFEST_VERSION else {}
+        except (OSError, ValueError):
+            self.assets = {}
+
+    def _source_matches(self, path, entry):
+        with self._lock:
+            cached = self._source_ok.get(path)
+        if cached is not None: return cached
+        try:
+            stat = os.stat(path)
+            matches = stat.st_size == entry["source_size"] and \
+                      (stat.st_mtime_ns == entry["source_mtime_ns"] or file_sha1(path) == entry["source_sha1"])
+        except OSError:
+            matches = False
+        with self._lock: self._source_ok[path] = matches
+        return matches
+
+    def load(self, path, scale, use_alpha):
+        entry = self.assets.get(variant_key(path, scale, use_alpha)) if self.assets else None
+        if entry is None or not self._source_matches(path, entry):
+            with self._lock:
+                if entry is None: self.misses += 1
+                else: self.stale += 1
+            return None
+        try:
+            with open(os.path.join(self.directory, entry["file"]), 'rb') as f: pixels = f.read()
+            if hashlib.sha1(pixels).hexdigest() != entry["file_sha1"]: raise ValueError("hash tidak cocok")
+            image = pygame.image.frombytes(pixels, tuple(entry["size"]), entry["format"])
+        except (OSError, ValueError, pygame.error) as e:
+            print(f"--- BakedAssets WARN: Varian panggangan '{entry['file']}' untuk '{path}' tidak valid ({e}). Memuat sumber. ---")
+            with self._lock: self.stale += 1
+            return None
+        if entry["format"] == "RGBA":
+            image = image.convert_alpha()
+        else:
+            image = image.convert()
+            if entry.get("colorkey"): image.set_colorkey(tuple(entry["colorkey"]), pygame.RLEACCEL)
+        with self._lock: self.hits += 1
+        return image
+
+    def stats(self):
+        with self._lock:
+            return {"variants": len(self.assets), "hits": self.hits, "misses": self.misses, "stale": self.stale}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memanggang varian aset terskala untuk Fishing Mania.")
+    parser.add_argument("--output", default=None, help="Folder hasil (default: Config.BAKED_ASSET_DIRECTORY)")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy") # convert() butuh mode layar, tapi tidak perlu jendela
+    pygame.init()
+    from config import Config
+    pygame.display.set_mode((1, 1))
+    assets = bake_all(Config, args.output, args.verbose)
+    total_bytes = sum(entry["size"][0] * entry["size"][1] * len(entry["format"]) for entry in assets.values())
+    print(f"--- bake_assets: {len(assets)} varian dipanggang ({total_bytes / (1024 * 1024):.1f} MB) ke '{args.output or Config.BAKED_ASSET_DIRECTORY}' ---")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
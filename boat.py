@@ -27,7 +27,9 @@ class Boat:
              self.type = self.game_map.name.lower() 
         
         self.base_image = None 
+        self.frames = None # Varian kiri/kanan dari base_image (dari cache transformasi)
         self.rect = None 
+        self.pos_x = None # Posisi x presisi (float); rect.x adalah versi bulatnya
 
         self.load_sprite()
         if self.base_image: 
@@ -46,7 +48,7 @@ class Boat:
         target_image_path = os.path.join(self.config.ASSET_PATH, "Player", "kapal laut.png") 
 
         try:
-            self.base_image = self.config.load_image(target_image_path, scale=0.7) 
+            self.base_image = self.config.load_image(target_image_path, scale=self.config.BOAT_IMAGE_SCALE, owner="Boat") 
             if self.base_image and self.base_image.get_width() > 1: 
                 print(f"      Boat: Berhasil memuat kapal dari '{target_image_path}'.") 
             else:
@@ -80,11 +82,13 @@ class Boat:
                 initial_x = self.world_bounds_rect.centerx if self.world_bounds_rect else self.config.SCREEN_WIDTH // 2
                 self.rect.midbottom = (initial_x, self.config.SCREEN_HEIGHT - 70) 
 
+        self.frames = self.config.get_transform_cache().get_frames(self.base_image)
 
     def change_map(self, new_game_map, new_world_bounds_rect): 
         self.game_map = new_game_map 
         self.world_bounds_rect = new_world_bounds_rect
-        self.load_sprite() 
+        if self.base_image is None or self.frames is None: # Sprite kapal sama di semua lokasi, cukup dimuat sekali
+            self.load_sprite() 
         if self.rect: 
             # Posisi Y akan diatur oleh game.py setelah water_top_y diketahui
             self.rect.centerx = self.world_bounds_rect.centerx
@@ -117,13 +121,16 @@ class Boat:
             return
 
         move_amount = self.current_speed_value * dt 
+        # Rect bisa dipindah dari luar (change_map, penempatan di garis air); ikuti jika begitu
+        if self.pos_x is None or round(self.pos_x) != self.rect.x: self.pos_x = float(self.rect.x)
         
         if keys[pygame.K_LEFT]: 
-            self.rect.x -= move_amount 
+            self.pos_x -= move_amount 
             self.facing_direction = -1 
         if keys[pygame.K_RIGHT]: 
-            self.rect.x += move_amount 
+            self.pos_x += move_amount 
             self.facing_direction = 1 
+        self.rect.x = round(self.pos_x)
 
         if self.world_bounds_rect:
             self.rect.left = max(self.world_bounds_rect.left, self.rect.left)
@@ -131,8 +138,9 @@ class Boat:
         else: 
             self.rect.left = max(0, self.rect.left) 
             self.rect.right = min(self.config.SCREEN_WIDTH, self.rect.right) 
+        if self.rect.x != round(self.pos_x): self.pos_x = float(self.rect.x) # Tertahan di batas dunia
 
     def render_with_camera(self, surface, camera): 
         if self.base_image and self.rect: 
-            flipped_image = pygame.transform.flip(self.base_image, self.facing_direction == 1, False)
-            surface.blit(flipped_image, camera.apply(self.rect))
\ No newline at end of file
+            image_to_render = self.frames.get(self.facing_direction == 1) if self.frames else self.base_image
+            surface.blit(image_to_render, camera.apply(self.rect))
\ No newline at end of file
@@ -1,5 +1,6 @@
 # camera_system.py
 import pygame
+from allocation_audit import count_allocation
 
 class Camera:
     def __init__(self, world_width, world_height, screen_width, screen_height):
@@ -23,8 +24,10 @@ class Camera:
         Mengembalikan Rect baru yang sudah digeser untuk digambar di layar.
         """
         if isinstance(target_entity_or_rect, pygame.Rect):
+            count_allocation("Camera.apply:Rect")
             return target_entity_or_rect.move(self.offset_x, self.offset_y)
         elif hasattr(target_entity_or_rect, 'rect'): # Jika objek punya atribut rect
+            count_allocation("Camera.apply:Rect")
             return target_entity_or_rect.rect.move(self.offset_x, self.offset_y)
         else:
             # Jika bukan Rect atau objek dengan .rect, kembalikan apa adanya (atau handle error)
@@ -39,6 +42,14 @@ class Camera:
         """
         return (point_x + self.offset_x, point_y + self.offset_y)
 
+    def get_offset(self):
+        return (self.offset_x, self.offset_y)
+
+    def set_offset(self, offset):
+        """Mengatur offset langsung (dipakai interpolasi render), camera_rect ikut diperbarui."""
+        self.offset_x, self.offset_y = offset
+        self.camera_rect.topleft = (-self.offset_x, -self.offset_y)
+
     def update(self, target_focus_rect):
         """
         Memperbarui posisi kamera agar target_focus_rect (biasanya rect pemain)
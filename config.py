@@ -1,12 +1,22 @@
 # config.py
 import pygame
 import os
+from asset_cache import AssetCache
+from transform_cache import TransformCache
+from text_cache import TextCache
 
 class Config:
     # Display
     SCREEN_WIDTH = 1280
     SCREEN_HEIGHT = 720
-    FPS = 60
+    FPS = 60 # Batas frame render; 0 = tanpa batas (atau mengikuti VSYNC)
+    VSYNC = False
+    # Simulasi bertick tetap (fixed_timestep.py): update selalu memakai dt = 1 / SIMULATION_HZ,
+    # render menginterpolasi posisi di antara dua tick sehingga bisa lebih cepat dari simulasi
+    SIMULATION_HZ = 60
+    MAX_SIMULATION_STEPS = 5   # Langkah maksimum per frame saat tertinggal
+    MAX_FRAME_SECONDS = 0.25   # Waktu frame yang lebih lama (misal jendela di-drag) dipotong
+    RENDER_INTERPOLATION = True
     DEBUG = False # <--- UBAH INI MENJADI FALSE
 
     # Paths
@@ -38,13 +48,128 @@ class Config:
     FONT_NAME = None 
     FONT_SIZES = { 'small': 18, 'medium': 30, 'large': 50, 'title': 60 }
 
+    # Save Game (None = folder "saves" di samping game_data.py)
+    SAVE_DIRECTORY = None
+    ASYNC_SAVES = True # Tulis save di thread latar belakang (atomik, beberapa save beruntun digabung)
+    SAVE_COALESCE_SECONDS = 0.25
+    # Jurnal save: perubahan ditambahkan ke save_game.journal; snapshot penuh ditulis ulang hanya jika jurnal melewati batas ini
+    SAVE_JOURNAL = True
+    SAVE_JOURNAL_MAX_BYTES = 64 * 1024
+
     # Game Constants
     TILESIZE = 32 
     PLAYER_LAYER = 2 
     BLOCK_LAYER = 3 
     GROUND_LAYER = 1 
-    PLAYER_SPEED = 3 # Anda bisa coba naikkan ini jika ingin pemain bergerak lebih cepat/kamera terasa lebih responsif
+    PLAYER_SPEED = 180 # Piksel per detik. Anda bisa coba naikkan ini jika ingin pemain bergerak lebih cepat/kamera terasa lebih responsif
     PLAYER_SPRITE_SCALE = 1.5
+    FISH_IMAGE_SCALE = 0.7
+    BOAT_IMAGE_SCALE = 0.7      # Kapal saat memancing
+    MAP_BOAT_IMAGE_SCALE = 0.6  # Kapal di peta dunia
+    # Rotasi pitch ikan saat berenang naik/turun (varian di-cache). 0 = nonaktif, hanya flip kiri/kanan.
+    FISH_PITCH_MAX_DEG = 0
+    FISH_PITCH_STEP_DEG = 15
+
+    # Dunia memancing (kelipatan ukuran layar) dan ukuran sel indeks spasial ikan
+    FISHING_WORLD_WIDTH_FACTOR = 1.2
+    FISHING_WORLD_HEIGHT_FACTOR = 2.0
+    FISH_SPATIAL_CELL_SIZE = 128
+
+    # Simulasi ikan berbasis NumPy (fish_school.py). Otomatis nonaktif jika NumPy tidak terpasang.
+    USE_FISH_SCHOOL = True
+    FISH_SCHOOL_EXTRA_FISH = 0 # Ikan tambahan tanpa sprite yang ikut disimulasikan per lokasi
+    FISH_SCHOOL_SYNC_MARGIN = 64 # Margin (px) di sekitar kamera untuk sinkronisasi sprite
+
+    # Cache GameMap per lokasi; lokasi yang terbuka disiapkan di latar belakang saat di peta dunia
+    PREWARM_LOCATIONS = True
+    LOCATION_CACHE_MAX_BYTES = 96 * 1024 * 1024
+
+    # Latar daratan dipotong menjadi chunk (land_chunks.py) yang dimuat/dibuang mengikuti kamera
+    USE_LAND_CHUNKS = True
+    LAND_CHUNK_SIZE = 256
+    LAND_CHUNK_PREFETCH = 1 # Chunk di luar layar yang dimuat lebih dulu (dalam satuan chunk)
+    LAND_CHUNK_EVICT = 3    # Chunk yang lebih jauh dari ini dibuang dari memori
+    CACHE_DIRECTORY = "cache/" # Hasil olahan aset (chunk latar, dll.); aman dihapus
+
+    # Varian aset yang sudah dipanggang (python bake_assets.py); dipakai load_image jika manifest cocok
+    USE_BAKED_ASSETS = True
+    BAKED_ASSET_DIRECTORY = os.path.join(CACHE_DIRECTORY, "baked")
+    _baked_assets = None
+
+    # Render dirty-rectangle untuk layar yang jarang berubah (nonaktif otomatis saat DEBUG)
+    USE_DIRTY_RECTS = True
+    DIRTY_RECT_STATES = ('main_menu', 'shop', 'market_screen', 'inventory_screen', 'map_explore')
+
+    # Profil startup (startup_profiler.py): span per komponen sampai frame pertama. Aktifkan lewat main.py --profile-startup
+    PROFILE_STARTUP = False
+    STARTUP_TRACE_PATH = None # Jika diisi, timeline diekspor sebagai JSON trace-event Chrome
+    _startup_profiler = None
+
+    # Audio (audio_manager.py): SFX di-decode sekali dan diputar lewat channel cadangan;
+    # musik di-decode di latar belakang lalu di-crossfade antar dua channel musik
+    SFX_FILES = { 'splash': "splash.ogg", 'gotcha': "Gotcha.ogg", 'catch': "catch.ogg" }
+    SFX_CHANNELS = 6
+    SFX_MAX_VOICES = 2 # Suara bersamaan per efek
+    SFX_VOLUME = 0.8
+    MUSIC_VOLUME = 1.0
+    MUSIC_CROSSFADE_MS = 500
+    MUSIC_CACHE_MAX_BYTES = 96 * 1024 * 1024 # Trek hasil decode (~25 MB per trek) yang disimpan di memori
+    MUSIC_DECODE_SUBPROCESS = True # Decode musik di proses pembantu agar mixer tidak terkunci selama decode
+    _audio_manager = None
+
+    # HUD profiler frame (frame_profiler.py): waktu per subsistem dengan p50/p95/p99 dan grafik frame
+    FRAME_PROFILER_ENABLED = False
+    FRAME_PROFILER_KEY = pygame.K_F3 # Tombol untuk menyalakan/mematikan HUD saat bermain
+    FRAME_PROFILER_WINDOW = 300 # Jumlah frame terakhir yang dipakai untuk persentil
+    FRAME_PROFILER_FONT = "consolas,dejavusansmono,couriernew,monospace"
+    FRAME_PROFILER_FONT_SIZE = 16
+
+    # Rekaman cProfile (profile_capture.py) di sekitar update/render; tombol atau main.py --profile-capture
+    PROFILE_CAPTURE = False
+    PROFILE_CAPTURE_KEY = pygame.K_F4
+    PROFILE_CAPTURE_DIRECTORY = "profiles/"
+    PROFILE_CAPTURE_LABEL = None # Ditambahkan ke nama folder hasil, misal nama build
+    PROFILE_STATE_GROUPS = { 'main_menu': 'menus', 'shop': 'menus', 'market_screen': 'menus', 'inventory_screen': 'menus' }
+
+    # Pengawas frame panjang (frame_watchdog.py): stack thread utama diambil saat frame melewati anggaran.
+    # Aktif lewat main.py --watchdog; log ditimpa tiap sesi dan hanya berisi N laporan terakhir
+    WATCHDOG_ENABLED = False
+    WATCHDOG_BUDGET_MS = 33
+    WATCHDOG_SAMPLE_MS = 5
+    WATCHDOG_MAX_REPORTS = 20
+    WATCHDOG_LOG_PATH = os.path.join("logs", "long_frames.log")
+
+    # Latensi input sampai tampil (input_latency.py): p50/p95 per state di HUD profiler dan laporan headless
+    INPUT_LATENCY_ENABLED = True
+    INPUT_LATENCY_WINDOW = 200 # Sampel terakhir per state
+    INPUT_LATENCY_MAX_PENDING_SECONDS = 1.0 # Input tanpa efek terlihat dibuang setelah ini
+
+    # Audit alokasi per frame (allocation_audit.py): tracemalloc + penghitung; tombol atau main.py --alloc-audit
+    ALLOCATION_AUDIT = False
+    ALLOCATION_AUDIT_KEY = pygame.K_F6
+    ALLOCATION_AUDIT_THRESHOLD_OBJECTS = 200 # Blok baru + objek sementara yang dihitung per frame
+    ALLOCATION_AUDIT_THRESHOLD_BYTES = 64 * 1024 # Puncak memori Python di dalam satu frame
+    ALLOCATION_AUDIT_TRACE_FRAMES = 1 # Kedalaman traceback tracemalloc (1 = baris pemanggil langsung)
+    ALLOCATION_AUDIT_MAX_REPORTS = 20
+    ALLOCATION_AUDIT_LOG_PATH = os.path.join("logs", "allocations.log")
+
+    # Asset Cache (dibagi oleh semua pemanggil Config.load_image)
+    ASSET_CACHE_BUDGET_BYTES = 256 * 1024 * 1024
+    _asset_cache = None
+    _transform_cache = None
+
+    # Registry memori surface (surface_registry.py): total di overlay debug, tombol dump menulis daftar lengkap
+    SURFACE_MEMORY_BUDGET_BYTES = 160 * 1024 * 1024 # Peringatan dicetak jika surface yang tercatat melebihi ini
+    SURFACE_DUMP_KEY = pygame.K_F7
+    SURFACE_DUMP_PATH = os.path.join("logs", "surfaces.txt")
+    _surface_registry = None
+
+    # Registry font bersama (font_registry.py); font di-resolve dan dimuat sekali per (nama, ukuran, gaya)
+    _font_registry = None
+
+    # Cache teks hasil font.render (dibagi oleh UI, menu, peta, dan daratan)
+    TEXT_CACHE_MAX_ENTRIES = 512
+    _text_cache = None
 
     @staticmethod
     def create_placeholder_surface(width=50, height=50, color=(255, 0, 255, 128)):
@@ -56,27 +181,113 @@ class Config:
         return image
 
     @staticmethod
-    def load_image(path, scale=1.0, use_alpha=True):
+    def get_asset_cache():
+        if Config._asset_cache is None:
+            Config._asset_cache = AssetCache(Config.ASSET_CACHE_BUDGET_BYTES)
+        return Config._asset_cache
+
+    @staticmethod
+    def get_transform_cache():
+        if Config._transform_cache is None:
+            Config._transform_cache = TransformCache(Config.get_surface_registry())
+        return Config._transform_cache
+
+    @staticmethod
+    def get_surface_registry():
+        if Config._surface_registry is None:
+            from surface_registry import SurfaceRegistry
+            Config._surface_registry = SurfaceRegistry(Config.SURFACE_MEMORY_BUDGET_BYTES)
+        return Config._surface_registry
+
+    @staticmethod
+    def get_font_registry():
+        if Config._font_registry is None:
+            from font_registry import FontRegistry
+            Config._font_registry = FontRegistry(Config.FONT_NAME, Config.FONT_PATH)
+        return Config._font_registry
+
+    @staticmethod
+    def get_audio_manager():
+        """Dibuat setelah pygame.mixer.init(); tanpa mixer semua metodenya no-op."""
+        if Config._audio_manager is None:
+            from audio_manager import AudioManager
+            Config._audio_manager = AudioManager(Config)
+        return Config._audio_manager
+
+    @staticmethod
+    def get_text_cache():
+        if Config._text_cache is None:
+            Config._text_cache = TextCache(Config.TEXT_CACHE_MAX_ENTRIES)
+        return Config._text_cache
+
+    @staticmethod
+    def get_startup_profiler():
+        if Config._startup_profiler is None:
+            from startup_profiler import StartupProfiler
+            Config._startup_profiler = StartupProfiler(Config.PROFILE_STARTUP, Config.STARTUP_TRACE_PATH)
+        return Config._startup_profiler
+
+    @staticmethod
+    def get_baked_assets():
+        if Config._baked_assets is None:
+            from bake_assets import BakedAssets
+            Config._baked_assets = BakedAssets(Config.BAKED_ASSET_DIRECTORY)
+        return Config._baked_assets
+
+    @staticmethod
+    def load_image(path, scale=1.0, use_alpha=True, owner=None):
+        """
+        Memuat gambar lewat cache bersama. scale bisa berupa faktor atau ukuran (lebar, tinggi).
+        Surface yang dikembalikan dipakai bersama, jadi jangan digambari langsung.
+        owner: nama pemilik untuk registry surface (default "Config.load_image").
+        """
+        owner = owner or "Config.load_image"
+        registry = Config.get_surface_registry()
+        cache = Config.get_asset_cache()
+        key = cache.make_key(path, scale, use_alpha)
+        cached_image = cache.get(key)
+        if cached_image is not None:
+            return registry.touch(cached_image, owner)
+        source = f"{os.path.basename(path)} scale={scale}"
+        with Config.get_startup_profiler().span("Config.load_image", "asset", file=os.path.basename(path), scale=str(scale)):
+            if Config.USE_BAKED_ASSETS:
+                image = Config.get_baked_assets().load(path, scale, use_alpha)
+                if image is not None:
+                    return cache.put(key, registry.register(image, owner, source + " (baked)"))
+            image, is_placeholder = Config._load_image_from_disk(path, scale, use_alpha)
+            if not is_placeholder: # Placeholder tidak di-cache agar file yang diperbaiki bisa dimuat ulang
+                cache.put(key, registry.register(image, owner, source))
+            else:
+                registry.register(image, f"{owner} (placeholder)", source)
+            return image
+
+    @staticmethod
+    def _load_image_from_disk(path, scale, use_alpha):
         try:
             if not os.path.exists(path):
                 # print(f"  ERROR Config: File gambar tidak ditemukan: {path}") # Kurangi print
-                return Config.create_placeholder_surface()
+                return Config.create_placeholder_surface(), True
             loaded_image = pygame.image.load(path)
             image = loaded_image.convert_alpha() if use_alpha else loaded_image.convert()
-            if scale != 1.0:
+            if isinstance(scale, (tuple, list)):
+                new_width, new_height = int(scale[0]), int(scale[1])
+            elif scale != 1.0:
                 original_width, original_height = image.get_size()
                 new_width, new_height = int(original_width * scale), int(original_height * scale)
-                if new_width <= 0 or new_height <= 0:
-                    # print(f"  PERINGATAN Config: Penskalaan '{path}' invalid. Placeholder.") # Kurangi print
-                    return Config.create_placeholder_surface(10, 10, (255,0,0,200))
+            else:
+                return image, False
+            if new_width <= 0 or new_height <= 0:
+                # print(f"  PERINGATAN Config: Penskalaan '{path}' invalid. Placeholder.") # Kurangi print
+                return Config.create_placeholder_surface(10, 10, (255,0,0,200)), True
+            if (new_width, new_height) != image.get_size():
                 image = pygame.transform.scale(image, (new_width, new_height))
-            return image
+            return image, False
         except pygame.error as e:
             # print(f"  ERROR Config (pygame) load '{path}': {e}") # Kurangi print
-            return Config.create_placeholder_surface(color=(255,0,0,128))
+            return Config.create_placeholder_surface(color=(255,0,0,128)), True
         except Exception as ex: 
             # print(f"  ERROR Config (umum) load '{path}': {ex}") # Kurangi print
-            return Config.create_placeholder_surface(color=(200,200,0,128))
+            return Config.create_placeholder_surface(color=(200,200,0,128)), True
     
     @staticmethod
     def load_sound(path):
@@ -0,0 +1,125 @@
+# dirty_rect.py
+import pygame
+
+class RecordingCanvas:
+    """
+    Pengganti surface layar untuk layar statis: blit() dan fill() tidak langsung menggambar,
+    melainkan dicatat sebagai daftar operasi (display list). DirtyRectRenderer lalu
+    membandingkannya dengan daftar frame sebelumnya untuk mencari area yang berubah.
+    Hanya blit/fill yang didukung; gambar bentuk lain sebagai surface atau pakai fill(color, rect).
+    """
+    def __init__(self, target):
+        self.target = target
+        self.operations = []
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        if isinstance(dest, pygame.Rect): x, y = dest.topleft
+        elif len(dest) == 4: x, y = dest[0], dest[1]
+        else: x, y = dest
+        if area is not None:
+            area = pygame.Rect(area)
+            rect = pygame.Rect(int(x), int(y), area.width, area.height)
+            area = tuple(area)
+        else:
+            rect = pygame.Rect(int(x), int(y), source.get_width(), source.get_height())
+        self.operations.append(('blit', source, rect, area, special_flags))
+        return rect
+
+    def fill(self, color, rect=None, special_flags=0):
+        rect = pygame.Rect(rect) if rect is not None else self.target.get_rect()
+        self.operations.append(('fill', tuple(pygame.Color(color)), rect, None, special_flags))
+        return rect
+
+    def get_width(self): return self.target.get_width()
+    def get_height(self): return self.target.get_height()
+    def get_size(self): return self.target.get_size()
+    def get_rect(self, **kwargs): return self.target.get_rect(**kwargs)
+
+
+class DirtyRectRenderer:
+    """
+    Renderer dirty-rectangle. Tiap frame layar menggambar ke RecordingCanvas; operasi yang
+    tidak berubah (surface yang sama di posisi yang sama) diabaikan, dan hanya area yang berubah
+    digambar ulang (dengan clip) lalu dikirim lewat pygame.display.update(rects).
+    Surface yang diblit dianggap tidak berubah isinya selama objeknya sama (seperti surface dari
+    cache aset/teks). invalidate() memaksa gambar ulang penuh, misalnya saat ganti state.
+    """
+    def __init__(self, screen, full_redraw_ratio=0.5):
+        self.screen = screen
+        self.screen_rect = screen.get_rect()
+        self.full_redraw_ratio = full_redraw_ratio # Di atas rasio luas ini, gambar ulang penuh lebih murah
+        self.canvas = RecordingCanvas(screen)
+        self._previous_operations = None
+        self.full_redraws = 0
+        self.partial_redraws = 0
+        self.skipped_frames = 0
+        self.last_dirty_area = 0
+
+    def invalidate(self):
+        self._previous_operations = None
+
+    def begin_frame(self):
+        self.canvas.operations = []
+        return self.canvas
+
+    @staticmethod
+    def _operation_key(operation):
+        kind, payload, rect, area, flags = operation
+        # id() aman karena daftar frame sebelumnya memegang referensi ke surface-nya
+        return (kind, id(payload) if kind == 'blit' else payload, tuple(rect), area, flags)
+
+    def _find_dirty_rects(self, operations):
+        previous = self._previous_operations
+        previous_keys = [self._operation_key(op) for op in previous]
+        current_keys = [self._operation_key(op) for op in operations]
+        if previous_keys == current_keys:
+            return []
+        previous_set = set(previous_keys); current_set = set(current_keys)
+        if previous_set == current_set:
+            return None # Hanya urutan (z-order) yang berubah; gambar ulang penuh
+        dirty = [op[2] for op, key in zip(previous, previous_keys) if key not in current_set]
+        dirty += [op[2] for op, key in zip(operations, current_keys) if key not in previous_set]
+        return self._merge_rects(dirty)
+
+    def _merge_rects(self, rects):
+        merged = []
+        for rect in rects:
+            rect = rect.clip(self.screen_rect)
+            if rect.width <= 0 or rect.height <= 0: continue
+            # Gabungkan dengan rect yang bersinggungan sampai tidak ada lagi yang tumpang tindih
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect.union_ip(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+
+    def _replay(self, operations, clip_rect=None):
+        screen = self.screen
+        for kind, payload, rect, area, flags in operations:
+            if clip_rect is not None and not clip_rect.colliderect(rect): continue
+            if kind == 'blit': screen.blit(payload, rect.topleft, area, flags)
+            else: screen.fill(payload, rect, flags)
+
+    def end_frame(self):
+        """Menggambar perubahan ke layar dan mem-present-nya. Mengembalikan daftar rect yang diperbarui."""
+        operations = self.canvas.operations
+        dirty_rects = None if self._previous_operations is None else self._find_dirty_rects(operations)
+        self._previous_operations = operations
+        if dirty_rects == []:
+            self.skipped_frames += 1; self.last_dirty_area = 0
+            return []
+        screen_area = self.screen_rect.width * self.screen_rect.height
+        dirty_area = sum(rect.width * rect.height for rect in dirty_rects) if dirty_rects is not None else screen_area
+        if dirty_rects is None or dirty_area >= screen_area * self.full_redraw_ratio:
+            self._replay(operations)
+            pygame.display.flip()
+            self.full_redraws += 1; self.last_dirty_area = screen_area
+            return [self.screen_rect.copy()]
+        for rect in dirty_rects:
+            self.screen.set_clip(rect)
+            self._replay(operations, rect)
+        self.screen.set_clip(None)
+        pygame.display.update(dirty_rects)
+        self.partial_redraws += 1; self.last_dirty_area = dirty_area
+        return dirty_rects
@@ -5,6 +5,11 @@ import os
 import math
 
 class Fish(pygame.sprite.Sprite):
+    @staticmethod
+    def get_image_path(fish_data, config_instance):
+        image_suffix = fish_data.get("image_suffix", fish_data["name"].lower().replace(' ', '_'))
+        return os.path.join(config_instance.FISH_PATH, f"fish_{fish_data['rarity']}_{image_suffix}.png")
+
     def __init__(self, fish_data, pos, config_instance):
         super().__init__()
 
@@ -18,38 +23,19 @@ class Fish(pygame.sprite.Sprite):
 
         self.image = None 
         if self.config_ref:
-            filename = f"fish_{self.rarity}_{self.image_suffix}.png"
-            image_path = os.path.join(self.config_ref.FISH_PATH, filename)
+            image_path = self.get_image_path(fish_data, self.config_ref)
             
             # print(f"--- Fish: Mencoba memuat ikan: {image_path} ---") # Aktifkan jika perlu debug path
             try:
-                # Muat gambar asli terlebih dahulu
-                loaded_image_direct = pygame.image.load(image_path)
-                # Konversi alpha untuk transparansi
-                self.image = loaded_image_direct.convert_alpha() 
-                
-                # Lakukan penskalaan setelah convert_alpha
-                scale_factor = 0.7  # PERUBAHAN: Dari 0.1 (atau nilai sebelumnya) menjadi 0.4 untuk ikan lebih besar
-                                    # Anda bisa coba nilai lain seperti 0.3, 0.5, 0.6, dst.
-
-                new_width = int(self.image.get_width() * scale_factor)
-                new_height = int(self.image.get_height() * scale_factor)
-                
-                if new_width > 0 and new_height > 0:
-                    self.image = pygame.transform.scale(self.image, (new_width, new_height))
-                else:
-                    # Jika penskalaan menghasilkan ukuran tidak valid, gunakan gambar asli setelah convert_alpha
-                    # atau fallback ke placeholder jika self.image menjadi tidak valid
-                    print(f"--- Fish WARN: Penskalaan menghasilkan ukuran tidak valid ({new_width}x{new_height}) untuk {image_path}. Ukuran asli mungkin digunakan atau placeholder.")
-                    if not (self.image.get_width() > 0 and self.image.get_height() > 0) : # Double check image is valid
+                # Gambar diambil dari cache bersama Config, jadi semua ikan satu spesies memakai surface yang sama.
+                # Jangan menggambar langsung ke self.image.
+                if os.path.exists(image_path):
+                    scale_factor = getattr(self.config_ref, 'FISH_IMAGE_SCALE', 0.7)
+                    self.image = self.config_ref.load_image(image_path, scale=scale_factor, owner="Fish")
+                    if not (self.image.get_width() > 0 and self.image.get_height() > 0):
                         self.image = None # Tandai untuk menggunakan placeholder di bawah
-                
-                # Debugging flags (opsional, bisa dihapus komentarnya jika perlu)
-                # if self.image:
-                #     print(f"--- Fish: Gambar '{image_path}' dimuat. Ukuran setelah skala: {self.image.get_size()}, Flags: {self.image.get_flags()} ---")
-                #     if not (self.image.get_flags() & pygame.SRCALPHA):
-                #         print(f"--- Fish WARN: Gambar '{image_path}' TIDAK memiliki SRCALPHA! Transparansi mungkin bermasalah.")
-
+                else:
+                    print(f"--- Fish ERROR: File gambar '{image_path}' tidak ditemukan.")
             except Exception as e:
                 print(f"--- Fish ERROR: Gagal memuat atau memproses '{image_path}': {e}.")
                 self.image = None # Pastikan self.image adalah None jika ada error
@@ -58,10 +44,21 @@ class Fish(pygame.sprite.Sprite):
             print(f"--- Fish PERINGATAN: self.image None untuk {self.name}, membuat placeholder darurat (kuning).")
             self.image = pygame.Surface((30,20)) # Ukuran placeholder
             self.image.fill((200,200,0)) # Warna kuning untuk placeholder
+            if self.config_ref: self.config_ref.get_surface_registry().register(self.image, f"Fish:{self.name} (placeholder)")
             # Jika ingin placeholder ini juga bisa transparan, gunakan:
             # self.image = pygame.Surface((30,20), pygame.SRCALPHA)
             # self.image.fill((200,200,0, 128)) # Kuning semi-transparan
 
+        # Varian flip/rotasi diambil dari cache bersama, bukan dibuat ulang saat render
+        self.pitch_max_deg = getattr(self.config_ref, 'FISH_PITCH_MAX_DEG', 0) if self.config_ref else 0
+        self.pitch_step_deg = getattr(self.config_ref, 'FISH_PITCH_STEP_DEG', 15) if self.config_ref else 15
+        self.pitch_angle = 0
+        if self.config_ref and hasattr(self.config_ref, 'get_transform_cache'):
+            pitch_angles = self.config_ref.get_transform_cache().make_pitch_angles(self.pitch_max_deg, self.pitch_step_deg)
+            self.frames = self.config_ref.get_transform_cache().get_frames(self.image, pitch_angles)
+        else:
+            self.frames = None
+
         self.swim_speed = random.uniform(20, 80)
         self.swim_direction = random.choice([-1, 1])
         self.wobble_amount = random.uniform(0.5, 2.0)
@@ -78,18 +75,35 @@ class Fish(pygame.sprite.Sprite):
 
         self.caught = False
         self.is_secured_on_hook = False
+        self.school_index = None # Slot di FishSchool jika simulasi NumPy aktif
+        self.school_culled = False # True jika sedang di luar kamera dan tidak disinkronkan oleh FishSchool
 
     def update(self, dt):
         self.time += dt
         if not self.caught and not self.is_secured_on_hook:
-            self.pos[0] += self.swim_direction * self.swim_speed * dt
-            self.pos[1] += math.sin(self.time * self.wobble_speed) * self.wobble_amount
+            move_x = self.swim_direction * self.swim_speed * dt
+            move_y = math.sin(self.time * self.wobble_speed) * self.wobble_amount
+            self.pos[0] += move_x
+            self.pos[1] += move_y
+            if self.pitch_max_deg > 0 and dt > 0:
+                # Layar: y ke bawah, jadi move_y negatif = kepala naik
+                self.pitch_angle = self._quantize_pitch(math.degrees(math.atan2(-move_y, abs(move_x))))
             if random.random() < 0.01:
                 self.swim_direction *= -1
         
         self.rect.center = self.pos
         return None
 
+    def _quantize_pitch(self, angle):
+        if not self.config_ref: return 0
+        return self.config_ref.get_transform_cache().quantize_angle(angle, self.pitch_max_deg, self.pitch_step_deg)
+
+    def get_render_image(self):
+        """Mengembalikan varian gambar sesuai arah renang dan pitch (sudah di-cache)."""
+        if self.frames:
+            return self.frames.get(self.swim_direction > 0, self.pitch_angle)
+        return self.image
+
     def get_data(self):
         return {
             "name": self.name,
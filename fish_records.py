@@ -0,0 +1,187 @@
+# fish_records.py
+from array import array
+
+from game_map import GameMap
+
+class SpeciesCatalog:
+    """
+    Daftar spesies ikan yang di-intern dari GameMap.LOCATIONS.
+    Setiap spesies (name, rarity, image_suffix) mendapat id kecil, sehingga inventaris
+    cukup menyimpan id + nilai per ikan, bukan objek Fish lengkap.
+    """
+    def __init__(self, locations=None):
+        self._species = [] # id -> (name, rarity, image_suffix)
+        self._ids = {}     # (name, rarity, image_suffix) -> id
+        if locations is None:
+            locations = GameMap.LOCATIONS
+        for location_data in locations.values():
+            for fish_data in location_data.get("fish_data_list", []):
+                self.intern(fish_data)
+
+    @staticmethod
+    def _species_key(fish_data):
+        name = fish_data["name"]
+        image_suffix = fish_data.get("image_suffix") or name.lower().replace(' ', '_')
+        return (name, fish_data["rarity"], image_suffix)
+
+    def intern(self, fish_data):
+        key = self._species_key(fish_data)
+        species_id = self._ids.get(key)
+        if species_id is None:
+            # Spesies di luar katalog (misal dari save lama) tetap diterima dan ditambahkan
+            species_id = len(self._species)
+            self._species.append(key)
+            self._ids[key] = species_id
+        return species_id
+
+    def get(self, species_id):
+        return self._species[species_id]
+
+    def __len__(self):
+        return len(self._species)
+
+_shared_catalog = None
+
+def get_species_catalog():
+    global _shared_catalog
+    if _shared_catalog is None:
+        _shared_catalog = SpeciesCatalog()
+    return _shared_catalog
+
+
+class CatchRecord:
+    """Satu ikan hasil tangkapan: id spesies + nilai. Punya atribut yang sama dengan Fish untuk dibaca."""
+    __slots__ = ("species_id", "value", "_catalog")
+
+    def __init__(self, species_id, value, catalog):
+        self.species_id = species_id
+        self.value = value
+        self._catalog = catalog
+
+    @property
+    def name(self): return self._catalog.get(self.species_id)[0]
+
+    @property
+    def rarity(self): return self._catalog.get(self.species_id)[1]
+
+    @property
+    def image_suffix(self): return self._catalog.get(self.species_id)[2]
+
+    def get_data(self):
+        name, rarity, image_suffix = self._catalog.get(self.species_id)
+        return {"name": name, "rarity": rarity, "value": self.value, "image_suffix": image_suffix}
+
+    def __eq__(self, other):
+        if not isinstance(other, CatchRecord): return NotImplemented
+        return self.species_id == other.species_id and self.value == other.value
+
+    def __hash__(self):
+        return hash((self.species_id, self.value))
+
+    def __repr__(self):
+        return f"CatchRecord({self.name!r}, {self.rarity!r}, {self.value})"
+
+
+class CatchLog:
+    """
+    Pengganti list Fish untuk Inventory.fish_list. Data disimpan di dua array (id spesies dan nilai),
+    tapi tetap bisa dipakai seperti list: len(), iterasi, indeks/slice, `in`, append, remove, clear.
+    Item yang diterima bisa berupa CatchRecord, sprite Fish, atau dict data ikan.
+    listener (opsional) dipanggil pada tiap perubahan: ('add', [(species_id, value), ...]),
+    ('remove', index) atau ('clear', None); dipakai jurnal save untuk mencatat mutasi.
+    """
+    def __init__(self, catalog=None):
+        self.catalog = catalog if catalog is not None else get_species_catalog()
+        self._species_ids = array('H')
+        self._values = array('q')
+        self.listener = None
+
+    def _coerce(self, item):
+        if isinstance(item, CatchRecord):
+            return item.species_id, item.value
+        if isinstance(item, dict):
+            return self.catalog.intern(item), item.get("value", 0)
+        fish_data = {"name": item.name, "rarity": item.rarity, "value": item.value,
+                     "image_suffix": getattr(item, 'image_suffix', None)}
+        return self.catalog.intern(fish_data), fish_data["value"]
+
+    def _record(self, index):
+        return CatchRecord(self._species_ids[index], self._values[index], self.catalog)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        catalog = self.catalog
+        for species_id, value in zip(self._species_ids, self._values):
+            yield CatchRecord(species_id, value, catalog)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._record(i) for i in range(*index.indices(len(self)))]
+        if index < 0: index += len(self)
+        if not 0 <= index < len(self): raise IndexError("CatchLog index di luar jangkauan")
+        return self._record(index)
+
+    def __contains__(self, item):
+        return self._find(item) >= 0
+
+    def _find(self, item):
+        try: species_id, value = self._coerce(item)
+        except (AttributeError, KeyError, TypeError): return -1
+        for index, (s_id, v) in enumerate(zip(self._species_ids, self._values)):
+            if s_id == species_id and v == value:
+                return index
+        return -1
+
+    def append(self, item):
+        species_id, value = self._coerce(item)
+        self._species_ids.append(species_id)
+        self._values.append(value)
+        if self.listener: self.listener('add', [(species_id, value)])
+
+    def add_data(self, fish_data):
+        species_id = self.catalog.intern(fish_data); value = fish_data.get("value", 0)
+        self._species_ids.append(species_id)
+        self._values.append(value)
+        if self.listener: self.listener('add', [(species_id, value)])
+
+    def extend_data(self, fish_data_list):
+        """Menambahkan banyak ikan sekaligus dari list dict (dipakai saat memuat save)."""
+        intern = self.catalog.intern
+        known_ids = {} # Memo kunci mentah dari dict -> id, agar tiap spesies hanya di-intern sekali
+        species_ids = []; values = []
+        for fish_data in fish_data_list:
+            raw_key = (fish_data["name"], fish_data["rarity"], fish_data.get("image_suffix"))
+            species_id = known_ids.get(raw_key)
+            if species_id is None:
+                species_id = known_ids[raw_key] = intern(fish_data)
+            species_ids.append(species_id)
+            values.append(fish_data.get("value", 0))
+        self._species_ids.extend(array('H', species_ids))
+        self._values.extend(array('q', values))
+        if self.listener: self.listener('add', list(zip(species_ids, values)))
+
+    def remove(self, item):
+        index = self._find(item)
+        if index < 0: raise ValueError("CatchLog.remove(x): x tidak ada di inventaris")
+        del self._species_ids[index]
+        del self._values[index]
+        if self.listener: self.listener('remove', index)
+
+    def clear(self):
+        self._species_ids = array('H')
+        self._values = array('q')
+        if self.listener: self.listener('clear', None)
+
+    def total_value(self):
+        return sum(self._values)
+
+    def species_data(self, species_id, value):
+        name, rarity, image_suffix = self.catalog.get(species_id)
+        return {"name": name, "rarity": rarity, "value": value, "image_suffix": image_suffix}
+
+    def get_data_list(self):
+        species = [self.catalog.get(species_id) for species_id in range(len(self.catalog))]
+        return [{"name": species[s_id][0], "rarity": species[s_id][1], "value": value, "image_suffix": species[s_id][2]}
+                for s_id, value in zip(self._species_ids, self._values)]
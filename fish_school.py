@@ -0,0 +1,172 @@
+# fish_school.py
+try:
+    import numpy as np
+except ImportError: # NumPy opsional; tanpa NumPy, Game memakai Fish.update per sprite seperti biasa
+    np = None
+
+class FishSchool:
+    """
+    Simulasi ikan dalam bentuk structure-of-arrays (NumPy). Posisi, kecepatan, arah, fase wobble,
+    dan flag tertangkap disimpan dalam array sehingga gerak, belok acak, pantulan di batas dunia,
+    dan clamp ke pita air dikerjakan dengan beberapa operasi vektor per tick.
+
+    Sebuah slot boleh terikat ke sprite Fish (untuk dirender/dikail). Hanya sprite yang berada di
+    sekitar kamera yang disinkronkan rect-nya; slot tanpa sprite tetap disimulasikan.
+    """
+    def __init__(self, capacity=64, seed=None, turn_chance=0.01):
+        if np is None:
+            raise RuntimeError("FishSchool membutuhkan NumPy")
+        self.rng = np.random.default_rng(seed)
+        self.turn_chance = turn_chance
+        self.capacity = 0
+        self.count = 0 # Jumlah slot hidup
+        self.sprites = []
+        self._free_slots = []
+        self._allocate(max(1, capacity))
+
+    @staticmethod
+    def is_available():
+        return np is not None
+
+    def _allocate(self, new_capacity):
+        old_capacity = self.capacity
+        def grow(old, dtype, fill=0):
+            new = np.full(new_capacity, fill, dtype=dtype)
+            if old is not None: new[:old_capacity] = old
+            return new
+        self.x = grow(getattr(self, 'x', None), np.float64)
+        self.y = grow(getattr(self, 'y', None), np.float64)
+        self.speed = grow(getattr(self, 'speed', None), np.float64)
+        self.direction = grow(getattr(self, 'direction', None), np.float64, 1.0)
+        self.wobble_amount = grow(getattr(self, 'wobble_amount', None), np.float64)
+        self.wobble_speed = grow(getattr(self, 'wobble_speed', None), np.float64)
+        self.time = grow(getattr(self, 'time', None), np.float64)
+        self.half_w = grow(getattr(self, 'half_w', None), np.float64)
+        self.half_h = grow(getattr(self, 'half_h', None), np.float64)
+        self.alive = grow(getattr(self, 'alive', None), bool, False)
+        self.caught = grow(getattr(self, 'caught', None), bool, False)
+        self.has_sprite = grow(getattr(self, 'has_sprite', None), bool, False)
+        self.sprite_synced = grow(getattr(self, 'sprite_synced', None), bool, False)
+        self.sprites.extend([None] * (new_capacity - old_capacity))
+        self._free_slots.extend(range(new_capacity - 1, old_capacity - 1, -1))
+        self.capacity = new_capacity
+
+    def _take_slot(self):
+        if not self._free_slots:
+            self._allocate(self.capacity * 2)
+        return self._free_slots.pop()
+
+    def add(self, x, y, half_w, half_h, speed, direction, wobble_amount, wobble_speed, sprite=None):
+        index = self._take_slot()
+        self.x[index] = x; self.y[index] = y
+        self.half_w[index] = half_w; self.half_h[index] = half_h
+        self.speed[index] = speed; self.direction[index] = direction
+        self.wobble_amount[index] = wobble_amount; self.wobble_speed[index] = wobble_speed
+        self.time[index] = 0.0
+        self.alive[index] = True; self.caught[index] = False
+        self.has_sprite[index] = sprite is not None; self.sprite_synced[index] = False
+        self.sprites[index] = sprite
+        self.count += 1
+        return index
+
+    def add_sprite(self, fish_sprite):
+        """Mendaftarkan sprite Fish; atribut renang acaknya dipakai sebagai nilai awal slot."""
+        index = self.add(fish_sprite.pos[0], fish_sprite.pos[1],
+                         fish_sprite.rect.width / 2, fish_sprite.rect.height / 2,
+                         fish_sprite.swim_speed, fish_sprite.swim_direction,
+                         fish_sprite.wobble_amount, fish_sprite.wobble_speed, sprite=fish_sprite)
+        fish_sprite.school_index = index
+        fish_sprite.school_culled = False
+        self.sprite_synced[index] = True # Agar langsung ditandai keluar view jika lahir di luar layar
+        return index
+
+    def add_many(self, amount, left, right, top, bottom, half_w=20.0, half_h=12.0):
+        """Menambahkan banyak ikan tanpa sprite sekaligus (posisi/atribut diacak secara vektor)."""
+        if amount <= 0: return
+        while len(self._free_slots) < amount:
+            self._allocate(self.capacity * 2)
+        indices = np.array([self._free_slots.pop() for _ in range(amount)], dtype=np.intp)
+        rng = self.rng
+        self.x[indices] = rng.uniform(left, right, amount)
+        self.y[indices] = rng.uniform(top, bottom, amount)
+        self.half_w[indices] = half_w; self.half_h[indices] = half_h
+        self.speed[indices] = rng.uniform(20, 80, amount)
+        self.direction[indices] = rng.choice((-1.0, 1.0), amount)
+        self.wobble_amount[indices] = rng.uniform(0.5, 2.0, amount)
+        self.wobble_speed[indices] = rng.uniform(0.5, 1.5, amount)
+        self.time[indices] = 0.0
+        self.alive[indices] = True; self.caught[indices] = False
+        self.has_sprite[indices] = False; self.sprite_synced[indices] = False
+        self.count += amount
+
+    def remove(self, index):
+        if index is None or not self.alive[index]: return
+        self.alive[index] = False; self.caught[index] = False
+        self.has_sprite[index] = False; self.sprite_synced[index] = False
+        self.sprites[index] = None
+        self._free_slots.append(index)
+        self.count -= 1
+
+    def clear(self):
+        self.alive[:] = False; self.caught[:] = False
+        self.has_sprite[:] = False; self.sprite_synced[:] = False
+        self.sprites = [None] * self.capacity
+        self._free_slots = list(range(self.capacity - 1, -1, -1))
+        self.count = 0
+
+    def set_caught(self, index, caught, x=None, y=None):
+        self.caught[index] = caught
+        if x is not None: self.x[index] = x
+        if y is not None: self.y[index] = y
+
+    def step(self, dt, world_left, world_right, water_top, water_bottom):
+        """Satu tick simulasi untuk semua slot hidup yang tidak tertangkap."""
+        moving = self.alive & ~self.caught
+        if not moving.any(): return
+        moving_f = moving.astype(np.float64)
+        self.time += dt * moving_f
+        self.x += self.direction * self.speed * (dt * moving_f)
+        self.y += np.sin(self.time * self.wobble_speed) * self.wobble_amount * moving_f
+
+        turns = moving & (self.rng.random(self.capacity) < self.turn_chance)
+        self.direction[turns] *= -1.0
+
+        # Pantul di batas kiri/kanan dunia: clamp lalu balik arah jika masih menuju keluar
+        min_x = world_left + self.half_w; max_x = world_right - self.half_w
+        at_left = moving & (self.x <= min_x); at_right = moving & (self.x >= max_x)
+        np.copyto(self.x, np.clip(self.x, min_x, max_x), where=moving)
+        self.direction[(at_left & (self.direction < 0)) | (at_right & (self.direction > 0))] *= -1.0
+
+        # Clamp ke pita air
+        min_y = water_top + self.half_h; max_y = water_bottom - self.half_h
+        np.copyto(self.y, np.clip(self.y, min_y, np.maximum(min_y, max_y)), where=moving)
+
+    def sync_sprites(self, view_rect, margin=0):
+        """
+        Menyalin posisi/arah ke sprite yang berada di sekitar view_rect (koordinat dunia).
+        Mengembalikan (sprite_tersinkron, sprite_baru_keluar_view) agar pemanggil bisa
+        memperbarui indeks spasial dan melewati sprite yang sedang di luar layar.
+        """
+        in_view = (self.has_sprite & self.alive & ~self.caught &
+                   (self.x + self.half_w >= view_rect.left - margin) & (self.x - self.half_w <= view_rect.right + margin) &
+                   (self.y + self.half_h >= view_rect.top - margin) & (self.y - self.half_h <= view_rect.bottom + margin))
+        left_view = self.has_sprite & self.sprite_synced & ~in_view & ~self.caught
+        self.sprite_synced[:] = in_view | (self.sprite_synced & self.caught)
+
+        synced = []
+        sprites = self.sprites
+        indices = np.flatnonzero(in_view)
+        for index, x, y, direction in zip(indices.tolist(), self.x[indices].tolist(),
+                                          self.y[indices].tolist(), self.direction[indices].tolist()):
+            sprite = sprites[index]
+            sprite.pos[0] = x; sprite.pos[1] = y
+            sprite.rect.center = (x, y)
+            sprite.swim_direction = 1 if direction > 0 else -1
+            sprite.school_culled = False
+            synced.append(sprite)
+        culled = []
+        for index in np.flatnonzero(left_view).tolist():
+            sprite = sprites[index]
+            sprite.school_culled = True
+            culled.append(sprite)
+        return synced, culled
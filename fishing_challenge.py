@@ -2,6 +2,8 @@
 import pygame
 import random
 
+from config import Config
+
 class FishingSkillChallenge:
     def __init__(self):
         self.result = None
@@ -28,7 +30,7 @@ class FishingSkillChallenge:
     def render(self, screen):
         if not self.challenge_active:
             return
-        font = pygame.font.SysFont(None, 48)
-        text = font.render("TEKAN SPACE!", True, (255, 0, 0))
+        font = Config.get_font_registry().get(48, name="none") # Dimuat sekali, bukan SysFont tiap frame
+        text = Config.get_text_cache().render(font, "TEKAN SPACE!", (255, 0, 0))
         rect = text.get_rect(center=(screen.get_width() // 2, screen.get_height() // 2))
         screen.blit(text, rect)
\ No newline at end of file
@@ -61,6 +61,7 @@ class FishingSystem:
             self.current_hooked_fish_data = None
             self.hooked_fish_sprite = None
             self.hook_depth = 0
+            self.game.audio.play_sfx('splash', priority=0)
 
     def start_reel_in(self, triggered_by_player_pull=False):
         print(f"--- FishingSystem: Memulai gulungan (reel in). Player pull: {triggered_by_player_pull} ---")
@@ -86,14 +87,17 @@ class FishingSystem:
                     self.is_casting = False
                     if not self.is_reeling:
                         self.start_reel_in(triggered_by_player_pull=True)
+                    self.game.input_latency.mark_current("pull")
                     return True
                 elif not self.is_casting and not self.is_reeling and not self.fish_on_line_awaiting_pull:
                     self.start_cast()
+                    self.game.input_latency.mark_current("cast")
                     return True
                 elif self.is_casting and not self.fish_on_line_awaiting_pull:
                     print("--- FishingSystem: Lemparan dibatalkan, menggulung kail kosong. ---")
                     self.is_casting = False
                     self.start_reel_in(triggered_by_player_pull=False)
+                    self.game.input_latency.mark_current("cancel_cast")
                     return True
         return False
 
@@ -105,11 +109,13 @@ class FishingSystem:
             self.hook_depth += self.cast_speed * dt
             
             if not self.fish_on_line_awaiting_pull:
-                for fish_sprite in self.game.visible_fish_sprites:
-                    if not fish_sprite.is_secured_on_hook and self.hook_collider_rect.colliderect(fish_sprite.rect):
+                # Hanya ikan di sel grid sekitar kail yang diperiksa
+                for fish_sprite in self.game.fish_spatial_index.query_colliding(self.hook_collider_rect):
+                    if not fish_sprite.is_secured_on_hook:
                         print(f"--- FishingSystem: Kail menyentuh ikan '{fish_sprite.name}'! Menunggu tarikan pemain. ---")
                         self.hooked_fish_sprite = fish_sprite
                         self.fish_on_line_awaiting_pull = True
+                        self.game.audio.play_sfx('gotcha', priority=1)
                         # is_casting bisa tetap true sampai pemain menekan SPACE atau kail ditarik paksa
                         break 
 
@@ -141,6 +147,7 @@ class FishingSystem:
                     
                     if self.game.inventory and hasattr(self.game.inventory, 'add_fish_from_data'):
                         self.game.inventory.add_fish_from_data(self.current_hooked_fish_data)
+                    self.game.audio.play_sfx('catch', priority=2) # Prioritas tertinggi: tidak boleh tertimpa percikan
                     
                     # HAPUS BARIS INI UNTUK MENGHENTIKAN PENAMBAHAN KOIN LANGSUNG
                     # if hasattr(self.game, 'wallet'):
@@ -148,7 +155,7 @@ class FishingSystem:
                     #     self.game.wallet += fish_value
                     #     print(f"    Koin bertambah {fish_value}. Total koin: {self.game.wallet}")
                     
-                    self.game.visible_fish_sprites.remove(self.hooked_fish_sprite)
+                    self.game.remove_visible_fish(self.hooked_fish_sprite)
                     self.game.spawn_visible_fish(amount=1)
 
                 elif self.hooked_fish_sprite and not self.hooked_fish_sprite.is_secured_on_hook:
@@ -184,7 +191,7 @@ class FishingSystem:
             if hasattr(self.game.ui, 'small_font') and self.game.ui.small_font:
                  font_to_use = self.game.ui.small_font
 
-            prompt_text = font_to_use.render("SPACE!", True, self.config.COLORS.get('legendary', (255,215,0)))
+            prompt_text = self.config.get_text_cache().render(font_to_use, "SPACE!", self.config.COLORS.get('legendary', (255,215,0)))
             prompt_rect = prompt_text.get_rect(midbottom=hook_visual_screen_rect.midtop)
             prompt_rect.y -= 5
             screen.blit(prompt_text, prompt_rect)
\ No newline at end of file
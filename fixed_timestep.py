@@ -0,0 +1,85 @@
+# fixed_timestep.py
+from contextlib import contextmanager
+
+class FixedTimestep:
+    """
+    Akumulator untuk loop simulasi bertick tetap. advance() menerima waktu frame nyata dan
+    mengembalikan jumlah langkah simulasi (masing-masing `step` detik) yang harus dijalankan;
+    sisa waktu yang belum cukup untuk satu langkah menjadi `alpha` (0..1) untuk interpolasi render.
+    Jika tertinggal jauh (misal jendela di-drag), langkah dibatasi dan sisanya dibuang agar
+    simulasi tidak terus mengejar (spiral of death).
+    """
+    def __init__(self, hz=60, max_steps=5, max_frame_seconds=0.25):
+        self.step = 1.0 / hz
+        self.max_steps = max_steps
+        self.max_frame_seconds = max_frame_seconds
+        self.accumulator = 0.0
+        self.dropped_seconds = 0.0
+
+    def advance(self, frame_seconds):
+        self.accumulator += min(frame_seconds, self.max_frame_seconds)
+        steps = int(self.accumulator / self.step)
+        if steps > self.max_steps:
+            self.dropped_seconds += (steps - self.max_steps) * self.step
+            steps = self.max_steps
+            self.accumulator = self.step * steps + (self.accumulator % self.step)
+        self.accumulator -= steps * self.step
+        return steps
+
+    @property
+    def alpha(self):
+        return min(1.0, max(0.0, self.accumulator / self.step))
+
+    def reset(self):
+        self.accumulator = 0.0
+
+
+class RenderInterpolator:
+    """
+    Posisi render di antara dua keadaan simulasi. capture() dipanggil sebelum setiap langkah dengan
+    daftar target (get_state, set_state), di mana state berupa tuple angka (misal rect.topleft atau
+    offset kamera). Di dalam `with interpolated(alpha):` setiap target diset sementara ke
+    previous + (current - previous) * alpha dan dikembalikan setelah render, jadi kode render tidak berubah.
+    Lompatan lebih besar dari max_jump (teleport, ganti lokasi) tidak diinterpolasi.
+    """
+    def __init__(self, enabled=True, max_jump=200):
+        self.enabled = enabled
+        self.max_jump = max_jump
+        self._targets = [] # (get_state, set_state, keadaan sebelum langkah terakhir)
+
+    @staticmethod
+    def rect_target(rect):
+        return (lambda: rect.topleft, lambda state: setattr(rect, 'topleft', state))
+
+    @staticmethod
+    def attribute_target(obj, *names):
+        return (lambda: tuple(getattr(obj, name) for name in names),
+                lambda state: [setattr(obj, name, value) for name, value in zip(names, state)])
+
+    def capture(self, targets):
+        self._targets = [(get_state, set_state, get_state()) for get_state, set_state in targets] if self.enabled else []
+
+    def reset(self):
+        self._targets = []
+
+    def _blend(self, previous, current, alpha):
+        if len(previous) != len(current): return None
+        blended = []
+        for old, new in zip(previous, current):
+            if abs(new - old) > self.max_jump: return None
+            value = old + (new - old) * alpha
+            blended.append(int(round(value)) if isinstance(new, int) else value)
+        return tuple(blended)
+
+    @contextmanager
+    def interpolated(self, alpha):
+        restore = []
+        if alpha < 1.0:
+            for get_state, set_state, previous in self._targets:
+                current = get_state()
+                blended = self._blend(previous, current, alpha)
+                if blended is None or blended == tuple(current): continue
+                set_state(blended); restore.append((set_state, current))
+        try: yield
+        finally:
+            for set_state, current in reversed(restore): set_state(current)
@@ -0,0 +1,72 @@
+# font_registry.py
+import os
+import time
+import pygame
+
+class FontRegistry:
+    """
+    Satu tempat untuk resolusi dan cache font. Nama font di-resolve sekali
+    (path absolut -> file di FONT_PATH -> SysFont -> font bawaan pygame), lalu objek Font
+    di-cache per (font, ukuran, bold, italic) sehingga semua layar memakai instance yang sama.
+    get() aman dipanggil tiap frame: setelah pemanggilan pertama hanya berupa lookup dict.
+    """
+    DEFAULT_FONT = "none" # Nama khusus untuk font bawaan pygame (pygame.font.Font(None, ...))
+
+    def __init__(self, font_name=None, font_directory=None):
+        self.font_name = font_name
+        self.font_directory = font_directory
+        self._resolved = {}  # nama -> ('file', path) / ('sys', nama) / ('default', None)
+        self._fonts = {}     # (resolusi, ukuran, bold, italic) -> Font
+        self.hits = 0
+        self.misses = 0
+        self.load_seconds = 0.0
+
+    def resolve(self, name=None):
+        """Menentukan sumber font untuk nama ini (None = FONT_NAME dari Config). Hasilnya di-cache."""
+        if name is None: name = self.font_name
+        resolved = self._resolved.get(name)
+        if resolved is not None: return resolved
+        if not name or name.strip() == "" or name.strip().lower() == self.DEFAULT_FONT:
+            resolved = ('default', None)
+        elif os.path.isabs(name) and os.path.exists(name):
+            resolved = ('file', name)
+        elif self.font_directory and os.path.exists(os.path.join(self.font_directory, name)):
+            resolved = ('file', os.path.join(self.font_directory, name))
+        elif os.path.exists(name):
+            resolved = ('file', name)
+        else:
+            resolved = ('sys', name)
+        self._resolved[name] = resolved
+        return resolved
+
+    def get(self, size, name=None, bold=False, italic=False):
+        """Font untuk (nama, ukuran, gaya). Pemanggilan pertama memuat font; berikutnya dari cache."""
+        resolved = self.resolve(name)
+        key = (resolved, int(size), bool(bold), bool(italic))
+        font = self._fonts.get(key)
+        if font is not None:
+            self.hits += 1
+            return font
+        self.misses += 1
+        start = time.perf_counter()
+        font = self._load(resolved, int(size), bold, italic)
+        self.load_seconds += time.perf_counter() - start
+        self._fonts[key] = font
+        return font
+
+    def _load(self, resolved, size, bold, italic):
+        kind, source = resolved
+        try:
+            if kind == 'sys':
+                return pygame.font.SysFont(source, size, bold, italic)
+            font = pygame.font.Font(source, size)
+        except Exception as e:
+            print(f"--- FontRegistry ERROR: Gagal memuat font {source} ({size}px): {e}. Memakai font bawaan. ---")
+            font = pygame.font.Font(None, size)
+        if bold: font.set_bold(True)
+        if italic: font.set_italic(True)
+        return font
+
+    def stats(self):
+        return {"fonts": len(self._fonts), "hits": self.hits, "misses": self.misses,
+                "load_ms": self.load_seconds * 1000.0}
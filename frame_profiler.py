@@ -0,0 +1,180 @@
+# frame_profiler.py
+import time
+import contextlib
+from collections import deque
+import pygame
+
+def percentile(sorted_values, fraction):
+    if not sorted_values: return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+_NULL_SECTION = contextlib.nullcontext() # Dipakai section() saat profiler mati
+
+
+class _Section:
+    __slots__ = ("profiler", "name", "start")
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        frame_totals = self.profiler._frame_totals
+        frame_totals[self.name] = frame_totals.get(self.name, 0.0) + (time.perf_counter() - self.start)
+        return False
+
+
+class FrameProfiler:
+    """
+    Profiler per frame untuk overlay HUD. Kode game membungkus tiap subsistem dengan
+    `with profiler.section("render:fish"):`; section yang sama dalam satu frame dijumlahkan
+    (misal beberapa langkah update). Setiap frame, total per section masuk ke jendela bergulir
+    `window` frame, dan p50/p95/p99/maks dihitung ulang beberapa kali per detik untuk tabel HUD.
+    Frame yang melewati anggaran dicatat beserta section terbesarnya ("lonjakan terakhir").
+    Saat mati, section() hanya mengembalikan objek kosong bersama.
+    """
+    STATS_INTERVAL = 0.25 # Detik antar perhitungan ulang persentil dan tabel HUD
+
+    def __init__(self, window=300, budget_ms=1000.0 / 60, graph_size=(300, 70), enabled=False):
+        self.window = window
+        self.budget_ms = budget_ms
+        self.graph_size = graph_size
+        self.enabled = enabled
+        self._sections = {}       # nama -> _Section (dipakai ulang, tanpa alokasi per frame)
+        self._frame_totals = {}   # nama -> detik dalam frame berjalan
+        self._history = {}        # nama -> deque ms per frame (urut kemunculan pertama)
+        self._frame_history = deque(maxlen=window)
+        self._frame_start = None
+        self._stats_time = 0.0
+        self._panel = None
+        self._graph = None
+        self._graph_position = (0, 0)
+        self.last_spike = None    # (ms frame, nama section terbesar, ms section)
+        self.frames = 0
+        self.extra_rows = None    # Callable -> [(label, {"p50", "p95", "p99", "max"})], misal latensi input
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.reset()
+        print(f"--- FrameProfiler: HUD {'aktif' if self.enabled else 'nonaktif'} ---")
+        return self.enabled
+
+    def reset(self):
+        """Membuang semua data termasuk frame yang sedang berjalan (saat HUD dinyalakan/dimatikan)."""
+        self.clear_history()
+        self._frame_totals.clear(); self._frame_start = None; self.last_spike = None
+
+    def clear_history(self):
+        """
+        Membuang riwayat persentil (saat ganti state) agar angka mencerminkan scene yang sedang aktif. Frame yang
+        sedang berjalan dan last_spike dibiarkan: frame transisi (misal membangun map saat masuk 'fishing') tetap tercatat.
+        """
+        self._history.clear(); self._frame_history.clear()
+        self._stats_time = 0.0; self._panel = None; self._graph = None
+
+    def section(self, name):
+        if not self.enabled: return _NULL_SECTION
+        section = self._sections.get(name)
+        if section is None: section = self._sections[name] = _Section(self, name)
+        return section
+
+    def begin_frame(self):
+        if self.enabled: self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if not self.enabled or self._frame_start is None: return
+        frame_ms = (time.perf_counter() - self._frame_start) * 1000.0
+        self._frame_start = None
+        self.frames += 1
+        for name, seconds in self._frame_totals.items():
+            history = self._history.get(name)
+            if history is None: history = self._history[name] = deque(maxlen=self.window)
+            history.append(seconds * 1000.0)
+        for name, history in self._history.items():
+            if name not in self._frame_totals: history.append(0.0) # Section yang tidak jalan frame ini
+        if frame_ms > self.budget_ms and self._frame_totals:
+            # Yang dicari subsistem paling lambat, jadi section induk ("update" untuk "update:fish") dilewati
+            names = self._frame_totals.keys()
+            leaves = [name for name in names if not any(other.startswith(name + ":") for other in names)]
+            worst = max(leaves, key=self._frame_totals.get)
+            self.last_spike = (frame_ms, worst, self._frame_totals[worst] * 1000.0)
+        self._frame_totals.clear()
+        self._frame_history.append(frame_ms)
+        self._push_graph(frame_ms)
+
+    # --- Statistik ---
+    def stats(self):
+        """{nama: {"p50", "p95", "p99", "max"}} dalam milidetik, termasuk "frame" untuk total per frame."""
+        result = {}
+        for name, history in [("frame", self._frame_history)] + list(self._history.items()):
+            values = sorted(history)
+            result[name] = {"p50": percentile(values, 0.50), "p95": percentile(values, 0.95),
+                            "p99": percentile(values, 0.99), "max": values[-1] if values else 0.0}
+        return result
+
+    # --- Gambar HUD ---
+    def _push_graph(self, frame_ms):
+        """Grafik digeser satu kolom per frame (scroll), jadi tidak digambar ulang seluruhnya."""
+        width, height = self.graph_size
+        if self._graph is None:
+            self._graph = pygame.Surface((width, height)); self._graph.fill((10, 10, 20))
+        scale_ms = self.budget_ms * 3 # Tinggi grafik = 3x anggaran frame
+        graph = self._graph
+        graph.scroll(-1, 0)
+        graph.fill((10, 10, 20), (width - 1, 0, 1, height))
+        bar = min(height, int(frame_ms / scale_ms * height))
+        color = (80, 200, 90) if frame_ms <= self.budget_ms else ((230, 200, 60) if frame_ms <= self.budget_ms * 2 else (230, 70, 60))
+        if bar > 0: graph.fill(color, (width - 1, height - bar, 1, bar))
+        for multiple in (1, 2): # Garis anggaran 1x dan 2x
+            line_y = height - int(self.budget_ms * multiple / scale_ms * height)
+            graph.set_at((width - 1, line_y), (120, 120, 160))
+
+    def _build_panel(self, font):
+        """Tabel digambar per sel dengan kolom angka rata kanan, jadi tidak bergantung pada font monospace."""
+        rows = [("Section", "p50", "p95", "p99", "max")]
+        for name, values in self.stats().items():
+            label = ("  " + name) if ':' in name else name
+            rows.append((label, f"{values['p50']:.2f}", f"{values['p95']:.2f}", f"{values['p99']:.2f}", f"{values['max']:.2f}"))
+        for label, values in (self.extra_rows() if self.extra_rows else ()):
+            rows.append((label, f"{values['p50']:.1f}", f"{values['p95']:.1f}", f"{values['p99']:.1f}", f"{values['max']:.1f}"))
+        color = (235, 235, 235)
+        cells = [[font.render(text, True, color) for text in row] for row in rows]
+        footer = None
+        if self.last_spike:
+            frame_ms, name, section_ms = self.last_spike
+            footer = font.render(f"Lonjakan: {frame_ms:.1f} ms ({name} {section_ms:.1f} ms)", True, (240, 190, 90))
+        padding = 6; gap = 10; line_height = font.get_linesize()
+        column_widths = [max(row[index].get_width() for row in cells) for index in range(len(rows[0]))]
+        table_width = sum(column_widths) + gap * (len(column_widths) - 1)
+        width = max(table_width, self.graph_size[0], footer.get_width() if footer else 0) + padding * 2
+        text_height = line_height * (len(cells) + (1 if footer else 0))
+        panel = pygame.Surface((width, text_height + self.graph_size[1] + padding * 3), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for row_index, row in enumerate(cells):
+            y = padding + row_index * line_height
+            x = padding
+            for column_index, surface in enumerate(row):
+                right_aligned = column_index > 0
+                panel.blit(surface, (x + column_widths[column_index] - surface.get_width() if right_aligned else x, y))
+                x += column_widths[column_index] + gap
+        if footer: panel.blit(footer, (padding, padding + len(cells) * line_height))
+        self._graph_position = (padding, padding * 2 + text_height)
+        return panel
+
+    def draw(self, screen, font, topright=None):
+        """Menggambar HUD dengan sudut kanan atas di `topright` (default: pojok kanan atas layar)."""
+        if not self.enabled: return
+        now = time.perf_counter()
+        if self._panel is None or now - self._stats_time >= self.STATS_INTERVAL:
+            self._panel = self._build_panel(font); self._stats_time = now
+        if topright is None: topright = (screen.get_width() - 10, 10)
+        position = (topright[0] - self._panel.get_width(), topright[1])
+        screen.blit(self._panel, position)
+        if self._graph is not None:
+            screen.blit(self._graph, (position[0] + self._graph_position[0], position[1] + self._graph_position[1]))
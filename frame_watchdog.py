@@ -0,0 +1,114 @@
+# frame_watchdog.py
+import os
+import sys
+import time
+import threading
+from collections import Counter, deque
+from report_writer import write_report
+
+class FrameWatchdog:
+    """
+    Pengawas frame panjang. Game.run memanggil heartbeat() di awal setiap frame (hanya
+    menyimpan waktu mulai). Thread "FrameWatchdog" tidur sampai frame berjalan melewati anggaran;
+    frame normal tidak pernah disentuh, sehingga biayanya sekitar satu bangun-tidur per frame.
+    Jika frame yang sama masih berjalan setelah anggaran habis, stack thread utama diambil
+    tiap `sample_ms` lewat sys._current_frames() sampai heartbeat berikutnya, lalu diringkas
+    (stack terbanyak dan fungsi terdalam). N laporan terakhir disimpan dan ditulis ke log saat keluar;
+    log ditimpa setiap sesi agar tidak tumbuh tanpa batas.
+    Catatan: selama thread utama berada di pemanggilan C yang tidak melepas GIL, sampel tertunda
+    sampai pemanggilan itu selesai.
+    """
+    MAX_STACK_DEPTH = 40
+
+    def __init__(self, budget_ms=33.0, sample_ms=5.0, max_reports=20, log_path=None):
+        self.budget = budget_ms / 1000.0
+        self.sample_interval = sample_ms / 1000.0
+        self.log_path = log_path
+        self.reports = deque(maxlen=max_reports)
+        self.long_frames = 0
+        self._frame = None            # (nomor frame, waktu mulai, label); diganti utuh tiap heartbeat
+        self._frame_number = 0
+        self._main_thread_id = None
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self._thread is not None: return
+        self._main_thread_id = threading.get_ident() # Dipanggil dari thread game loop
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="FrameWatchdog", daemon=True)
+        self._thread.start()
+
+    def heartbeat(self, label=None):
+        self._frame_number += 1
+        self._frame = (self._frame_number, time.perf_counter(), label)
+
+    def stop(self, write_log=True):
+        if self._thread is None: return
+        self._stop_event.set()
+        self._thread.join(timeout=1.0)
+        self._thread = None
+        if write_log and self.log_path and self.reports: self.write_log(self.log_path)
+
+    # --- Thread pengawas ---
+    def _run(self):
+        stop_event = self._stop_event
+        while not stop_event.is_set():
+            frame = self._frame
+            if frame is None:
+                stop_event.wait(self.budget); continue
+            delay = frame[1] + self.budget - time.perf_counter()
+            if delay > 0:
+                if stop_event.wait(delay): break
+                if self._frame is not frame: continue # Frame selesai dalam anggaran
+            self._sample_long_frame(frame)
+
+    def _sample_long_frame(self, frame):
+        frame_number, start, label = frame
+        stacks = Counter(); innermost = Counter(); sample_count = 0
+        while self._frame is frame and not self._stop_event.is_set():
+            stack = self._sample_main_stack()
+            if stack:
+                stacks[stack] += 1; innermost[stack[-1]] += 1; sample_count += 1
+            self._stop_event.wait(self.sample_interval)
+        next_frame = self._frame
+        end = next_frame[1] if next_frame is not frame and next_frame is not None else time.perf_counter()
+        if next_frame is not frame and next_frame is not None and next_frame[2] != label:
+            label = f"{label}->{next_frame[2]}" # Frame yang berganti state (misal masuk 'fishing')
+        report = {"frame": frame_number, "label": label, "time": time.time(), "duration_ms": (end - start) * 1000.0,
+                  "samples": sample_count, "stacks": stacks.most_common(5), "innermost": innermost.most_common(10)}
+        with self._lock:
+            self.reports.append(report)
+            self.long_frames += 1
+        print(f"--- FrameWatchdog: Frame #{frame_number} ({label}) {report['duration_ms']:.0f} ms, "
+              f"{sample_count} sampel, terdalam: {report['innermost'][0][0] if report['innermost'] else '-'} ---")
+
+    def _sample_main_stack(self):
+        python_frame = sys._current_frames().get(self._main_thread_id)
+        stack = []
+        while python_frame is not None and len(stack) < self.MAX_STACK_DEPTH:
+            code = python_frame.f_code
+            stack.append(f"{os.path.basename(code.co_filename)}:{python_frame.f_lineno} {code.co_name}")
+            python_frame = python_frame.f_back
+        stack.reverse() # Terluar dulu, terdalam terakhir
+        return tuple(stack)
+
+    # --- Laporan ---
+    def format_reports(self):
+        with self._lock: reports = list(self.reports); long_frames = self.long_frames
+        lines = [f"=== Fishing Mania: frame panjang {time.strftime('%Y-%m-%d %H:%M:%S')} "
+                 f"(anggaran {self.budget * 1000:.0f} ms, {long_frames} frame panjang, {len(reports)} laporan terakhir) ==="]
+        for report in reports:
+            lines.append("")
+            lines.append(f"Frame #{report['frame']} state={report['label']} {report['duration_ms']:.1f} ms, "
+                         f"{report['samples']} sampel ({time.strftime('%H:%M:%S', time.localtime(report['time']))})")
+            if report["innermost"]:
+                lines.append("  Fungsi terdalam: " + ", ".join(f"{name} {count}x" for name, count in report["innermost"]))
+            for stack, count in report["stacks"]:
+                lines.append(f"  Stack ({count}x):")
+                lines.extend(f"    {entry}" for entry in stack)
+        return "\n".join(lines) + "\n"
+
+    def write_log(self, path):
+        return write_report(path, self.format_reports(), "FrameWatchdog", f"{len(self.reports)} laporan frame panjang")
@@ -6,26 +6,64 @@ import random
 import traceback
 
 from config import Config
-from menu import MainMenu, ShopMenu, MarketScreen, InventoryScreen # SettingsMenu sudah kita asumsikan tidak dipakai
 from camera_system import Camera
-from player import Player as PlayerBoat
+from spatial_hash import SpatialHash
 from boat import Boat
-from game_map import GameMap
 from ui import UI
 from inventory import Inventory
 from market import Market
-from map_explore import MapExplorer
-from fishing_system import FishingSystem
-from land_explorer import LandExplorer
-from sprites import Player as LandPlayer, Spritesheet
 from game_data import GameData
+from dirty_rect import DirtyRectRenderer
+from location_cache import LocationCache
+from fixed_timestep import FixedTimestep, RenderInterpolator
+from frame_profiler import FrameProfiler
+from profile_capture import ProfileCapture
+from frame_watchdog import FrameWatchdog
+from allocation_audit import AllocationAudit, count_allocation
+from input_latency import InputLatencyTracker
+
+def _scene_property(name):
+    """Atribut Game yang membangun scene lewat factory-nya saat pertama diakses."""
+    return property(lambda self: self.get_scene(name))
+
 
 class Game:
+    # Scene dibangun saat pertama dipakai (lihat _register_scenes), jadi menu utama tampil
+    # tanpa menunggu peta dunia, daratan, atau modul memancing
+    main_menu = _scene_property('main_menu')
+    shop_menu = _scene_property('shop_menu')
+    market_screen = _scene_property('market_screen')
+    inventory_screen = _scene_property('inventory_screen')
+    map_explorer = _scene_property('map_explorer')
+    character_spritesheet = _scene_property('character_spritesheet')
+    land_player = _scene_property('land_player')
+    land_explorer = _scene_property('land_explorer')
+
     def __init__(self, screen):
         print("--- Game: Memulai Game.__init__()... ---")
         self.screen = screen
         self.config = Config() 
+        profiler = self.config.get_startup_profiler() # Span per komponen; no-op kecuali --profile-startup
+        self._scenes = {}
+        self._scene_factories = {}
+        self._register_scenes()
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep(self.config.SIMULATION_HZ, self.config.MAX_SIMULATION_STEPS, self.config.MAX_FRAME_SECONDS)
+        self.render_interpolator = RenderInterpolator(self.config.RENDER_INTERPOLATION)
+        self.frame_profiler = FrameProfiler(self.config.FRAME_PROFILER_WINDOW, 1000.0 / (self.config.FPS or self.config.SIMULATION_HZ),
+                                            enabled=self.config.FRAME_PROFILER_ENABLED) # HUD waktu per subsistem (F3)
+        self.profile_capture = ProfileCapture(self.config.PROFILE_CAPTURE_DIRECTORY, self.config.PROFILE_STATE_GROUPS,
+                                              self.config.PROFILE_CAPTURE_LABEL) # Rekaman cProfile per state (F4)
+        if self.config.PROFILE_CAPTURE: self.profile_capture.start()
+        self.watchdog = FrameWatchdog(self.config.WATCHDOG_BUDGET_MS, self.config.WATCHDOG_SAMPLE_MS,
+                                      self.config.WATCHDOG_MAX_REPORTS, self.config.WATCHDOG_LOG_PATH) # Dimulai di run()
+        self.allocation_audit = AllocationAudit(self.config.ALLOCATION_AUDIT_THRESHOLD_OBJECTS, self.config.ALLOCATION_AUDIT_THRESHOLD_BYTES,
+                                                self.config.ALLOCATION_AUDIT_TRACE_FRAMES, self.config.ALLOCATION_AUDIT_MAX_REPORTS,
+                                                self.config.ALLOCATION_AUDIT_LOG_PATH) # Alokasi per frame (F6)
+        if self.config.ALLOCATION_AUDIT: self.allocation_audit.start()
+        self.input_latency = InputLatencyTracker(self.config.INPUT_LATENCY_WINDOW, self.config.INPUT_LATENCY_MAX_PENDING_SECONDS,
+                                                 self.config.INPUT_LATENCY_ENABLED) # Input sampai flip, per state
+        self.frame_profiler.extra_rows = self.input_latency.hud_rows
         self.running = True
         self.current_fps = 0
 
@@ -36,11 +74,16 @@ class Game:
         self.current_state_name = "main_menu" 
         self.unlocked_locations = {"Coast": True, "Sea": False, "Ocean": False}
         self.current_music_file = None # Atribut untuk melacak musik
+        # Sumber status tombol yang ditahan. Runner headless bisa menggantinya dengan input berskrip.
+        self.key_state_provider = pygame.key.get_pressed
+        with profiler.span("DirtyRectRenderer"): self.dirty_renderer = DirtyRectRenderer(self.screen)
+        with profiler.span("AudioManager"): self.audio = self.config.get_audio_manager() # SFX di-decode di sini, musik di latar belakang
+        with profiler.span("LocationCache"): self.location_cache = LocationCache(self.config, self.config.LOCATION_CACHE_MAX_BYTES)
 
         # 2. Inisialisasi komponen game yang mungkin dibutuhkan oleh GameData
         #    atau yang datanya akan diisi/diupdate oleh GameData.load_game()
-        self.inventory = Inventory(self)
-        self.market = Market(self)
+        with profiler.span("Inventory"): self.inventory = Inventory(self)
+        with profiler.span("Market"): self.market = Market(self)
 
         class InitialDummyMap:
             def __init__(self_map, parent_game_instance): # Menggunakan self_map untuk inner class
@@ -52,36 +95,21 @@ class Game:
                 self_map.background_image.fill((0,0,50))
         
         self.fishing_world_rect = pygame.Rect(0,0,self.config.SCREEN_WIDTH,self.config.SCREEN_HEIGHT)
-        self.boat = Boat(InitialDummyMap(self), self.config, self.fishing_world_rect)
+        with profiler.span("Boat"): self.boat = Boat(InitialDummyMap(self), self.config, self.fishing_world_rect)
 
         # --- URUTAN DIPERBAIKI ---
         # 3. Inisialisasi GameData SEKARANG.
         #    MapExplorer dan komponen lain mungkin membutuhkan game_data_manager.
-        self.game_data_manager = GameData(self) 
+        with profiler.span("GameData"): self.game_data_manager = GameData(self) 
         
-        # 4. SEKARANG baru inisialisasi MapExplorer dan LandExplorer,
-        #    karena mereka mungkin mengakses self.game.game_data_manager atau self.game.config.
-        self.map_explorer = MapExplorer(self)
-        
-        try: 
-            self.character_spritesheet = Spritesheet(self.config.PLAYER_SPRITESHEET_PATH) 
-        except Exception as e: 
-            print(f"--- Game: ERROR memuat spritesheet karakter: {e}. ---")
-            self.character_spritesheet = None
-            
-        self.land_player = None # land_player dibuat sebelum LandExplorer jika LandExplorer membutuhkannya
-        if self.character_spritesheet:
-            self.land_player = LandPlayer(self,5,5) # Posisi awal x,y dalam tile jika relevan
-        else:
-            print("--- Game: PERINGATAN - Tidak bisa membuat LandPlayer karena character_spritesheet gagal dimuat.")
-        self.land_explorer = LandExplorer(self) # LandExplorer akan menggunakan self.land_player yang sudah ada (atau None)
-        # -------------------------
+        # 4. MapExplorer, LandExplorer dan menu TIDAK dibuat di sini (lihat _register_scenes).
+        #    MapExplorer membaca posisi kapal dari game_data_manager.data saat pertama dibuat.
 
         # 5. Panggil load_game SETELAH semua komponen utama yang mungkin diakses
         #    oleh _apply_data_to_game_instance (via load_game) sudah ada.
         try:
             print("--- Game: Memanggil self.game_data_manager.load_game()... ---")
-            self.game_data_manager.load_game() 
+            with profiler.span("load_game"): self.game_data_manager.load_game() 
             print("--- Game: Selesai memanggil self.game_data_manager.load_game(). ---")
             # Atribut seperti self.wallet, self.current_state_name, self.boat.upgrades, 
             # self.unlocked_locations, self.inventory.fish_list, 
@@ -98,34 +126,16 @@ class Game:
                 print("--- Game.__init__: FATAL - game_data_manager tidak ada. Tidak bisa reset.")
 
 
-        # 6. Inisialisasi Font Debug (bisa dipindah lebih awal jika perlu, tapi setelah config)
-        try:
-            font_name_to_load = self.config.FONT_NAME
-            actual_font_path = None
-            if font_name_to_load and font_name_to_load.strip().lower() != 'none':
-                if os.path.isabs(font_name_to_load) and os.path.exists(font_name_to_load):
-                    actual_font_path = font_name_to_load
-                else: 
-                    potential_path = os.path.join(self.config.FONT_PATH, font_name_to_load)
-                    if os.path.exists(potential_path): actual_font_path = potential_path
-            small_font_size = self.config.FONT_SIZES.get('small', 18)
-            if actual_font_path: self.debug_font = pygame.font.Font(actual_font_path, small_font_size)
-            elif font_name_to_load and font_name_to_load.strip().lower() != 'none': self.debug_font = pygame.font.SysFont(font_name_to_load, small_font_size)
-            else: self.debug_font = pygame.font.SysFont("arial", 18)
-        except Exception as e:
-            print(f"--- Game: ERROR debug font: {e}. Menggunakan default pygame.font.Font(None, 24). ---")
-            self.debug_font = pygame.font.Font(None, 24)
+        # 6. Font Debug (dari registry bersama; tanpa FONT_NAME memakai SysFont "arial" seperti HUD)
+        font_registry = self.config.get_font_registry()
+        self.debug_font = font_registry.get(self.config.FONT_SIZES.get('small', 18), name=self.config.FONT_NAME or "arial")
+        self.frame_profiler_font = font_registry.get(self.config.FRAME_PROFILER_FONT_SIZE, name=self.config.FRAME_PROFILER_FONT) # Tidak dimuat saat F3 pertama
 
         # 7. Sisa inisialisasi komponen game
         self.desired_waterline_on_screen_y = 400
         self.water_top_y_world = 10 
         self.water_bottom_y_world = 30
         
-        self.main_menu = MainMenu(self)
-        self.shop_menu = ShopMenu(self)
-        self.market_screen = MarketScreen(self)
-        self.inventory_screen = InventoryScreen(self)
-        
         self.all_sprites=pygame.sprite.Group() # Untuk LandExplorer
         self.blocks=pygame.sprite.Group()    # Untuk LandExplorer
         
@@ -135,126 +145,275 @@ class Game:
         
         self.fishing_camera=Camera(self.config.SCREEN_WIDTH,self.config.SCREEN_HEIGHT,self.config.SCREEN_WIDTH,self.config.SCREEN_HEIGHT) 
         self.visible_fish_sprites=pygame.sprite.Group()
+        self.fish_spatial_index=SpatialHash(self.config.FISH_SPATIAL_CELL_SIZE) # Ikan didaftarkan di sini untuk query kail/radius
+        self.fish_school=None # Mesin simulasi NumPy, dibuat saat masuk 'fishing' jika tersedia
         
-        self.ui=UI(self)
-        
-        # Update menu setelah semua data game (termasuk yang di-load) siap
-        self.main_menu.update_options()
-        self.shop_menu.update_options()
-        self.market_screen.update_options()
-        self.inventory_screen.update_options()
+        with profiler.span("UI"): self.ui=UI(self)
         
+        font_stats = font_registry.stats()
+        print(f"--- Game: {font_stats['fonts']} font dimuat dalam {font_stats['load_ms']:.1f} ms ---")
         print(f"--- Game: Game.__init__() selesai. Wallet akhir init: {self.wallet}, State awal: {self.current_state_name} ---")
 
+    def _register_scenes(self):
+        """Mendaftarkan factory scene. Modul daratan, peta, dan memancing baru diimpor saat scene-nya dibuat."""
+        def create_main_menu():
+            from menu import MainMenu
+            return MainMenu(self)
+        def create_shop_menu():
+            from menu import ShopMenu
+            return ShopMenu(self)
+        def create_market_screen():
+            from menu import MarketScreen
+            return MarketScreen(self)
+        def create_inventory_screen():
+            from menu import InventoryScreen
+            return InventoryScreen(self)
+        def create_map_explorer():
+            from map_explore import MapExplorer
+            return MapExplorer(self)
+        def create_character_spritesheet():
+            from sprites import Spritesheet
+            try: return Spritesheet(self.config.PLAYER_SPRITESHEET_PATH, self.config.get_surface_registry())
+            except Exception as e:
+                print(f"--- Game: ERROR memuat spritesheet karakter: {e}. ---")
+                return None
+        def create_land_player():
+            from sprites import Player as LandPlayer
+            if not self.character_spritesheet:
+                print("--- Game: PERINGATAN - Tidak bisa membuat LandPlayer karena character_spritesheet gagal dimuat.")
+                return None
+            return LandPlayer(self,5,5) # Posisi awal x,y dalam tile jika relevan
+        def create_land_explorer():
+            from land_explorer import LandExplorer
+            self.land_player # land_player dibuat sebelum LandExplorer karena LandExplorer memakainya
+            return LandExplorer(self)
+        for name, factory in (('main_menu', create_main_menu), ('shop_menu', create_shop_menu),
+                              ('market_screen', create_market_screen), ('inventory_screen', create_inventory_screen),
+                              ('map_explorer', create_map_explorer), ('character_spritesheet', create_character_spritesheet),
+                              ('land_player', create_land_player), ('land_explorer', create_land_explorer)):
+            self.register_scene(name, factory)
+
+    def register_scene(self, name, factory):
+        self._scene_factories[name] = factory
+
+    def get_scene(self, name):
+        """Mengambil scene; dibangun lewat factory-nya pada akses pertama lalu disimpan."""
+        if name not in self._scenes:
+            if name not in self._scene_factories: raise AttributeError(f"Scene '{name}' tidak terdaftar")
+            with self.config.get_startup_profiler().span(f"scene:{name}"):
+                self._scenes[name] = self._scene_factories[name]()
+        return self._scenes[name]
+
+    def is_scene_loaded(self, name):
+        return name in self._scenes
+
+    def get_loaded_scene(self, name):
+        """Scene yang sudah dibangun, atau None (tidak memicu pembangunan)."""
+        return self._scenes.get(name)
+
     def _play_music(self, filename):
-        """Metode terpusat untuk memutar, menghentikan, dan mengubah musik."""
+        """Metode terpusat untuk memutar, menghentikan, dan mengubah musik (crossfade lewat AudioManager)."""
         # Jika tidak ada nama file, hentikan musik yang sedang diputar.
         if not filename:
-            if pygame.mixer.music.get_busy():
-                pygame.mixer.music.fadeout(500) # Fade out halus
+            self.audio.play_music(None)
             self.current_music_file = None
             return
 
-        # Jangan restart jika musik yang benar sudah diputar
-        if self.current_music_file == filename and pygame.mixer.music.get_busy():
+        full_path = os.path.join(self.config.SOUND_PATH, filename)
+        if not os.path.exists(full_path):
+            print(f"--- Game Music WARNING: File musik tidak ditemukan: '{full_path}' ---")
             return
-        
-        # Jika musik berbeda atau tidak ada yang diputar, muat dan mainkan yang baru.
+        # Trek yang belum selesai di-decode tidak menahan frame: musik lama jalan terus sampai siap
+        if self.current_music_file != filename: print(f"--- Game Music: Memutar '{filename}' ---")
         self.current_music_file = filename
-        full_path = os.path.join(self.config.SOUND_PATH, filename)
+        self.audio.play_music(filename)
 
-        if os.path.exists(full_path):
-            try:
-                pygame.mixer.music.load(full_path)
-                pygame.mixer.music.play(-1, fade_ms=500) # -1 untuk loop, fade_ms untuk fade in
-                print(f"--- Game Music: Memutar '{filename}' ---")
-            except pygame.error as e:
-                print(f"--- Game Music ERROR: Tidak dapat memutar musik '{full_path}': {e} ---")
-                self.current_music_file = None
+    def _prepare_music_for_neighbours(self, state_name):
+        """Decode lebih dulu musik state yang bisa dituju dari state ini (peta: lihat prepare_music_for_map_target)."""
+        if state_name in ('main_menu', 'fishing'):
+            self.audio.prepare_music(['Wave.ogg', 'Land.ogg'])
+        elif state_name == 'land_explore':
+            self.audio.prepare_music(['Wave.ogg'])
+
+    def prepare_music_for_map_target(self, target_state_name):
+        """
+        Dipanggil MapExplorer saat spot yang dituju berganti. Hanya musik spot itu yang di-decode: semua trek
+        lokasi sekaligus (~28 MB per trek) melebihi MUSIC_CACHE_MAX_BYTES dan langsung saling membuang.
+        """
+        if target_state_name == 'land_explore':
+            song = 'Land.ogg'
         else:
-            print(f"--- Game Music WARNING: File musik tidak ditemukan: '{full_path}' ---")
-            self.current_music_file = None
+            from game_map import GameMap
+            if not self.unlocked_locations.get(target_state_name, False): return # Spot terkunci tidak bisa dimasuki
+            song = GameMap.LOCATIONS.get(target_state_name, {}).get('music')
+        if song: self.audio.prepare_music([song], replace_queued=True)
 
     def run(self):
         print("--- Game: Memulai Game.run()... ---")
         print(f"--- Game: Memasuki game loop utama. State awal dari __init__: {self.current_state_name} ---")
         
         initial_game_state_to_run = self.current_state_name if self.current_state_name else 'main_menu'
-        self.change_state(initial_game_state_to_run, initial_setup=True)
+        if self.config.WATCHDOG_ENABLED: self.watchdog.start()
+        startup_profiler = self.config.get_startup_profiler()
+        with startup_profiler.span("change_state", state=initial_game_state_to_run):
+            self.change_state(initial_game_state_to_run, initial_setup=True)
 
+        step_dt = self.timestep.step
+        frame_profiler = self.frame_profiler; profile_capture = self.profile_capture; allocation_audit = self.allocation_audit
+        surface_registry = self.config.get_surface_registry()
         while self.running:
-            dt = self.clock.tick(self.config.FPS)/1000.0
-            dt=min(dt,0.1) 
+            frame_seconds = self.clock.tick(self.config.FPS)/1000.0
             self.current_fps = self.clock.get_fps()
+            self.watchdog.heartbeat(self.current_state_name)
+            frame_profiler.begin_frame()
+            allocation_audit.begin_frame()
+            surface_registry.next_frame()
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT: 
-                    self.running = False
-                    if hasattr(self, 'game_data_manager'): self.game_data_manager.save_game() 
-                if self.running: self.handle_state_specific_event(event)
+            with frame_profiler.section("events"):
+                for event in pygame.event.get(): self.process_event(event)
             
             if not self.running: break
-            try: self.update_current_state(dt)
+            # Simulasi selalu maju dengan dt tetap; jumlah langkah per frame mengikuti waktu nyata
+            try:
+                for _ in range(self.timestep.advance(frame_seconds)):
+                    self.render_interpolator.capture(self._interpolation_targets())
+                    with frame_profiler.section("update"), profile_capture.capture(self.current_state_name): self.update_current_state(step_dt)
+                    if not self.running: break
             except Exception as e: 
                 print(f"--- ERROR DALAM UPDATE ({self.current_state_name}): {e} ---"); traceback.print_exc(); self.running=False
             if not self.running: break
-            try: self.render_current_state()
+            try:
+                with self.render_interpolator.interpolated(self.timestep.alpha), frame_profiler.section("render"), \
+                     profile_capture.capture(self.current_state_name): self.render_current_state()
             except Exception as e: 
                 print(f"--- ERROR DALAM RENDER ({self.current_state_name}): {e} ---"); traceback.print_exc(); self.running=False
+            frame_profiler.end_frame()
+            allocation_audit.end_frame(self.current_state_name)
+            if startup_profiler.active: startup_profiler.finish() # Frame pertama sudah tampil
                 
         print("--- Game: Keluar dari game loop utama. ---")
         self.quit_game()
 
+    def _interpolation_targets(self):
+        """Posisi yang diinterpolasi saat render untuk state aktif (sprite bergerak dan kamera)."""
+        rect_target = RenderInterpolator.rect_target
+        targets = []
+        if self.current_state_name == 'fishing':
+            for sprite in (self.boat, self.player):
+                if sprite and sprite.rect: targets.append(rect_target(sprite.rect))
+            targets.extend(rect_target(fish_sprite.rect) for fish_sprite in self.visible_fish_sprites
+                           if fish_sprite.rect and not fish_sprite.school_culled)
+            if self.fishing_system: targets.append(RenderInterpolator.attribute_target(self.fishing_system, 'hook_depth'))
+            if self.fishing_camera: targets.append((self.fishing_camera.get_offset, self.fishing_camera.set_offset))
+        elif self.current_state_name == 'land_explore':
+            land_player = self.get_loaded_scene('land_player'); land_explorer = self.get_loaded_scene('land_explorer')
+            if land_player and land_player.rect: targets.append(rect_target(land_player.rect))
+            if land_explorer and land_explorer.camera: targets.append((land_explorer.camera.get_offset, land_explorer.camera.set_offset))
+        elif self.current_state_name == 'map_explore':
+            map_explorer = self.get_loaded_scene('map_explorer')
+            if map_explorer and map_explorer.player_map_rect: targets.append(rect_target(map_explorer.player_map_rect))
+        return targets
+
+    def get_pressed_keys(self):
+        return self.key_state_provider()
+
+    def process_event(self, event):
+        if event.type == pygame.QUIT: 
+            self.running = False
+            if hasattr(self, 'game_data_manager'): self.game_data_manager.save_game() 
+        elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            self.dirty_renderer.invalidate() # Isi jendela mungkin hilang, gambar ulang penuh
+        elif event.type == pygame.KEYDOWN and event.key == self.config.FRAME_PROFILER_KEY:
+            self.frame_profiler.toggle()
+            self.dirty_renderer.invalidate() # Area bekas HUD harus digambar ulang
+            return
+        elif event.type == pygame.KEYDOWN and event.key == self.config.PROFILE_CAPTURE_KEY:
+            self.profile_capture.toggle()
+            return
+        elif event.type == pygame.KEYDOWN and event.key == self.config.ALLOCATION_AUDIT_KEY:
+            self.allocation_audit.toggle()
+            return
+        elif event.type == pygame.KEYDOWN and event.key == self.config.SURFACE_DUMP_KEY:
+            self.config.get_surface_registry().dump(self.config.SURFACE_DUMP_PATH)
+            return
+        if self.running:
+            self.input_latency.input_received(event, self.current_state_name) # Efeknya ditandai oleh handler di bawah
+            try: self.handle_state_specific_event(event)
+            finally: self.input_latency.input_handled()
+
     def handle_state_specific_event(self, event):
         active_handler=None; handled=False
         if self.current_state_name == 'fishing':
             if self.fishing_system and self.fishing_system.handle_event(event): handled=True 
             if not handled and event.type==pygame.KEYDOWN and event.key==pygame.K_ESCAPE: self.change_state('map_explore'); handled=True
         if handled: return
-        handlers = {'main_menu':self.main_menu, 'shop':self.shop_menu, 'market_screen':self.market_screen,
-                    'inventory_screen':self.inventory_screen, 'land_explore':self.land_explorer,'map_explore':self.map_explorer}
-        active_handler = handlers.get(self.current_state_name)
-        if active_handler and hasattr(active_handler,'handle_event') and active_handler.handle_event(event): return
+        handlers = {'main_menu':'main_menu', 'shop':'shop_menu', 'market_screen':'market_screen',
+                    'inventory_screen':'inventory_screen', 'land_explore':'land_explorer','map_explore':'map_explorer'}
+        handler_scene = handlers.get(self.current_state_name)
+        active_handler = self.get_scene(handler_scene) if handler_scene else None # Hanya scene state aktif yang dibangun
+        if active_handler and hasattr(active_handler,'handle_event') and active_handler.handle_event(event):
+            self.input_latency.mark_current(f"handled:{handler_scene}") # Misal pilihan menu berpindah
+            return
 
     def render_current_state(self):
-        deep_sea_fill_color = self.config.COLORS.get('deep_ocean_blue', (20, 25, 60)); self.screen.fill(deep_sea_fill_color)
+        section = self.frame_profiler.section
+        # HUD profiler menimpa layar tiap frame, jadi selama aktif dirty rect dimatikan
+        use_dirty_rects = self.config.USE_DIRTY_RECTS and not self.config.DEBUG and not self.frame_profiler.enabled and self.current_state_name in self.config.DIRTY_RECT_STATES
+        screen = self.dirty_renderer.begin_frame() if use_dirty_rects else self.screen
+        deep_sea_fill_color = self.config.COLORS.get('deep_ocean_blue', (20, 25, 60)); screen.fill(deep_sea_fill_color)
         active_renderer = None
         if self.current_state_name == 'main_menu': active_renderer = self.main_menu
         elif self.current_state_name == 'shop': active_renderer = self.shop_menu
         elif self.current_state_name == 'market_screen': active_renderer = self.market_screen
         elif self.current_state_name == 'inventory_screen': active_renderer = self.inventory_screen
-        if active_renderer and hasattr(active_renderer, 'render'): active_renderer.render(self.screen)
+        if active_renderer and hasattr(active_renderer, 'render'):
+            with section("render:scene"): active_renderer.render(screen)
         elif self.current_state_name == 'land_explore': 
-            if self.land_explorer: self.land_explorer.render(self.screen) 
+            with section("render:scene"):
+                if self.land_explorer: self.land_explorer.render(screen) 
         elif self.current_state_name == 'map_explore': 
-            if self.map_explorer: self.map_explorer.render(self.screen) 
+            with section("render:scene"):
+                if self.map_explorer: self.map_explorer.render(screen) 
         elif self.current_state_name == 'fishing':
-            if self.current_game_map and self.current_game_map.background_image and self.fishing_camera: 
-                bg_img = self.current_game_map.background_image; bg_img_width = bg_img.get_width(); bg_img_height = bg_img.get_height()
-                if bg_img_width > 0 and self.boat and self.boat.rect: 
-                    waterline_world_y = self.boat.rect.bottom; horizon_offset_in_bg_image = bg_img_height * 0.78 
-                    background_top_world_y = waterline_world_y - horizon_offset_in_bg_image
-                    camera_world_left_x = self.fishing_camera.camera_rect.left 
-                    start_tile_index = int(camera_world_left_x // bg_img_width) -1
-                    tiles_on_screen_approx = int(self.config.SCREEN_WIDTH // bg_img_width) + 3 
-                    for i in range(start_tile_index, start_tile_index + tiles_on_screen_approx):
-                        tile_world_x = self.fishing_world_rect.left + (i * bg_img_width)
-                        tile_bg_world_rect = pygame.Rect(tile_world_x, background_top_world_y, bg_img_width, bg_img_height)
-                        screen_pos = self.fishing_camera.apply(tile_bg_world_rect).topleft 
-                        self.screen.blit(bg_img, screen_pos)
-            if self.fishing_camera: 
-                for fish_sprite in self.visible_fish_sprites:
-                    if fish_sprite.image and fish_sprite.rect: 
-                        img_to_render = pygame.transform.flip(fish_sprite.image, fish_sprite.swim_direction > 0, False) 
-                        self.screen.blit(img_to_render, self.fishing_camera.apply(fish_sprite.rect)) 
-            if self.boat and hasattr(self.boat, 'render_with_camera') and self.fishing_camera: self.boat.render_with_camera(self.screen, self.fishing_camera) 
-            if self.player and hasattr(self.player, 'render_with_camera') and self.fishing_camera: self.player.render_with_camera(self.screen, self.fishing_camera) 
-            if self.fishing_system and hasattr(self.fishing_system, 'render_with_camera') and self.fishing_camera: self.fishing_system.render_with_camera(self.screen, self.fishing_camera) 
-        if self.ui and hasattr(self.ui, 'render') and self.current_state_name in ['land_explore', 'map_explore', 'fishing']: self.ui.render(self.screen) 
+            with section("render:background"):
+                if self.current_game_map and self.current_game_map.background_image and self.fishing_camera: 
+                    background_strip = self.current_game_map.get_background_strip(self.config.SCREEN_WIDTH)
+                    if background_strip and self.boat and self.boat.rect: 
+                        waterline_world_y = self.boat.rect.bottom; horizon_offset_in_bg_image = background_strip.height * 0.78 
+                        background_top_world_y = int(waterline_world_y - horizon_offset_in_bg_image)
+                        # Satu blit jendela yang terlihat dari strip yang sudah dipanggang (tanpa Rect baru per tile)
+                        background_strip.draw(screen, self.fishing_world_rect.left, self.fishing_camera.camera_rect.left,
+                                              background_top_world_y + self.fishing_camera.offset_y)
+            with section("render:fish"):
+                if self.fishing_camera: 
+                    touch_surface = self.config.get_surface_registry().touch
+                    for fish_sprite in self.visible_fish_sprites:
+                        if fish_sprite.image and fish_sprite.rect and not fish_sprite.school_culled: 
+                            img_to_render = touch_surface(fish_sprite.get_render_image()) # Varian flip/rotasi dari cache, tanpa alokasi surface baru
+                            screen.blit(img_to_render, self.fishing_camera.apply_to_point(fish_sprite.rect.centerx - img_to_render.get_width() // 2,
+                                                                                           fish_sprite.rect.centery - img_to_render.get_height() // 2)) 
+            with section("render:boat"):
+                if self.boat and hasattr(self.boat, 'render_with_camera') and self.fishing_camera: self.boat.render_with_camera(screen, self.fishing_camera) 
+                if self.player and hasattr(self.player, 'render_with_camera') and self.fishing_camera: self.player.render_with_camera(screen, self.fishing_camera) 
+            with section("render:line"):
+                if self.fishing_system and hasattr(self.fishing_system, 'render_with_camera') and self.fishing_camera: self.fishing_system.render_with_camera(screen, self.fishing_camera) 
+        if self.ui and hasattr(self.ui, 'render') and self.current_state_name in ['land_explore', 'map_explore', 'fishing']:
+            with section("render:ui"): self.ui.render(screen)
+        if use_dirty_rects:
+            with section("render:flip"): self.dirty_renderer.end_frame() # Hanya area yang berubah yang digambar dan di-update
+            self.input_latency.frame_presented()
+            return
         
         if self.config.DEBUG and hasattr(self, 'debug_font'): 
-            debug_start_y = self.config.SCREEN_HEIGHT - (self.debug_font.get_height() + 3) * 7 
-            texts = [f"FPS: {int(self.current_fps)}", f"State: {self.current_state_name}"]
+            debug_start_y = self.config.SCREEN_HEIGHT - (self.debug_font.get_height() + 3) * 10 
+            asset_stats = self.config.get_asset_cache().stats()
+            text_stats = self.config.get_text_cache().stats()
+            surface_stats = self.config.get_surface_registry().stats()
+            texts = [f"FPS: {int(self.current_fps)}", f"State: {self.current_state_name}",
+                     f"Assets: {asset_stats['hits']} hit / {asset_stats['misses']} miss, {asset_stats['bytes'] / (1024*1024):.1f} MB",
+                     f"Teks: {text_stats['entries']} entri, hit rate {text_stats['hit_rate'] * 100:.1f}%",
+                     f"Surface: {surface_stats['surfaces']} tercatat, {surface_stats['bytes'] / (1024*1024):.1f}"
+                     f"/{(surface_stats['budget_bytes'] or 0) / (1024*1024):.0f} MB{' MELEBIHI BUDGET' if surface_stats['over_budget'] else ''}"]
             if self.current_state_name == 'fishing' and self.fishing_camera and self.fishing_system and self.boat and self.boat.rect: 
                 texts.append(f"CamOff(X:{int(self.fishing_camera.offset_x)},Y:{int(self.fishing_camera.offset_y)})") 
                 boat_bottom_screen_y = self.boat.rect.bottom + self.fishing_camera.offset_y 
@@ -266,11 +425,20 @@ class Game:
             if self.current_state_name == 'fishing' and self.fishing_system: 
                 active_fish_info = f"Hooked: {'Yes' if self.fishing_system.hooked_fish_sprite else 'No'}" 
                 afs = self.debug_font.render(active_fish_info, True, self.config.COLORS.get('white')); self.screen.blit(afs, (self.config.SCREEN_WIDTH - afs.get_width() - 10, 10)) 
-        pygame.display.flip()
+        if self.frame_profiler.enabled:
+            with section("render:hud"): self.frame_profiler.draw(self.screen, self.frame_profiler_font, topright=(self.config.SCREEN_WIDTH - 10, 60)) # Di bawah bar kedalaman
+        with section("render:flip"): pygame.display.flip()
+        self.input_latency.frame_presented()
 
     def quit_game(self):
+        self.profile_capture.stop() # Rekaman yang masih berjalan tetap ditulis
+        self.watchdog.stop() # Laporan frame panjang ditulis ke log
+        self.allocation_audit.stop() # Frame yang melewati ambang ditulis ke log
+        for line in self.input_latency.format_summary(): print(f"--- Latensi input: {line} ---")
         print("--- Game: Menyimpan game sebelum keluar... ---")
-        if hasattr(self, 'game_data_manager'): self.game_data_manager.save_game() 
+        if hasattr(self, 'game_data_manager'):
+            self.game_data_manager.save_game()
+            self.game_data_manager.flush() # Tunggu penulisan latar belakang selesai sebelum proses berakhir
         pygame.quit(); sys.exit()
     
     def change_state(self, new_state_name, data=None, initial_setup=False):
@@ -278,6 +446,9 @@ class Game:
         if self.current_state_name == new_state_name and not initial_setup and new_state_name == 'main_menu':
              should_save = True # Simpan jika kembali ke main_menu setelah aksi (misal, reset)
 
+        self.render_interpolator.reset() # Posisi state lama tidak boleh dicampur dengan state baru
+        self.input_latency.state_changed(self.current_state_name, new_state_name) # Jika dipicu input yang sedang ditangani
+        self.frame_profiler.clear_history() # Persentil HUD hanya untuk state yang sedang aktif
         print(f"--- Game: State: {self.current_state_name} -> {new_state_name} (InitialSetup: {initial_setup}, ShouldSave: {should_save}) ---")
         
         current_wallet_before_save = self.wallet if hasattr(self, 'wallet') else 'N/A (wallet belum ada)'
@@ -290,23 +461,25 @@ class Game:
         self.all_sprites.empty(); self.blocks.empty()
         
         self.current_state_name = new_state_name
+        self.dirty_renderer.invalidate() # Frame pertama state baru selalu digambar penuh
         
         current_wallet_after_save = self.wallet if hasattr(self, 'wallet') else 'N/A (wallet belum ada)'
         print(f"--- DEBUG Game.change_state: Wallet SETELAH save & state name diubah: {current_wallet_after_save} ---")
 
         if new_state_name == 'main_menu':
             for menu_attr in ['main_menu', 'shop_menu', 'market_screen', 'inventory_screen']:
-                if hasattr(self, menu_attr) and getattr(self, menu_attr): getattr(self, menu_attr).update_options()
+                if self.get_loaded_scene(menu_attr): self.get_loaded_scene(menu_attr).update_options() # Menu yang belum dibuat akan mengisi opsinya sendiri
         elif new_state_name == 'land_explore':
             if self.land_explorer: self.land_explorer.setup_scene()
         elif new_state_name == 'map_explore':
             if self.map_explorer and hasattr(self.map_explorer,'setup_scene'): pass 
+            self.prewarm_unlocked_locations()
         elif new_state_name == 'fishing':
             if data and 'location_name' in data:
                 location_name = data['location_name']
                 try:
-                    self.current_game_map = GameMap(location_name, self.config) 
-                    fishing_world_width = int(self.config.SCREEN_WIDTH*1.2); fishing_world_height = int(self.config.SCREEN_HEIGHT*2.0) 
+                    self.current_game_map = self.location_cache.get(location_name) # Sudah disiapkan saat di peta dunia
+                    fishing_world_width = int(self.config.SCREEN_WIDTH*self.config.FISHING_WORLD_WIDTH_FACTOR); fishing_world_height = int(self.config.SCREEN_HEIGHT*self.config.FISHING_WORLD_HEIGHT_FACTOR) 
                     self.fishing_world_rect.size = (fishing_world_width, fishing_world_height)
                     self.fishing_camera.world_width = fishing_world_width; self.fishing_camera.world_height = fishing_world_height
                     target_boat_bottom_y_world = self.desired_waterline_on_screen_y; initial_boat_world_x = self.fishing_world_rect.centerx
@@ -316,6 +489,9 @@ class Game:
                     self.water_top_y_world = self.boat.rect.bottom + 1 
                     self.water_bottom_y_world = min(self.boat.rect.bottom + (self.config.SCREEN_HEIGHT*0.7), fishing_world_height - 20)
                     if self.water_top_y_world >= self.water_bottom_y_world: self.water_bottom_y_world = min(self.water_top_y_world + self.config.SCREEN_HEIGHT//3, fishing_world_height - 20)
+                    from player import Player as PlayerBoat
+                    from fishing_system import FishingSystem
+                    from fish_school import FishSchool
                     if not self.player: self.player = PlayerBoat(self.boat, self) 
                     else: self.player.boat = self.boat
                     if self.player: self.player.update_position()
@@ -323,7 +499,13 @@ class Game:
                          target_focus_y_world = self.boat.rect.bottom - (self.desired_waterline_on_screen_y-(self.config.SCREEN_HEIGHT/2))                        
                          initial_focus_rect = pygame.Rect(0,0,1,1); initial_focus_rect.center = (self.boat.rect.centerx, target_focus_y_world) 
                          self.fishing_camera.update(initial_focus_rect)
-                    self.fishing_system = FishingSystem(self); self.visible_fish_sprites.empty(); self.spawn_visible_fish(amount=random.randint(8,12))
+                    self.fishing_system = FishingSystem(self); self.clear_visible_fish()
+                    if self.config.USE_FISH_SCHOOL and FishSchool.is_available():
+                        if not self.fish_school: self.fish_school = FishSchool(seed=random.getrandbits(32))
+                        self.fish_school.add_many(self.config.FISH_SCHOOL_EXTRA_FISH, self.fishing_world_rect.left + 50, self.fishing_world_rect.right - 50,
+                                                  self.water_top_y_world, self.water_bottom_y_world)
+                    else: self.fish_school = None
+                    self.spawn_visible_fish(amount=random.randint(8,12))
                 except Exception as e: print(f"--- Game: ERROR setup fishing state: {e} ---"); traceback.print_exc(); self.change_state('map_explore')
             else: print("--- Game: PERINGATAN - Pindah ke 'fishing' tanpa data lokasi."); self.change_state('map_explore')
         elif new_state_name == 'shop': 
@@ -347,9 +529,16 @@ class Game:
         # Panggil metode pemutar musik terpusat.
         # Ini akan menangani penghentian, perubahan, dan pemutaran musik.
         self._play_music(target_music_file)
+        self._prepare_music_for_neighbours(new_state_name)
         # --- AKHIR LOGIKA MUSIK BARU ---
 
 
+    def prewarm_unlocked_locations(self):
+        """Menyiapkan GameMap lokasi yang terbuka di latar belakang dan membuang yang tidak lagi terbuka."""
+        unlocked_names = [name for name, unlocked in self.unlocked_locations.items() if unlocked]
+        self.location_cache.retain_only(unlocked_names, keep_name=getattr(self.current_game_map, "name", None))
+        if self.config.PREWARM_LOCATIONS: self.location_cache.prewarm(unlocked_names)
+
     def spawn_visible_fish(self, amount=5):
         if not self.current_game_map or not self.fishing_camera or self.current_state_name!='fishing': return 
         if not hasattr(self,'water_top_y_world') or not hasattr(self,'water_bottom_y_world') or self.water_top_y_world>=self.water_bottom_y_world: return 
@@ -364,31 +553,78 @@ class Game:
                 spawn_x = random.randint(int(world_left), int(world_right)) 
                 spawn_y = random.randint(int(self.water_top_y_world), int(self.water_bottom_y_world)) 
                 new_fish_sprite = Fish(fish_data, (spawn_x, spawn_y), self.config)
-                if new_fish_sprite.image: self.visible_fish_sprites.add(new_fish_sprite); spawn_count +=1
+                if new_fish_sprite.image: self.add_visible_fish(new_fish_sprite); spawn_count +=1
+
+    def add_visible_fish(self, fish_sprite):
+        self.visible_fish_sprites.add(fish_sprite)
+        self.fish_spatial_index.insert(fish_sprite)
+        if self.fish_school: self.fish_school.add_sprite(fish_sprite)
+
+    def remove_visible_fish(self, fish_sprite):
+        self.visible_fish_sprites.remove(fish_sprite)
+        self.fish_spatial_index.remove(fish_sprite)
+        if self.fish_school: self.fish_school.remove(getattr(fish_sprite, 'school_index', None))
+
+    def clear_visible_fish(self):
+        self.visible_fish_sprites.empty()
+        self.fish_spatial_index.clear()
+        if self.fish_school: self.fish_school.clear()
+
+    def _update_fish_with_school(self, dt):
+        """Versi vektor dari loop ikan: simulasi di FishSchool, lalu sinkronkan sprite di sekitar kamera."""
+        school = self.fish_school
+        hooked_fish = self.fishing_system.hooked_fish_sprite if self.fishing_system else None
+        if hooked_fish is not None and hooked_fish.is_secured_on_hook:
+            # Ikan yang sudah ditarik mengikuti kail (logika Python biasa), slot-nya dibekukan
+            school.set_caught(hooked_fish.school_index, True)
+            hooked_fish.update(dt)
+            self.fish_spatial_index.update(hooked_fish)
+        school.step(dt, self.fishing_world_rect.left, self.fishing_world_rect.right, self.water_top_y_world, self.water_bottom_y_world)
+        synced, culled = school.sync_sprites(self.fishing_camera.camera_rect, self.config.FISH_SCHOOL_SYNC_MARGIN)
+        for fish_sprite in synced: self.fish_spatial_index.insert(fish_sprite)
+        for fish_sprite in culled: self.fish_spatial_index.remove(fish_sprite)
     
     def update_current_state(self, dt):
+        section = self.frame_profiler.section
+        with section("update:audio"): self.audio.update() # Mulai trek yang baru selesai di-decode
         if self.current_state_name == 'land_explore': 
-            if self.land_explorer: self.land_explorer.update(dt) 
-            if self.land_player: self.land_player.update()
+            with section("update:scene"):
+                if self.land_explorer: self.land_explorer.update(dt) 
+                if self.land_player: self.land_player.update(dt)
         elif self.current_state_name == 'map_explore': 
-            if self.map_explorer: self.map_explorer.update(dt) 
+            with section("update:scene"):
+                if self.map_explorer: self.map_explorer.update(dt) 
         elif self.current_state_name == 'fishing':
-            if self.boat: self.boat.update(dt, pygame.key.get_pressed()) 
-            if self.player: self.player.update(dt) 
-            for fish_sprite in list(self.visible_fish_sprites): fish_sprite.update(dt) 
-            if self.fishing_world_rect: 
-                for fish_sprite in list(self.visible_fish_sprites):
-                    fish_sprite.rect.left=max(self.fishing_world_rect.left,fish_sprite.rect.left)
-                    fish_sprite.rect.right=min(self.fishing_world_rect.right,fish_sprite.rect.right)
-                    if (fish_sprite.rect.left==self.fishing_world_rect.left and fish_sprite.swim_direction<0) or \
-                       (fish_sprite.rect.right==self.fishing_world_rect.right and fish_sprite.swim_direction>0):
-                        fish_sprite.swim_direction *= -1
-                    fish_sprite.pos[0]=fish_sprite.rect.centerx
-                    if hasattr(self,'water_top_y_world') and hasattr(self,'water_bottom_y_world'):
-                        fish_sprite.rect.top=max(self.water_top_y_world,fish_sprite.rect.top)
-                        fish_sprite.rect.bottom=min(self.water_bottom_y_world,fish_sprite.rect.bottom)
-                        fish_sprite.pos[1]=fish_sprite.rect.centery
-            if self.fishing_system: self.fishing_system.update(dt) 
+            with section("update:boat"):
+                if self.boat:
+                    boat_x = self.boat.rect.x if self.boat.rect else None
+                    self.boat.update(dt, self.get_pressed_keys()) 
+                    if self.boat.rect and boat_x is not None and self.boat.rect.x != boat_x:
+                        self.input_latency.mark_effect(pygame.K_LEFT if self.boat.rect.x < boat_x else pygame.K_RIGHT, "boat_move")
+                if self.player: self.player.update(dt) 
+            # Satu kali jalan per ikan: gerak, batasi ke dunia & pita air, lalu perbarui indeks spasial
+            world_rect = self.fishing_world_rect; water_top = self.water_top_y_world; water_bottom = self.water_bottom_y_world
+            fish_index = self.fish_spatial_index
+            with section("update:fish"):
+                if self.fish_school: self._update_fish_with_school(dt)
+                else:
+                    count_allocation("game:sprite_list") # sprites() menyalin isi grup ke list baru
+                    for fish_sprite in self.visible_fish_sprites.sprites():
+                        fish_sprite.update(dt)
+                        if world_rect:
+                            fish_rect = fish_sprite.rect
+                            fish_rect.left=max(world_rect.left,fish_rect.left)
+                            fish_rect.right=min(world_rect.right,fish_rect.right)
+                            if (fish_rect.left==world_rect.left and fish_sprite.swim_direction<0) or \
+                               (fish_rect.right==world_rect.right and fish_sprite.swim_direction>0):
+                                fish_sprite.swim_direction *= -1
+                            fish_sprite.pos[0]=fish_rect.centerx
+                            fish_rect.top=max(water_top,fish_rect.top)
+                            fish_rect.bottom=min(water_bottom,fish_rect.bottom)
+                            fish_sprite.pos[1]=fish_rect.centery
+                        fish_index.update(fish_sprite)
+            with section("update:fishing_system"):
+                if self.fishing_system: self.fishing_system.update(dt) 
             if self.boat and self.boat.rect and self.fishing_camera and self.fishing_system: 
                 hook_world_x, hook_tip_world_y = self.fishing_system._get_hook_tip_world_position() 
                 camera_target_x = self.boat.rect.centerx 
@@ -396,5 +632,5 @@ class Game:
                                          self.fishing_system.fish_on_line_awaiting_pull, self.fishing_system.hook_depth > 10]) 
                 if is_fishing_action: camera_target_y = hook_tip_world_y 
                 else: camera_target_y = self.boat.rect.bottom-(self.desired_waterline_on_screen_y-(self.config.SCREEN_HEIGHT/2)) 
-                focus_rect = pygame.Rect(0,0,1,1); focus_rect.center = (camera_target_x, camera_target_y)
+                focus_rect = pygame.Rect(0,0,1,1); focus_rect.center = (camera_target_x, camera_target_y); count_allocation("game:focus_rect")
                 self.fishing_camera.update(focus_rect)
\ No newline at end of file
@@ -1,16 +1,40 @@
 # game_data.py
 import json
 import os
+import copy
 import traceback 
+from save_writer import SaveWriter, write_json_atomic, write_save_batch, read_json_lines
 
 class GameData:
+    # Field skalar yang dicatat ke jurnal sebagai record "set" jika nilainya berubah sejak save terakhir
+    JOURNAL_FIELDS = ("coins", "boat_upgrades", "unlocked_locations", "player_map_position", "current_game_state")
+
     def __init__(self, game_instance, save_file_name="save_game.json"):
         # print("--- DEBUG GameData: __init__ MULAI ---") # Kurangi DEBUG jika sudah stabil
         self.game = game_instance
-        self.save_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "saves", save_file_name)
+        save_directory = getattr(getattr(self.game, 'config', None), 'SAVE_DIRECTORY', None) or \
+                         os.path.join(os.path.dirname(os.path.abspath(__file__)), "saves")
+        self.save_file_path = os.path.join(save_directory, save_file_name)
+        self.journal_file_path = os.path.splitext(self.save_file_path)[0] + ".journal"
         
         self.data = self._get_initial_data() 
         self._ensure_save_directory_exists()
+        config_ref = getattr(self.game, 'config', None)
+        # Mode jurnal: mutasi dicatat sebagai record kecil di file .journal, snapshot penuh hanya saat kompaksi
+        self.use_journal = getattr(config_ref, 'SAVE_JOURNAL', False)
+        self.journal_max_bytes = getattr(config_ref, 'SAVE_JOURNAL_MAX_BYTES', 64 * 1024)
+        self.journal_seq = 0             # Nomor urut record terakhir
+        self._journal_bytes = 0          # Perkiraan ukuran file jurnal saat ini
+        self._pending_journal_records = [] # Mutasi ikan yang belum disimpan (tanpa seq)
+        self._journaled_fields = None    # Nilai JOURNAL_FIELDS yang terakhir tersimpan; None = perlu snapshot
+        self._journal_suspended = False
+        if self.use_journal and getattr(self.game, 'inventory', None) and hasattr(self.game.inventory.fish_list, 'listener'):
+            self.game.inventory.fish_list.listener = self._on_fish_list_changed
+        # Penulisan save di thread latar belakang (atomik dan digabung); None = tulis langsung di thread utama
+        self.save_writer = None
+        if getattr(config_ref, 'ASYNC_SAVES', False):
+            self.save_writer = SaveWriter(self.save_file_path, getattr(config_ref, 'SAVE_COALESCE_SECONDS', 0.25),
+                                          journal_path=self.journal_file_path if self.use_journal else None)
         # print(f"--- GameData: Inisialisasi dengan save file: {self.save_file_path} ---") # Kurangi DEBUG
         # print("--- DEBUG GameData: __init__ SELESAI ---")
 
@@ -39,46 +63,154 @@ class GameData:
             try: os.makedirs(save_dir); print(f"--- GameData: Direktori save game dibuat: {save_dir} ---")
             except OSError as e: print(f"--- GameData ERROR: Gagal membuat direktori save game {save_dir}: {e} ---")
 
-    def save_game(self):
+    def _loaded_map_explorer(self):
+        if hasattr(self.game, 'get_loaded_scene'): return self.game.get_loaded_scene('map_explorer')
+        return getattr(self.game, 'map_explorer', None)
+
+    def _refresh_collected_fish(self):
+        if hasattr(self.game, 'inventory') and self.game.inventory and hasattr(self.game.inventory, 'fish_list'):
+            fish_list = self.game.inventory.fish_list
+            if hasattr(fish_list, 'get_data_list'): self.data["collected_fish"] = fish_list.get_data_list()
+            else: self.data["collected_fish"] = [fish.get_data() for fish in fish_list if hasattr(fish, 'get_data')]
+
+    def save_game(self, force_snapshot=False):
         # print(f"--- DEBUG GameData: save_game DIPANGGIL. self.game.wallet: {getattr(getattr(self, 'game', None), 'wallet', 'N/A')} ---")
         if hasattr(self.game, 'wallet'): self.data["coins"] = self.game.wallet
         if hasattr(self.game, 'boat') and self.game.boat and hasattr(self.game.boat, 'upgrades'): self.data["boat_upgrades"] = self.game.boat.upgrades.copy()
         if hasattr(self.game, 'unlocked_locations'): self.data["unlocked_locations"] = self.game.unlocked_locations.copy()
-        if hasattr(self.game, 'inventory') and self.game.inventory and hasattr(self.game.inventory, 'fish_list'):
-            self.data["collected_fish"] = [fish.get_data() for fish in self.game.inventory.fish_list if hasattr(fish, 'get_data')]
+        if not self.use_journal: self._refresh_collected_fish() # Di mode jurnal, list ikan hanya dibangun ulang saat kompaksi
         player_map_pos_to_save = None
-        if hasattr(self.game, 'map_explorer') and self.game.map_explorer:
-            if hasattr(self.game.map_explorer, 'player_map_rect') and self.game.map_explorer.player_map_rect:
-                player_map_pos_to_save = {"x": self.game.map_explorer.player_map_rect.centerx, "y": self.game.map_explorer.player_map_rect.centery}
-            elif hasattr(self.game.map_explorer, 'player_world_pos'):
-                 player_map_pos_to_save = {"x": self.game.map_explorer.player_world_pos[0], "y": self.game.map_explorer.player_world_pos[1]}
+        map_explorer = self._loaded_map_explorer() # Jika peta belum pernah dibuka, posisi di self.data tetap berlaku
+        if map_explorer:
+            if hasattr(map_explorer, 'player_map_rect') and map_explorer.player_map_rect:
+                player_map_pos_to_save = {"x": map_explorer.player_map_rect.centerx, "y": map_explorer.player_map_rect.centery}
+            elif hasattr(map_explorer, 'player_world_pos'):
+                 player_map_pos_to_save = {"x": map_explorer.player_world_pos[0], "y": map_explorer.player_world_pos[1]}
         if player_map_pos_to_save: self.data["player_map_position"] = player_map_pos_to_save
         if hasattr(self.game, 'current_state_name'): self.data["current_game_state"] = self.game.current_state_name
         # print(f"--- DEBUG GameData: save_game - Data yang AKAN DISIMPAN: Koin={self.data.get('coins')} ---")
+        if self.use_journal: return self._save_journal(force_snapshot)
+        snapshot = self._make_snapshot()
         try:
-            with open(self.save_file_path, 'w') as f: json.dump(self.data, f, indent=4)
-            print(f"--- GameData: Game berhasil disimpan. Koin DISIMPAN: {self.data.get('coins')}. Ke: {self.save_file_path} ---")
+            if self.save_writer:
+                self.save_writer.submit(snapshot)
+                print(f"--- GameData: Save dijadwalkan. Koin DISIMPAN: {snapshot.get('coins')}. Ke: {self.save_file_path} ---")
+            else:
+                write_json_atomic(self.save_file_path, snapshot)
+                print(f"--- GameData: Game berhasil disimpan. Koin DISIMPAN: {snapshot.get('coins')}. Ke: {self.save_file_path} ---")
             return True
         except Exception as e: print(f"--- GameData ERROR: Kesalahan saat menyimpan game: {e} ---"); traceback.print_exc(); return False
 
+    def _make_snapshot(self):
+        # Snapshot terpisah dari self.data: list ikan sudah baru, sisanya kecil sehingga murah di-deepcopy
+        return {key: (value if key == "collected_fish" else copy.deepcopy(value)) for key, value in self.data.items()}
+
+    # --- Jurnal save ---
+    def _on_fish_list_changed(self, operation, payload):
+        if self._journal_suspended: return
+        fish_list = self.game.inventory.fish_list
+        if operation == 'add':
+            self._pending_journal_records.append({"op": "fish_add", "fish": [fish_list.species_data(species_id, value) for species_id, value in payload]})
+        elif operation == 'remove':
+            self._pending_journal_records.append({"op": "fish_remove", "index": payload})
+        elif operation == 'clear':
+            self._pending_journal_records = [{"op": "fish_clear"}] # Mutasi ikan sebelumnya tidak relevan lagi
+
+    def _collect_journal_records(self):
+        records = self._pending_journal_records
+        self._pending_journal_records = []
+        journaled = self._journaled_fields or {}
+        for field in self.JOURNAL_FIELDS:
+            if field in self.data and journaled.get(field) != self.data[field]:
+                records.append({"op": "set", "field": field, "value": copy.deepcopy(self.data[field])})
+        for record in records:
+            self.journal_seq += 1
+            record["seq"] = self.journal_seq
+        return records
+
+    def _remember_journaled_fields(self):
+        self._journaled_fields = {field: copy.deepcopy(self.data[field]) for field in self.JOURNAL_FIELDS if field in self.data}
+
+    def _save_journal(self, force_snapshot=False):
+        """Menyimpan hanya yang berubah sebagai record jurnal; snapshot penuh ditulis jika jurnal sudah terlalu besar."""
+        records = self._collect_journal_records()
+        new_bytes = sum(len(json.dumps(record, separators=(',', ':'))) + 1 for record in records)
+        snapshot = None
+        if force_snapshot or self._journaled_fields is None or self._journal_bytes + new_bytes > self.journal_max_bytes:
+            self._refresh_collected_fish()
+            self.data["journal_seq"] = self.journal_seq # Record dengan seq <= ini sudah tercakup snapshot
+            snapshot = self._make_snapshot()
+            self._journal_bytes = 0
+        else:
+            self._journal_bytes += new_bytes
+        self._remember_journaled_fields()
+        if snapshot is None and not records: return True # Tidak ada yang berubah
+        try:
+            if self.save_writer:
+                if snapshot is not None: self.save_writer.submit(snapshot)
+                self.save_writer.append(records)
+            else:
+                write_save_batch(self.save_file_path, snapshot, self.journal_file_path, records)
+            kind = "snapshot (kompaksi)" if snapshot is not None else f"{len(records)} record jurnal"
+            print(f"--- GameData: Save {kind}. Koin DISIMPAN: {self.data.get('coins')}. Ke: {self.save_file_path} ---")
+            return True
+        except Exception as e: print(f"--- GameData ERROR: Kesalahan saat menyimpan jurnal: {e} ---"); traceback.print_exc(); return False
+
+    @staticmethod
+    def _replay_journal_record(data, record):
+        operation = record.get("op")
+        if operation == "fish_add": data.setdefault("collected_fish", []).extend(record.get("fish", []))
+        elif operation == "fish_remove":
+            fish = data.get("collected_fish", []); index = record.get("index", -1)
+            if 0 <= index < len(fish): del fish[index]
+        elif operation == "fish_clear": data["collected_fish"] = []
+        elif operation == "set": data[record["field"]] = record.get("value")
+
+    def _replay_journal(self, data):
+        base_seq = data.get("journal_seq", 0)
+        self.journal_seq = base_seq
+        data["collected_fish"] = list(data.get("collected_fish", [])) # Salinan, agar replay tidak mengubah data default
+        replayed = 0
+        for record in read_json_lines(self.journal_file_path):
+            seq = record.get("seq", 0)
+            if seq <= base_seq: continue # Sudah tercakup snapshot (kompaksi terputus sebelum jurnal dikosongkan)
+            self._replay_journal_record(data, record)
+            self.journal_seq = max(self.journal_seq, seq); replayed += 1
+        self._journal_bytes = os.path.getsize(self.journal_file_path) if os.path.exists(self.journal_file_path) else 0
+        if replayed: print(f"--- GameData: {replayed} record jurnal diputar ulang (seq terakhir {self.journal_seq}) ---")
+        return data
+
+    def flush(self, timeout=None):
+        """Menunggu sampai save yang masih antre di thread latar belakang benar-benar tertulis."""
+        if self.save_writer: return self.save_writer.flush(timeout)
+        return True
+
+    def get_save_stats(self):
+        return self.save_writer.stats() if self.save_writer else None
+
     def load_game(self):
         # print(f"--- DEBUG GameData: load_game DIPANGGIL: {self.save_file_path} ---")
+        self.flush() # Pastikan save yang masih antre sudah ada di disk sebelum dibaca
         if not os.path.exists(self.save_file_path):
             print(f"--- GameData: File save tidak ditemukan. Menggunakan data default. ---")
             self.data = self._get_initial_data()
             self._apply_data_to_game_instance(self.data, "file_not_found_init")
+            self._journaled_fields = None # Save berikutnya menulis snapshot penuh (dan mengosongkan jurnal lama)
             return False
         try:
             with open(self.save_file_path, 'r') as f: loaded_data_from_file = json.load(f)
             default_data_template = self._get_initial_data()
             final_loaded_data = default_data_template.copy(); final_loaded_data.update(loaded_data_from_file)
+            if self.use_journal: final_loaded_data = self._replay_journal(final_loaded_data)
             self.data = final_loaded_data
             self._apply_data_to_game_instance(self.data, "load_success")
+            if self.use_journal: self._remember_journaled_fields()
             print(f"--- GameData: Game berhasil dimuat dari: {self.save_file_path} ---")
             return True
         except Exception as e:
             print(f"--- GameData ERROR: Gagal memuat game: {e}. Menggunakan data default. ---"); traceback.print_exc()
-            self.data = self._get_initial_data(); self._apply_data_to_game_instance(self.data, "load_exception_fallback"); return False
+            self.data = self._get_initial_data(); self._apply_data_to_game_instance(self.data, "load_exception_fallback")
+            self._journaled_fields = None; return False
 
     def _apply_data_to_game_instance(self, data_to_apply, call_source="unknown"):
         # print(f"--- DEBUG GameData: _apply_data_to_game_instance DIPANGGIL dari '{call_source}'. Menerapkan Koin: {data_to_apply.get('coins')} ---")
@@ -95,19 +227,23 @@ class GameData:
             self.game.boat.current_line_length_value = self.game.boat.UPGRADE_LEVELS["line_length"][line_length_level]
         if hasattr(self.game, 'unlocked_locations'): self.game.unlocked_locations = data_to_apply.get("unlocked_locations", default_template["unlocked_locations"]).copy()
         if hasattr(self.game, 'inventory') and self.game.inventory:
-            self.game.inventory.fish_list.clear()
-            collected_fish_data = data_to_apply.get("collected_fish", default_template["collected_fish"])
-            if collected_fish_data:
-                try:
-                    from fish import Fish
-                    for fish_dict in collected_fish_data: self.game.inventory.add_fish_from_data(fish_dict)
-                except Exception as e_fish: print(f"--- GameData ERROR: Gagal proses data ikan: {e_fish}")
+            self._journal_suspended = True # Mengisi ulang inventaris dari save bukan mutasi yang perlu dijurnal
+            try:
+                self.game.inventory.fish_list.clear()
+                collected_fish_data = data_to_apply.get("collected_fish", default_template["collected_fish"])
+                if collected_fish_data:
+                    try: self.game.inventory.load_fish_data(collected_fish_data)
+                    except Exception as e_fish: print(f"--- GameData ERROR: Gagal proses data ikan: {e_fish}")
+            finally:
+                self._journal_suspended = False
+            self._pending_journal_records = []
         map_pos_data = data_to_apply.get("player_map_position", default_template["player_map_position"])
-        if hasattr(self.game, 'map_explorer') and self.game.map_explorer:
-            if hasattr(self.game.map_explorer, 'player_map_rect') and self.game.map_explorer.player_map_rect:
-                self.game.map_explorer.player_map_rect.centerx = map_pos_data["x"]; self.game.map_explorer.player_map_rect.centery = map_pos_data["y"]
-            elif hasattr(self.game.map_explorer, 'player_world_pos'):
-                 self.game.map_explorer.player_world_pos[0] = map_pos_data["x"]; self.game.map_explorer.player_world_pos[1] = map_pos_data["y"]
+        map_explorer = self._loaded_map_explorer() # MapExplorer yang dibuat nanti membaca posisi dari self.data
+        if map_explorer:
+            if hasattr(map_explorer, 'player_map_rect') and map_explorer.player_map_rect:
+                map_explorer.player_map_rect.centerx = map_pos_data["x"]; map_explorer.player_map_rect.centery = map_pos_data["y"]
+            elif hasattr(map_explorer, 'player_world_pos'):
+                 map_explorer.player_world_pos[0] = map_pos_data["x"]; map_explorer.player_world_pos[1] = map_pos_data["y"]
         if hasattr(self.game, 'current_state_name'):
             self.game.current_state_name = data_to_apply.get("current_game_state", default_template.get("current_game_state"))
         # print(f"--- DEBUG GameData: _apply_data SELESAI. self.game.wallet: {getattr(getattr(self, 'game', None), 'wallet', 'N/A')} ---")
@@ -118,7 +254,7 @@ class GameData:
         initial_data = self._get_initial_data() # Mendapatkan koin=100, upgrade=0, dll.
         self._apply_data_to_game_instance(initial_data, "reset_game_data (hard_reset)")
         self.data = initial_data.copy()
-        self.save_game()
+        self.save_game(force_snapshot=True)
         print(f"--- GameData: RESET TOTAL selesai. Koin game sekarang: {self.game.wallet if hasattr(self.game, 'wallet') else 'N/A'} ---")
 
     # --- METODE BARU UNTUK "MULAI PETUALANGAN" ---
@@ -39,6 +39,8 @@ class GameMap:
         }
     }
 
+    RARITY_WEIGHTS = {"common": 70, "rare": 25, "legendary": 5}
+
     def __init__(self, location_map_name, config_instance):
         self.config = config_instance 
         self.name = location_map_name 
@@ -52,6 +54,10 @@ class GameMap:
         
         self.data = self.LOCATIONS[self.name] 
         self.display_name = self.data.get("display_name", self.name) 
+
+        # Kolam ikan dan bobotnya dihitung sekali di sini, bukan setiap kali ikan di-spawn
+        self.fish_pool = list(self.data.get("fish_data_list", []))
+        self.fish_weights = [self.RARITY_WEIGHTS.get(fish_d.get("rarity", "common"), 10) for fish_d in self.fish_pool]
         
         default_map_color = self.config.COLORS.get('water_deep', (10,20,70)) #
         self.map_color = self.data.get('color', default_map_color) 
@@ -63,75 +69,100 @@ class GameMap:
             
         bg_path = os.path.join(self.config.BACKGROUND_PATH, bg_filename) #
         
-        self.background_image_original = None 
         self.background_image = None # Ini akan menjadi versi yang diskalakan dengan benar
 
         placeholder_surface = pygame.Surface((self.config.SCREEN_WIDTH, self.config.SCREEN_HEIGHT)) #
         placeholder_surface.fill(self.map_color) 
+        # Dicatat sekarang; jika tidak dipakai sebagai fallback, catatannya hilang sendiri bersama surface-nya
+        self.config.get_surface_registry().register(placeholder_surface, f"GameMap:{self.name} (placeholder)", bg_filename)
 
         try:
             # Muat gambar asli tanpa penskalaan awal di Config.load_image (jika memungkinkan)
             # Jika Config.load_image selalu menskalakan, kita perlu gambar asli
-            self.background_image_original = self.config.load_image(bg_path, scale=1.0) #
+            # Gambar asli hanya dipakai untuk ukuran/penskalaan dan tidak disimpan di peta, jadi peta di LocationCache
+            # tidak menahannya dan cache aset bisa membuangnya
+            original_image = self.config.load_image(bg_path, scale=1.0, owner=f"GameMap:{self.name}") #
 
-            if hasattr(self.background_image_original, '_debug_load_error_message') or \
-               (self.background_image_original.get_width() <= 1 and not os.path.exists(bg_path)): # Cek jika ini placeholder dari load_image
+            if hasattr(original_image, '_debug_load_error_message') or \
+               (original_image.get_width() <= 1 and not os.path.exists(bg_path)): # Cek jika ini placeholder dari load_image
                 print(f"    ERROR GameMap: Gagal memuat background original '{bg_path}'. Menggunakan warna solid.")
-                self.background_image_original = placeholder_surface
                 self.background_image = placeholder_surface
             else:
                 # ---- PENYESUAIAN SKALA GAMBAR LATAR ----
-                original_width = self.background_image_original.get_width()
-                original_height = self.background_image_original.get_height()
+                original_width = original_image.get_width()
+                original_height = original_image.get_height()
 
                 # Skalakan agar PAS DENGAN LEBAR LAYAR, jaga aspek rasio
                 if original_width != self.config.SCREEN_WIDTH: #
-                    aspect_ratio = original_height / original_width
-                    scaled_height = int(self.config.SCREEN_WIDTH * aspect_ratio) #
-                    self.background_image = pygame.transform.scale(self.background_image_original, (self.config.SCREEN_WIDTH, scaled_height)) #
+                    _, scaled_height = self.scaled_background_size((original_width, original_height), self.config.SCREEN_WIDTH) #
+                    # Versi terskala diambil dari cache bersama, jadi masuk lokasi yang sama tidak menskalakan ulang
+                    self.background_image = self.config.load_image(bg_path, scale=(self.config.SCREEN_WIDTH, scaled_height), owner=f"GameMap:{self.name}") #
                     print(f"    GameMap: BG '{bg_filename}' diskalakan ke ({self.config.SCREEN_WIDTH}, {scaled_height}) menjaga aspek rasio lebar.") #
                 else:
                     # Jika lebar sudah pas, cek apakah tingginya juga pas atau perlu diskalakan
                     # Untuk tampilan seperti di screenshot, kita ingin background mengisi layar.
                     # Jika tingginya berbeda dari SCREEN_HEIGHT, kita bisa skala agar pas tinggi juga,
                     # atau biarkan dan potong/letterbox. Untuk sekarang, jika lebar pas, gunakan apa adanya.
-                    self.background_image = self.background_image_original 
+                    self.background_image = original_image 
                 
                 # Jika setelah penskalaan (atau tidak ada penskalaan) tingginya masih beda jauh dari SCREEN_HEIGHT,
                 # mungkin perlu strategi lain, tapi untuk sekarang ini akan mengisi lebar.
                 # Jika ingin background selalu pas SCREEN_WIDTH x SCREEN_HEIGHT (mungkin stretch):
-                # self.background_image = pygame.transform.scale(self.background_image_original, (self.config.SCREEN_WIDTH, self.config.SCREEN_HEIGHT))
+                # self.background_image = pygame.transform.scale(original_image, (self.config.SCREEN_WIDTH, self.config.SCREEN_HEIGHT))
 
 
         except Exception as e:
             print(f"    ERROR memuat background untuk GameMap {self.name}: {e}. Menggunakan warna solid.") 
-            self.background_image_original = placeholder_surface # Fallback
-            self.background_image = placeholder_surface
+            self.background_image = placeholder_surface # Fallback
+
+    @staticmethod
+    def scaled_background_size(original_size, screen_width):
+        """Ukuran latar setelah diskalakan pas selebar layar dengan aspek rasio tetap (dipakai juga oleh bake_assets)."""
+        original_width, original_height = original_size
+        if original_width == screen_width: return original_size
+        return (screen_width, int(screen_width * (original_height / original_width)))
 
     def get_random_fish_data(self):
-        # ... (kode get_random_fish_data tetap sama) ...
-        fish_pool = self.data.get("fish_data_list", []) 
+        fish_pool = self.fish_pool
         if not fish_pool: 
             print(f"PERINGATAN: Tidak ada ikan di fish_pool untuk lokasi {self.name}")
             return None 
 
-        weights = [] 
-        for fish_d in fish_pool: 
-            rarity = fish_d.get("rarity", "common") 
-            if rarity == "common": weights.append(70) 
-            elif rarity == "rare": weights.append(25) 
-            elif rarity == "legendary": weights.append(5) 
-            else: weights.append(10)
-        
-        if not weights or sum(weights) == 0 : 
-            if fish_pool:
-                print(f"PERINGATAN: Bobot tidak valid atau nol untuk fish_pool di {self.name}, memilih secara acak.")
-                return random.choice(fish_pool)
-            return None
+        if not self.fish_weights or sum(self.fish_weights) == 0 : 
+            print(f"PERINGATAN: Bobot tidak valid atau nol untuk fish_pool di {self.name}, memilih secara acak.")
+            return random.choice(fish_pool)
 
-        chosen_fish_data = random.choices(fish_pool, weights=weights, k=1)[0] 
+        chosen_fish_data = random.choices(fish_pool, weights=self.fish_weights, k=1)[0] 
         return chosen_fish_data 
 
+    def preload_fish_images(self):
+        """Memuat gambar semua ikan di lokasi ini ke cache aset, agar spawn pertama tidak membaca disk."""
+        from fish import Fish
+        scale_factor = getattr(self.config, 'FISH_IMAGE_SCALE', 0.7)
+        for fish_data in self.fish_pool:
+            image_path = Fish.get_image_path(fish_data, self.config)
+            if os.path.exists(image_path): self.config.load_image(image_path, scale=scale_factor, owner="Fish")
+
+    def get_background_strip(self, view_width):
+        """Strip latar berulang untuk layar selebar view_width; dipanggang sekali per lokasi lalu dipakai ulang."""
+        if self.background_image is None or self.background_image.get_width() <= 0: return None
+        strip = getattr(self, '_background_strip', None)
+        if strip is None or not strip.matches(self.background_image, view_width):
+            from background_strip import BackgroundStrip
+            strip = self._background_strip = BackgroundStrip(self.background_image, view_width)
+            self.config.get_surface_registry().register(strip.strip, f"GameMap:{self.name}", "BackgroundStrip")
+        else: self.config.get_surface_registry().touch(strip.strip) # Dipanggil tiap frame render memancing
+        return strip
+
+    def estimate_bytes(self):
+        """Perkiraan memori surface milik peta ini (untuk batas memori LocationCache)."""
+        total = 0
+        if self.background_image is not None:
+            total += self.background_image.get_width() * self.background_image.get_height() * self.background_image.get_bytesize()
+        strip = getattr(self, '_background_strip', None)
+        if strip is not None: total += strip.estimate_bytes()
+        return total
+
     # HAPUS METODE play_music() DARI SINI
     # def play_music(self):
     #     ...
\ No newline at end of file
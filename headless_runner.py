@@ -0,0 +1,241 @@
+# headless_runner.py
+# Menjalankan Game tanpa layar/suara (driver SDL "dummy") dengan dt tetap, seed acak tetap,
+# dan input berskrip, lalu melaporkan waktu update/render per state sebagai JSON.
+# Contoh: python headless_runner.py --fishing-minutes 1 --output bench.json
+import os
+import io
+import json
+import time
+import random
+import argparse
+import tempfile
+import contextlib
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+if script_dir: os.chdir(script_dir)
+
+from config import Config
+from frame_profiler import percentile
+
+
+class ScriptedKeys:
+    """Pengganti pygame.key.get_pressed(): bisa diindeks dengan konstanta K_* seperti aslinya."""
+    def __init__(self):
+        self.held = set()
+
+    def __getitem__(self, key):
+        return key in self.held
+
+    def __call__(self):
+        return self
+
+
+def summarize_ms(samples):
+    values = sorted(sample * 1000.0 for sample in samples)
+    if not values: return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    return {"mean": sum(values) / len(values), "p50": percentile(values, 0.50), "p95": percentile(values, 0.95),
+            "p99": percentile(values, 0.99), "max": values[-1]}
+
+
+class HeadlessRunner:
+    def __init__(self, seed=1234, fps=60, land_seconds=10.0, map_seconds=10.0, fishing_minutes=1.0, locations=None, cache_directory=None):
+        self.seed = seed
+        self.cache_directory = cache_directory # None: folder sementara, jadi checkout tidak ditulisi
+        self.dt = 1.0 / fps
+        self.land_seconds = land_seconds
+        self.map_seconds = map_seconds
+        self.fishing_seconds = fishing_minutes * 60.0
+        self.locations = locations or ["Coast", "Sea", "Ocean"]
+        self.keys = ScriptedKeys()
+        self.game = None
+        self.timings = {} # state -> {"update": [...], "render": [...]}
+
+    # --- Skrip input per fase ---
+    def _script_menu(self, t, presses):
+        self.keys.held.clear()
+        if int(t / self.dt) % 20 == 0: presses.append(pygame.K_DOWN)
+
+    def _script_land(self, t, presses):
+        # Jalan berkeliling: kanan, bawah, kiri, atas masing-masing 1 detik
+        self.keys.held = {[pygame.K_RIGHT, pygame.K_DOWN, pygame.K_LEFT, pygame.K_UP][int(t) % 4]}
+
+    def _script_map(self, t, presses):
+        self.keys.held = {[pygame.K_LEFT, pygame.K_UP, pygame.K_RIGHT, pygame.K_DOWN][int(t / 1.5) % 4]}
+
+    def _script_fishing(self, t, presses):
+        # Kapal bolak-balik tiap 3 detik; SPACE untuk melempar kail dan untuk menarik ikan yang terkait
+        self.keys.held = {pygame.K_LEFT if int(t / 3.0) % 2 == 0 else pygame.K_RIGHT}
+        fishing_system = self.game.fishing_system
+        if fishing_system:
+            idle = not (fishing_system.is_casting or fishing_system.is_reeling or fishing_system.fish_on_line_awaiting_pull)
+            if idle or (fishing_system.fish_on_line_awaiting_pull and fishing_system.hooked_fish_sprite):
+                presses.append(pygame.K_SPACE)
+
+    # --- Loop ---
+    def _run_phase(self, state_name, seconds, script, data=None):
+        game = self.game
+        game.change_state(state_name, data=data)
+        timing = self.timings.setdefault(game.current_state_name, {"update": [], "render": []})
+        frames = int(round(seconds / self.dt))
+        surface_registry = Config.get_surface_registry()
+        for frame in range(frames):
+            t = frame * self.dt
+            presses = []
+            script(t, presses)
+            pygame.event.pump()
+            for key in presses:
+                game.process_event(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0))
+            if not game.running: break
+            surface_registry.next_frame()
+            game.allocation_audit.begin_frame()
+            start = time.perf_counter()
+            game.update_current_state(self.dt)
+            middle = time.perf_counter()
+            game.render_current_state()
+            end = time.perf_counter()
+            game.allocation_audit.end_frame(game.current_state_name)
+            timing["update"].append(middle - start)
+            timing["render"].append(end - middle)
+            game.current_fps = 1.0 / self.dt
+
+    def _prebake_land_chunks(self):
+        """
+        Memotong latar daratan sebelum fase diukur, agar thread LandChunkBaker tidak ikut mengisi waktu frame
+        'land_explore'. Mengembalikan durasi dalam ms (~0 jika --cache-dir sudah berisi chunk), atau None.
+        """
+        if not Config.USE_LAND_CHUNKS: return None
+        from land_explorer import LandExplorer
+        start = time.perf_counter()
+        land_chunks = LandExplorer.load_land_chunks(Config, os.path.join(Config.BACKGROUND_PATH, LandExplorer.BACKGROUND_FILENAME))
+        if land_chunks is None or not land_chunks.wait_until_baked(): return None
+        return (time.perf_counter() - start) * 1000.0
+
+    def run(self, track_allocations=False, profile_startup=False, audit_allocations=False):
+        """Folder save dan cache sementara dihapus setelah selesai; folder --cache-dir dibiarkan untuk dipakai ulang."""
+        with contextlib.ExitStack() as temporary_directories:
+            Config.SAVE_DIRECTORY = temporary_directories.enter_context(tempfile.TemporaryDirectory(prefix="fishing_mania_bench_")) # Jangan timpa save pemain
+            Config.CACHE_DIRECTORY = self.cache_directory or temporary_directories.enter_context(
+                tempfile.TemporaryDirectory(prefix="fishing_mania_cache_")) # Chunk latar dll. (aset baked tetap dibaca)
+            return self._run(track_allocations, profile_startup, audit_allocations)
+
+    def _run(self, track_allocations, profile_startup, audit_allocations):
+        random.seed(self.seed)
+        if profile_startup: Config.PROFILE_STARTUP = True
+        startup_profiler = Config.get_startup_profiler()
+        if track_allocations:
+            import tracemalloc
+            tracemalloc.start()
+        pygame.init()
+        screen = pygame.display.set_mode((Config.SCREEN_WIDTH, Config.SCREEN_HEIGHT))
+        land_chunk_bake_ms = self._prebake_land_chunks()
+
+        from game import Game
+        wall_start = time.perf_counter()
+        init_start = time.perf_counter()
+        with startup_profiler.span("Game.__init__"): self.game = Game(screen)
+        init_seconds = time.perf_counter() - init_start
+        self.game.key_state_provider = self.keys
+        self.game.unlocked_locations = {name: True for name in self.locations}
+        with startup_profiler.span("change_state", state='main_menu'): self.game.change_state('main_menu', initial_setup=True)
+        startup_rows = None
+        if startup_profiler.active:
+            with startup_profiler.span("first frame"): self.game.render_current_state()
+            startup_profiler.finish(print_summary=False)
+            startup_rows = startup_profiler.summary_rows()
+        if audit_allocations: self.game.allocation_audit.start()
+
+        self._run_phase('main_menu', 2.0, self._script_menu)
+        self._run_phase('land_explore', self.land_seconds, self._script_land)
+        self._run_phase('map_explore', self.map_seconds, self._script_map)
+        for location_name in self.locations:
+            self._run_phase('fishing', self.fishing_seconds, self._script_fishing, data={'location_name': location_name})
+            self._run_phase('map_explore', 1.0, self._script_map)
+        wall_seconds = time.perf_counter() - wall_start
+
+        report = {
+            "seed": self.seed,
+            "dt": self.dt,
+            "init_ms": init_seconds * 1000.0,
+            "land_chunk_bake_ms": land_chunk_bake_ms, # Di luar waktu frame; cache dingin kecuali --cache-dir dipakai ulang
+            "wall_seconds": wall_seconds,
+            "frames": 0,
+            "fps": 0.0,
+            "fish_caught": len(self.game.inventory.fish_list),
+            "states": {},
+        }
+        if startup_rows is not None:
+            report["startup"] = {"total_ms": startup_profiler.total_seconds() * 1000.0, "spans": startup_rows}
+        busy_seconds = 0.0
+        for state_name, timing in self.timings.items():
+            frames = len(timing["update"])
+            state_busy = sum(timing["update"]) + sum(timing["render"])
+            busy_seconds += state_busy
+            report["frames"] += frames
+            report["states"][state_name] = {
+                "frames": frames,
+                "fps": frames / state_busy if state_busy > 0 else 0.0,
+                "update_ms": summarize_ms(timing["update"]),
+                "render_ms": summarize_ms(timing["render"]),
+            }
+        report["fps"] = report["frames"] / busy_seconds if busy_seconds > 0 else 0.0
+        if audit_allocations:
+            report["allocations"] = self.game.allocation_audit.summary() # Objek per frame per state (waktu frame ikut melambat)
+            self.game.allocation_audit.stop(write_log=False)
+        report["input_latency"] = self.game.input_latency.stats() # Di sini tanpa jeda tick, jadi ~waktu proses frame
+        surface_totals = Config.get_surface_registry().totals()
+        report["surfaces"] = {"count": surface_totals["surfaces"], "bytes": surface_totals["bytes"], "peak_bytes": surface_totals["peak_bytes"],
+                              "by_owner": {owner: size for owner, (_, size) in surface_totals["by_owner"].items()}}
+        self.game.game_data_manager.flush()
+        report["save"] = self.game.game_data_manager.get_save_stats()
+        try:
+            import resource
+            report["peak_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        except ImportError: # resource tidak ada di Windows
+            report["peak_rss_kb"] = None
+        if track_allocations:
+            import tracemalloc
+            report["tracemalloc_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        pygame.quit()
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark headless Fishing Mania dengan input berskrip.")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--fps", type=int, default=Config.SIMULATION_HZ, help="Tick simulasi tetap (dt = 1/fps)")
+    parser.add_argument("--land-seconds", type=float, default=10.0)
+    parser.add_argument("--map-seconds", type=float, default=10.0)
+    parser.add_argument("--fishing-minutes", type=float, default=1.0, help="Durasi memancing per lokasi")
+    parser.add_argument("--locations", nargs="+", default=["Coast", "Sea", "Ocean"])
+    parser.add_argument("--tracemalloc", action="store_true", help="Ukur puncak alokasi Python (lebih lambat)")
+    parser.add_argument("--alloc-audit", action="store_true", help="Hitung alokasi per frame per state dan subsistem (lebih lambat)")
+    parser.add_argument("--profile-startup", action="store_true", help="Sertakan timeline startup per komponen di laporan")
+    parser.add_argument("--cache-dir", metavar="DIR", default=None,
+                        help="Folder cache hasil olahan (chunk latar); default folder sementara yang dihapus setelah selesai; pakai ulang untuk mengukur cache hangat")
+    parser.add_argument("--output", help="Tulis laporan JSON ke file ini (default: stdout)")
+    parser.add_argument("--verbose", action="store_true", help="Tampilkan log game")
+    args = parser.parse_args()
+    if args.tracemalloc and args.alloc_audit: parser.error("--alloc-audit mereset puncak tracemalloc tiap frame; jangan digabung dengan --tracemalloc")
+
+    runner = HeadlessRunner(seed=args.seed, fps=args.fps, land_seconds=args.land_seconds, map_seconds=args.map_seconds,
+                            fishing_minutes=args.fishing_minutes, locations=args.locations, cache_directory=args.cache_dir)
+    log_target = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with log_target:
+        report = runner.run(track_allocations=args.tracemalloc, profile_startup=args.profile_startup, audit_allocations=args.alloc_audit)
+
+    report_json = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f: f.write(report_json)
+        print(f"--- HeadlessRunner: Laporan ditulis ke {args.output} ---")
+    else:
+        print(report_json)
+
+if __name__ == "__main__":
+    main()
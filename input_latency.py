@@ -0,0 +1,120 @@
+# input_latency.py
+import time
+from collections import deque
+import pygame
+from frame_profiler import percentile
+
+class _PendingInput:
+    __slots__ = ("key", "state", "arrived", "effect")
+    def __init__(self, key, state, arrived):
+        self.key = key
+        self.state = state
+        self.arrived = arrived
+        self.effect = None
+
+
+class InputLatencyTracker:
+    """
+    Latensi input sampai tampil (input-to-present). Setiap KEYDOWN diberi waktu tiba saat game membacanya
+    (pygame tidak memberi timestamp event SDL, jadi antrean event sebelum frame membaca tidak ikut terhitung).
+    Kode yang menjalankan efeknya memanggil mark_effect() (misal FishingSystem saat SPACE melempar/menarik,
+    Game saat kapal bergerak karena panah) atau mark_current() untuk input yang sedang ditangani; pergantian
+    state yang terjadi saat input ditangani ikut ditandai. frame_presented() dipanggil setelah display.flip /
+    display.update: semua input yang efeknya sudah ada dicatat sebagai sampel per state (state saat input tiba)
+    dan per efek. Input tanpa efek yang terlihat dibuang setelah max_pending_seconds.
+    """
+    def __init__(self, window=200, max_pending_seconds=1.0, enabled=True):
+        self.window = window
+        self.max_pending_seconds = max_pending_seconds
+        self.enabled = enabled
+        self._pending = deque()  # _PendingInput urut waktu tiba
+        self._current = None     # Input yang handler-nya sedang berjalan
+        self._by_state = {}      # state -> deque ms
+        self._by_effect = {}     # label efek -> deque ms
+        self.presented = 0
+        self.without_effect = 0
+
+    # --- Perekaman ---
+    def input_received(self, event, state):
+        """Dipanggil Game.process_event sebelum handler state (tombol alat profiler tidak ikut); hanya KEYDOWN yang dilacak."""
+        if not self.enabled or event.type != pygame.KEYDOWN:
+            self._current = None
+            return None
+        record = _PendingInput(event.key, state, time.perf_counter())
+        self._pending.append(record)
+        self._current = record
+        return record
+
+    def input_handled(self):
+        self._current = None
+
+    def mark_current(self, label):
+        """Input yang sedang ditangani menghasilkan efek (misal scene menerima event-nya)."""
+        record = self._current
+        if record is not None and record.effect is None:
+            record.effect = label
+
+    def mark_effect(self, keys, label):
+        """Efek dari tombol `keys` (satu konstanta atau tuple) terjadi: input tertua tanpa efek untuk tombol itu ditandai."""
+        if not self._pending: return
+        if not isinstance(keys, tuple): keys = (keys,)
+        for record in self._pending:
+            if record.effect is None and record.key in keys:
+                record.effect = label
+                return
+
+    def state_changed(self, old_state, new_state):
+        """Pergantian state selama input ditangani adalah efek input itu (misal ENTER di menu, ESC saat memancing)."""
+        record = self._current
+        if record is not None and record.effect is None:
+            record.effect = f"state:{old_state}->{new_state}"
+
+    def frame_presented(self):
+        """Dipanggil tepat setelah frame ditampilkan (flip/update)."""
+        if not self._pending: return
+        now = time.perf_counter()
+        remaining = deque()
+        for record in self._pending:
+            if record.effect is not None and record is not self._current:
+                latency_ms = (now - record.arrived) * 1000.0
+                self._append(self._by_state, record.state, latency_ms)
+                self._append(self._by_effect, "state_change" if record.effect.startswith("state:") else record.effect, latency_ms)
+                self.presented += 1
+            elif now - record.arrived > self.max_pending_seconds:
+                self.without_effect += 1
+            else:
+                remaining.append(record)
+        self._pending = remaining
+
+    def _append(self, histories, name, value):
+        history = histories.get(name)
+        if history is None: history = histories[name] = deque(maxlen=self.window)
+        history.append(value)
+
+    def reset(self):
+        self._pending.clear(); self._current = None
+        self._by_state.clear(); self._by_effect.clear()
+        self.presented = 0; self.without_effect = 0
+
+    # --- Laporan ---
+    @staticmethod
+    def _summarize(history):
+        values = sorted(history)
+        return {"count": len(values), "p50": percentile(values, 0.50), "p95": percentile(values, 0.95),
+                "p99": percentile(values, 0.99), "max": values[-1] if values else 0.0}
+
+    def stats(self):
+        """{"states": {state: {...}}, "effects": {efek: {...}}} dalam milidetik."""
+        return {"states": {name: self._summarize(history) for name, history in self._by_state.items()},
+                "effects": {name: self._summarize(history) for name, history in self._by_effect.items()},
+                "presented": self.presented, "without_effect": self.without_effect}
+
+    def hud_rows(self):
+        """Baris tambahan untuk tabel FrameProfiler: latensi per state."""
+        return [(f"input>flip {name}", self._summarize(history)) for name, history in self._by_state.items()]
+
+    def format_summary(self):
+        lines = []
+        for name, values in self.stats()["states"].items():
+            lines.append(f"{name}: {values['count']} input, p50 {values['p50']:.1f} ms, p95 {values['p95']:.1f} ms, maks {values['max']:.1f} ms")
+        return lines
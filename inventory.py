@@ -1,7 +1,11 @@
 # inventory.py
+from fish_records import CatchLog
+
 class Inventory:
     def __init__(self, game_instance):
-        self.fish_list = []
+        # fish_list menyimpan catatan ringkas (id spesies + nilai), bukan sprite Fish.
+        # Tetap bisa diiterasi, di-len(), di-slice, dan di-remove seperti list biasa.
+        self.fish_list = CatchLog()
         self.game = game_instance
 
     def add(self, fish):
@@ -10,12 +14,14 @@ class Inventory:
     def add_fish_from_data(self, fish_data):
         """
         Menambahkan ikan ke inventaris dari data kamus (biasanya dimuat dari JSON).
-        Membuat instance Fish baru dari data yang diberikan.
+        Hanya id spesies dan nilainya yang disimpan; tidak ada gambar yang dimuat.
         """
-        from fish import Fish # Impor di sini untuk menghindari circular dependency
-        # Posisi dummy (0,0) karena ikan di inventaris tidak dirender di dunia
-        new_fish = Fish(fish_data, (0,0), self.game.config) # <--- PERBAIKAN: Tambahkan self.game.config
-        self.fish_list.append(new_fish)
+        self.fish_list.add_data(fish_data)
+
+    def load_fish_data(self, fish_data_list):
+        """Mengganti isi inventaris dengan list data ikan dari save file (sekali jalan)."""
+        self.fish_list.clear()
+        self.fish_list.extend_data(fish_data_list)
 
     def get_summary(self):
         summary = {}
@@ -25,7 +31,7 @@ class Inventory:
         return summary
 
     def sell_all(self):
-        total = sum(f.value for f in self.fish_list)
+        total = self.fish_list.total_value()
         self.fish_list.clear()
         return total
 
@@ -33,4 +39,4 @@ class Inventory:
         screen.blit(font.render("Inventory:", True, (255, 255, 255)), (10, 100))
         for i, (name, count) in enumerate(self.get_summary().items()):
             text = font.render(f"{name} ({count})", True, (200, 200, 200))
-            screen.blit(text, (10, 130 + i * 25))
\ No newline at end of file
+            screen.blit(text, (10, 130 + i * 25))
@@ -0,0 +1,192 @@
+# land_chunks.py
+import os
+import json
+import threading
+from collections import deque
+import pygame
+
+class ChunkedBackground:
+    """
+    Latar daratan besar yang dipotong menjadi chunk berukuran tetap. Potongan disimpan sekali
+    sebagai file PNG di folder cache (beserta manifest berisi ukuran dunia), sehingga startup
+    berikutnya cukup membaca manifest. Pemotongan pertama berjalan di thread tersendiri (main thread
+    hanya men-decode sumber untuk ukuran dunia); selama itu chunk digambar dengan warna fallback.
+    Chunk dimuat + di-convert di thread pekerja saat kamera mendekat, dibuang saat sudah jauh,
+    dan hanya chunk yang beririsan dengan kamera yang diblit.
+    """
+    MANIFEST_NAME = "manifest.json"
+
+    def __init__(self, source_path, cache_root, chunk_size=256, prefetch_chunks=1, evict_chunks=3, fallback_color=(0, 100, 0),
+                 surface_registry=None):
+        self.source_path = source_path
+        self.surface_registry = surface_registry
+        self.chunk_size = max(16, int(chunk_size))
+        self.prefetch_margin = max(0, prefetch_chunks) * self.chunk_size
+        self.evict_margin = max(prefetch_chunks + 1, evict_chunks) * self.chunk_size # Selalu lebih jauh dari prefetch (histeresis)
+        self.fallback_color = fallback_color
+        source_name = os.path.splitext(os.path.basename(source_path))[0]
+        self.cache_dir = os.path.join(cache_root, f"{source_name}_{self.chunk_size}")
+
+        self._chunks = {}         # (cx, cy) -> Surface yang sudah di-convert
+        self._requested = set()   # Chunk yang sedang antre / dimuat
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._worker = None
+        self._worker_running = False
+        self.loads = 0
+        self.evictions = 0
+        self.missing_draws = 0    # Chunk terlihat yang belum siap saat digambar
+
+        self.ready = False        # False selama chunk belum ada di disk (sedang/gagal dipotong)
+        self._bake_done = threading.Event()
+
+        manifest = self._read_manifest()
+        source = None
+        if manifest is None:
+            source = pygame.image.load(self.source_path) # Ukuran dunia dibutuhkan sekarang; pemotongan menyusul
+            self.world_width, self.world_height = source.get_size()
+        else:
+            self.world_width = manifest["world_width"]
+            self.world_height = manifest["world_height"]
+            self.ready = True; self._bake_done.set()
+        self.columns = (self.world_width + self.chunk_size - 1) // self.chunk_size
+        self.rows = (self.world_height + self.chunk_size - 1) // self.chunk_size
+        if source is not None:
+            threading.Thread(target=self._bake_worker, args=(source,), name="LandChunkBaker", daemon=True).start()
+
+    # --- Cache chunk di disk ---
+    def _source_signature(self):
+        stat = os.stat(self.source_path)
+        return {"source": os.path.normpath(self.source_path), "source_size": stat.st_size,
+                "source_mtime_ns": stat.st_mtime_ns, "chunk_size": self.chunk_size}
+
+    def _read_manifest(self):
+        manifest_path = os.path.join(self.cache_dir, self.MANIFEST_NAME)
+        try:
+            with open(manifest_path, 'r') as f: manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        signature = self._source_signature()
+        if any(manifest.get(key) != value for key, value in signature.items()):
+            return None # Gambar sumber berubah; potong ulang
+        return manifest
+
+    def _chunk_path(self, cx, cy):
+        return os.path.join(self.cache_dir, f"{cx}_{cy}.png")
+
+    def _bake_worker(self, source):
+        try:
+            self._bake_chunks(source)
+            self.ready = True # update() berikutnya mulai meminta chunk
+        except Exception as e:
+            print(f"--- ChunkedBackground ERROR: Gagal memotong '{self.source_path}': {e}. Latar memakai warna fallback. ---")
+        finally:
+            self._bake_done.set()
+
+    def wait_until_baked(self, timeout=None):
+        """Menunggu pemotongan selesai (misal benchmark yang tidak ingin ikut mengukurnya). True jika chunk siap."""
+        return self._bake_done.wait(timeout) and self.ready
+
+    def _bake_chunks(self, source):
+        """Memotong gambar sumber menjadi file chunk (hanya sekali, atau saat sumber berubah)."""
+        print(f"--- ChunkedBackground: Memotong '{self.source_path}' menjadi chunk {self.chunk_size}px di '{self.cache_dir}' ---")
+        world_width, world_height = source.get_size()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        for cy in range(0, (world_height + self.chunk_size - 1) // self.chunk_size):
+            for cx in range(0, (world_width + self.chunk_size - 1) // self.chunk_size):
+                area = pygame.Rect(cx * self.chunk_size, cy * self.chunk_size, self.chunk_size, self.chunk_size).clip(source.get_rect())
+                pygame.image.save(source.subsurface(area), self._chunk_path(cx, cy))
+        manifest = dict(self._source_signature(), world_width=world_width, world_height=world_height)
+        with open(os.path.join(self.cache_dir, self.MANIFEST_NAME), 'w') as f: json.dump(manifest, f, indent=4)
+        return manifest
+
+    # --- Pemuatan chunk ---
+    def _chunk_range(self, rect):
+        size = self.chunk_size
+        min_cx = max(0, rect.left // size); max_cx = min(self.columns - 1, (rect.right - 1) // size)
+        min_cy = max(0, rect.top // size); max_cy = min(self.rows - 1, (rect.bottom - 1) // size)
+        return min_cx, min_cy, max_cx, max_cy
+
+    def _load_chunk(self, key):
+        surface = pygame.image.load(self._chunk_path(*key))
+        surface = surface.convert() if pygame.display.get_surface() else surface
+        if self.surface_registry: self.surface_registry.register(surface, "ChunkedBackground", f"{os.path.basename(self.cache_dir)} {key}")
+        return surface
+
+    def _worker_loop(self):
+        while True:
+            with self._lock:
+                if not self._queue:
+                    self._worker_running = False
+                    return
+                key = self._queue.popleft()
+            try: surface = self._load_chunk(key)
+            except Exception as e:
+                print(f"--- ChunkedBackground ERROR: Gagal memuat chunk {key}: {e} ---"); surface = None
+            with self._lock:
+                if key in self._requested: # Bisa saja sudah dibatalkan karena kamera menjauh
+                    self._requested.discard(key)
+                    if surface is not None:
+                        self._chunks[key] = surface; self.loads += 1
+
+    def update(self, camera_rect):
+        """Meminta chunk di sekitar kamera (chunk terlihat lebih dulu) dan membuang chunk yang sudah jauh."""
+        if not self.ready: return
+        visible = self._chunk_range(camera_rect)
+        wanted = self._chunk_range(camera_rect.inflate(self.prefetch_margin * 2, self.prefetch_margin * 2))
+        keep = self._chunk_range(camera_rect.inflate(self.evict_margin * 2, self.evict_margin * 2))
+        with self._lock:
+            new_keys = []
+            for cy in range(wanted[1], wanted[3] + 1):
+                for cx in range(wanted[0], wanted[2] + 1):
+                    key = (cx, cy)
+                    if key not in self._chunks and key not in self._requested: new_keys.append(key)
+            new_keys.sort(key=lambda k: not (visible[0] <= k[0] <= visible[2] and visible[1] <= k[1] <= visible[3]))
+            for key in new_keys:
+                self._requested.add(key); self._queue.append(key)
+            for key in [key for key in self._chunks if not (keep[0] <= key[0] <= keep[2] and keep[1] <= key[1] <= keep[3])]:
+                del self._chunks[key]; self.evictions += 1
+            stale = [key for key in self._queue if not (keep[0] <= key[0] <= keep[2] and keep[1] <= key[1] <= keep[3])]
+            for key in stale:
+                self._queue.remove(key); self._requested.discard(key)
+            if self._queue and not self._worker_running:
+                self._worker_running = True
+                self._worker = threading.Thread(target=self._worker_loop, name="LandChunkLoader", daemon=True)
+                self._worker.start()
+
+    def load_visible_now(self, camera_rect):
+        """Memuat chunk yang terlihat secara sinkron (misal saat masuk scene) agar frame pertama tidak bolong."""
+        if not self.ready: return # Masih dipotong; frame pertama memakai warna fallback
+        min_cx, min_cy, max_cx, max_cy = self._chunk_range(camera_rect)
+        for cy in range(min_cy, max_cy + 1):
+            for cx in range(min_cx, max_cx + 1):
+                key = (cx, cy)
+                with self._lock:
+                    if key in self._chunks: continue
+                surface = self._load_chunk(key)
+                with self._lock:
+                    self._requested.discard(key) # Hasil worker untuk chunk ini (jika ada) akan diabaikan
+                    if key not in self._chunks:
+                        self._chunks[key] = surface; self.loads += 1
+        self.update(camera_rect)
+
+    def draw(self, screen, camera):
+        """Memblit hanya chunk yang beririsan dengan camera.camera_rect."""
+        size = self.chunk_size
+        min_cx, min_cy, max_cx, max_cy = self._chunk_range(camera.camera_rect)
+        chunks = self._chunks; registry = self.surface_registry
+        for cy in range(min_cy, max_cy + 1):
+            for cx in range(min_cx, max_cx + 1):
+                screen_x = cx * size + camera.offset_x; screen_y = cy * size + camera.offset_y
+                surface = chunks.get((cx, cy))
+                if surface is not None:
+                    if registry: registry.touch(surface)
+                    screen.blit(surface, (screen_x, screen_y))
+                else:
+                    self.missing_draws += 1
+                    screen.fill(self.fallback_color, (screen_x, screen_y, size, size))
+
+    def stats(self):
+        with self._lock:
+            return {"ready": self.ready, "resident": len(self._chunks), "queued": len(self._queue), "loads": self.loads,
+                    "evictions": self.evictions, "missing_draws": self.missing_draws}
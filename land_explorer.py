@@ -5,44 +5,43 @@ from camera_system import Camera
 from sprites import Player as LandPlayer
 
 class LandExplorer:
+    BACKGROUND_FILENAME = "bg_baru.webp"
+
     def __init__(self, game):
         # print("--- LandExplorer: Memulai __init__()... ---") # Kurangi print jika sudah stabil
         self.game = game
         self.config = self.game.config
+        self.text_cache = self.config.get_text_cache()
+        self.surface_registry = self.config.get_surface_registry()
 
-        # Load Font (versi ringkas)
-        try:
-            font_name = self.config.FONT_NAME
-            font_path_abs = None
-            if font_name and os.path.isabs(font_name) and os.path.exists(font_name): font_path_abs = font_name
-            elif font_name:
-                 potential = os.path.join(self.config.FONT_PATH, font_name)
-                 if os.path.exists(potential): font_path_abs = potential
-            sm, md, dbg_sz = self.config.FONT_SIZES.get('small',18), self.config.FONT_SIZES.get('medium',22), 16
-            if font_path_abs:
-                self.font,self.label_font,self.debug_font = pygame.font.Font(font_path_abs,sm),pygame.font.Font(font_path_abs,md),pygame.font.Font(font_path_abs,dbg_sz)
-            elif font_name and font_name.strip().lower() != 'none':
-                self.font,self.label_font,self.debug_font = pygame.font.SysFont(font_name,sm),pygame.font.SysFont(font_name,md),pygame.font.SysFont(font_name,dbg_sz)
-            else: raise ValueError("No valid font specified")
-        except Exception:
-            # print(f"--- LandExplorer: ERROR font. Fallback.") # Kurangi print
-            sm, md, dbg_sz = 18, 22, 16
-            self.font,self.label_font,self.debug_font = pygame.font.Font(None,sm),pygame.font.Font(None,md),pygame.font.Font(None,dbg_sz)
+        # Load Font (dari registry bersama)
+        font_registry = self.config.get_font_registry()
+        if font_registry.resolve()[0] != 'default': sm, md, dbg_sz = self.config.FONT_SIZES.get('small',18), self.config.FONT_SIZES.get('medium',22), 16
+        else: sm, md, dbg_sz = 18, 22, 16 # Ukuran lama untuk font bawaan pygame
+        self.font, self.label_font, self.debug_font = font_registry.get(sm), font_registry.get(md), font_registry.get(dbg_sz)
 
         # Load Background Image
         self.land_background_image = None; self.land_background_rect = None
-        background_path = os.path.join(self.config.BACKGROUND_PATH, "bg_baru.webp")
+        self.land_chunks = None # ChunkedBackground; jika None, latar digambar dari satu gambar utuh
+        background_path = os.path.join(self.config.BACKGROUND_PATH, self.BACKGROUND_FILENAME)
         try:
             if not os.path.exists(background_path): raise FileNotFoundError(f"BG file not found: {background_path}")
-            loaded_bg_image = self.config.load_image(background_path, use_alpha=False)
-            if loaded_bg_image.get_width() <= 1: raise ValueError("Loaded BG is placeholder.")
-            self.world_width = loaded_bg_image.get_width()
-            self.world_height = loaded_bg_image.get_height()
-            self.land_background_image = loaded_bg_image
-            self.land_background_rect = self.land_background_image.get_rect(topleft=(0,0))
+            if self.config.USE_LAND_CHUNKS:
+                self.land_chunks = self.load_land_chunks(self.config, background_path)
+            if self.land_chunks:
+                self.world_width = self.land_chunks.world_width
+                self.world_height = self.land_chunks.world_height
+            else:
+                loaded_bg_image = self.config.load_image(background_path, use_alpha=False, owner="LandExplorer")
+                if loaded_bg_image.get_width() <= 1: raise ValueError("Loaded BG is placeholder.")
+                self.world_width = loaded_bg_image.get_width()
+                self.world_height = loaded_bg_image.get_height()
+                self.land_background_image = loaded_bg_image
+                self.land_background_rect = self.land_background_image.get_rect(topleft=(0,0))
             # print(f"--- LandExplorer: Latar '{background_path}'. Ukuran Dunia: {self.world_width}x{self.world_height}.") # Kurangi print
         except Exception as e:
             # print(f"--- LandExplorer: ERROR load BG '{background_path}': {e}. Fallback warna solid. ---") # Kurangi print
+            self.land_chunks = None
             self.world_width=self.config.SCREEN_WIDTH; self.world_height=self.config.SCREEN_HEIGHT
             self.land_background_image=pygame.Surface((self.world_width,self.world_height)); self.land_background_image.fill(self.config.COLORS.get("green",(0,100,0)))
             self.land_background_rect = self.land_background_image.get_rect(topleft=(0,0))
@@ -68,10 +67,24 @@ class LandExplorer:
             if self.camera: self.camera.update(self.player.rect)
         # print("--- LandExplorer: __init__() selesai. ---") # Kurangi print
 
+    @staticmethod
+    def load_land_chunks(config, background_path):
+        """Menyiapkan latar berbasis chunk (juga dipakai headless_runner untuk memotong lebih dulu). None jika gagal."""
+        try:
+            from land_chunks import ChunkedBackground
+            return ChunkedBackground(background_path, os.path.join(config.CACHE_DIRECTORY, "land_chunks"),
+                                     config.LAND_CHUNK_SIZE, config.LAND_CHUNK_PREFETCH, config.LAND_CHUNK_EVICT,
+                                     config.COLORS.get("green", (0,100,0)), config.get_surface_registry())
+        except Exception as e:
+            print(f"--- LandExplorer WARN: Chunk latar gagal disiapkan ({e}). Memakai gambar utuh. ---")
+            return None
+
     def setup_scene(self):
         # print("--- LandExplorer: Menyiapkan scene daratan... ---") # Kurangi print
         self.game.all_sprites.empty(); self.game.blocks.empty()
         if self.player: self.player.add(self.game.all_sprites)
+        if self.land_chunks and self.camera:
+            self.land_chunks.load_visible_now(self.camera.camera_rect) # Frame pertama langsung utuh
         # print(f"--- LandExplorer: Scene daratan siap. ---") # Kurangi print
 
     def go_to_main_menu(self): self.game.change_state('main_menu')
@@ -89,6 +102,7 @@ class LandExplorer:
         if self.player and self.player.rect and self.camera:
             self.player.rect.clamp_ip(self.land_bounds_rect)
             self.camera.update(self.player.rect)
+            if self.land_chunks: self.land_chunks.update(self.camera.camera_rect)
             self.active_object_data = None; current_prompt = ""
             player_interaction_point = self.player.rect.midbottom 
             for name, data in self.interactive_objects.items():
@@ -99,14 +113,16 @@ class LandExplorer:
             self.interaction_prompt = current_prompt
 
     def render(self, screen): # render() sudah disesuaikan sebelumnya untuk DEBUG flag
-        if self.land_background_image and self.land_background_rect and self.camera:
+        if self.land_chunks and self.camera:
+            self.land_chunks.draw(screen, self.camera)
+        elif self.land_background_image and self.land_background_rect and self.camera:
             screen.blit(self.land_background_image, self.camera.apply(self.land_background_rect))
         else: screen.fill(self.config.COLORS.get("green", (0,100,0)))
         
         if self.game.all_sprites and self.camera:
             for sprite in self.game.all_sprites:
                 if hasattr(sprite,'image') and sprite.image and hasattr(sprite,'rect') and sprite.rect:
-                    screen.blit(sprite.image, self.camera.apply(sprite.rect))
+                    screen.blit(self.surface_registry.touch(sprite.image), self.camera.apply(sprite.rect))
                     # Hapus atau comment out bagian debug posisi pemain jika tidak diperlukan lagi
                     # if sprite == self.player and self.config.DEBUG and hasattr(self, 'debug_font'):
                     #     # ... kode debug posisi pemain ...
@@ -114,7 +130,7 @@ class LandExplorer:
         if self.camera and hasattr(self, 'label_font'):
             for name, data in self.interactive_objects.items():
                 if data.get('label'):
-                    label_surface = self.label_font.render(data['label'], True, (255,255,255))
+                    label_surface = self.text_cache.render(self.label_font, data['label'], (255,255,255))
                     label_world_rect = label_surface.get_rect(midbottom=data['rect_area'].midtop); label_world_rect.y -= 5 
                     screen.blit(label_surface, self.camera.apply(label_world_rect))
                 if self.config.DEBUG: # Ini akan menyembunyikan rect jika DEBUG=False
@@ -123,7 +139,7 @@ class LandExplorer:
                  pygame.draw.rect(screen, self.config.COLORS.get("red",(255,0,0)), self.camera.apply(self.land_bounds_rect), 2)
 
         if self.interaction_prompt and hasattr(self, 'label_font'):
-            prompt_surface = self.label_font.render(self.interaction_prompt, True, (255,255,0))
+            prompt_surface = self.text_cache.render(self.label_font, self.interaction_prompt, (255,255,0))
             prompt_rect = prompt_surface.get_rect(midbottom=(self.config.SCREEN_WIDTH//2, self.config.SCREEN_HEIGHT-20))
             screen.blit(prompt_surface, prompt_rect)
 
@@ -136,7 +152,7 @@ class LandExplorer:
                  y_offset_debug += self.game.ui.small_font.get_height() + 5; y_offset_debug += 10
              if hasattr(self.font, 'get_height'): line_h = self.font.get_height()
 
-             fps_surf = self.font.render(f"FPS: {int(self.game.current_fps)}", True, (255,255,255))
-             state_surf = self.font.render(f"State: {self.game.current_state_name}", True, (255,255,255))
+             fps_surf = self.text_cache.render(self.font, f"FPS: {int(self.game.current_fps)}", (255,255,255))
+             state_surf = self.text_cache.render(self.font, f"State: {self.game.current_state_name}", (255,255,255))
              screen.blit(fps_surf, (10, y_offset_debug))
              screen.blit(state_surf, (10, y_offset_debug + line_h + 5))
\ No newline at end of file
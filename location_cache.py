@@ -0,0 +1,140 @@
+# location_cache.py
+import threading
+from collections import OrderedDict
+
+from game_map import GameMap
+
+class LocationCache:
+    """
+    Menyimpan instance GameMap yang sudah siap pakai (background terskala, kolam ikan + bobot,
+    gambar ikan di cache aset) per lokasi. Masuk ke lokasi yang sudah di-cache cukup mengambil
+    objeknya tanpa I/O disk. prewarm() menyiapkan lokasi di thread latar belakang, misalnya
+    saat pemain berada di peta dunia. Lokasi yang tidak lagi terbuka atau melebihi batas memori
+    dibuang (LRU).
+    """
+    def __init__(self, config, max_bytes=96 * 1024 * 1024):
+        self.config = config
+        self.max_bytes = max_bytes
+        self._maps = OrderedDict()   # nama lokasi -> (GameMap, perkiraan_byte)
+        self._building = {}          # nama lokasi -> threading.Event (sedang disiapkan)
+        self._lock = threading.RLock()
+        self._queue = []
+        self._worker = None
+        self._worker_running = False
+        self.active_name = None      # Lokasi yang terakhir diambil lewat get(); tidak pernah dibuang karena batas memori
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.prewarmed = 0
+        self.evictions = 0
+
+    def _build(self, location_name):
+        game_map = GameMap(location_name, self.config)
+        game_map.preload_fish_images()
+        game_map.get_background_strip(self.config.SCREEN_WIDTH)
+        return game_map
+
+    def _store(self, location_name, game_map):
+        size = game_map.estimate_bytes()
+        with self._lock:
+            old_entry = self._maps.pop(location_name, None)
+            if old_entry is not None: self.bytes -= old_entry[1]
+            self._maps[location_name] = (game_map, size)
+            self.bytes += size
+            self._evict_over_budget({location_name, self.active_name})
+
+    def _evict_over_budget(self, protected=()):
+        while self.bytes > self.max_bytes:
+            victim = next((name for name in self._maps if name not in protected), None)
+            if victim is None: break
+            _, size = self._maps.pop(victim)
+            self.bytes -= size
+            self.evictions += 1
+
+    def set_max_bytes(self, max_bytes):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict_over_budget({self.active_name})
+
+    def get(self, location_name):
+        """Mengambil GameMap siap pakai; jika belum ada (atau masih disiapkan thread latar), ditunggu/dibangun di sini."""
+        while True:
+            with self._lock:
+                self.active_name = location_name
+                entry = self._maps.get(location_name)
+                if entry is not None:
+                    self._maps.move_to_end(location_name)
+                    self.hits += 1
+                    return entry[0]
+                building = self._building.get(location_name)
+                if building is None:
+                    self.misses += 1
+                    building = self._building[location_name] = threading.Event()
+                    break
+            building.wait() # Thread latar sedang menyiapkan lokasi ini; tunggu hasilnya
+        try:
+            game_map = self._build(location_name)
+            self._store(location_name, game_map)
+            return game_map
+        finally:
+            with self._lock: self._building.pop(location_name).set()
+
+    def is_ready(self, location_name):
+        with self._lock: return location_name in self._maps
+
+    def prewarm(self, location_names):
+        """Menjadwalkan penyiapan lokasi di thread latar belakang (yang sudah ada di cache dilewati)."""
+        with self._lock:
+            for name in location_names:
+                if name in GameMap.LOCATIONS and name not in self._maps and name not in self._queue:
+                    self._queue.append(name)
+            if not self._queue or self._worker_running: return
+            self._worker_running = True # Diset di bawah lock agar antrean tidak pernah tertinggal tanpa worker
+            self._worker = threading.Thread(target=self._prewarm_worker, name="LocationPrewarm", daemon=True)
+            self._worker.start()
+
+    def _prewarm_worker(self):
+        while True:
+            with self._lock:
+                if not self._queue:
+                    self._worker_running = False
+                    return
+                name = self._queue.pop(0)
+                if name in self._maps or name in self._building: continue
+                building = self._building[name] = threading.Event()
+            try:
+                game_map = self._build(name)
+                self._store(name, game_map)
+                with self._lock: self.prewarmed += 1
+            except Exception as e:
+                print(f"--- LocationCache ERROR: Gagal prewarm lokasi '{name}': {e} ---")
+            finally:
+                with self._lock: self._building.pop(name).set()
+
+    def retain_only(self, location_names, keep_name=None):
+        """Membuang lokasi yang tidak ada di location_names (misal yang belum/tidak lagi terbuka)."""
+        allowed = set(location_names)
+        if keep_name: allowed.add(keep_name)
+        with self._lock:
+            for name in [name for name in self._maps if name not in allowed]:
+                _, size = self._maps.pop(name)
+                self.bytes -= size
+                self.evictions += 1
+            self._queue = [name for name in self._queue if name in allowed]
+
+    def wait_idle(self, timeout=None):
+        worker = self._worker
+        if worker is not None: worker.join(timeout)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._maps),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "prewarmed": self.prewarmed,
+                "evictions": self.evictions,
+            }
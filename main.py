@@ -3,6 +3,25 @@ import pygame
 import sys
 import os 
 import traceback # <--- TAMBAHKAN IMPORT INI
+import argparse
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description="Fishing Mania")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Catat timeline startup per komponen dan cetak ringkasannya setelah frame pertama")
+    parser.add_argument("--startup-trace", metavar="PATH", default=None,
+                        help="Ekspor timeline startup sebagai JSON trace-event Chrome (mengaktifkan --profile-startup)")
+    parser.add_argument("--profile-capture", action="store_true",
+                        help="Rekam cProfile di sekitar update/render sejak awal (F4 untuk berhenti/mulai lagi); laporan per state")
+    parser.add_argument("--profile-dir", metavar="DIR", default=None,
+                        help="Folder hasil rekaman cProfile (default: Config.PROFILE_CAPTURE_DIRECTORY)")
+    parser.add_argument("--profile-label", metavar="LABEL", default=None,
+                        help="Label rekaman (misal nama build), ditambahkan ke nama folder hasil")
+    parser.add_argument("--alloc-audit", action="store_true",
+                        help="Hitung alokasi per frame per subsistem sejak awal (F6 untuk berhenti/mulai lagi); frame lewat ambang ditulis ke log")
+    parser.add_argument("--watchdog", action="store_true",
+                        help="Ambil stack thread utama saat frame melewati anggaran; laporan sesi ini ditulis ke Config.WATCHDOG_LOG_PATH")
+    return parser.parse_known_args(argv)[0]
 
 try:
     # Mengubah direktori kerja ke direktori tempat skrip ini berada
@@ -19,18 +38,36 @@ except FileNotFoundError:
 
 try:
     from config import Config 
-    from game import Game
+    startup_arguments = parse_arguments()
+    if startup_arguments.profile_startup or startup_arguments.startup_trace:
+        Config.PROFILE_STARTUP = True
+        Config.STARTUP_TRACE_PATH = startup_arguments.startup_trace
+    if startup_arguments.profile_capture: Config.PROFILE_CAPTURE = True
+    if startup_arguments.profile_dir: Config.PROFILE_CAPTURE_DIRECTORY = startup_arguments.profile_dir
+    if startup_arguments.profile_label: Config.PROFILE_CAPTURE_LABEL = startup_arguments.profile_label
+    if startup_arguments.alloc_audit: Config.ALLOCATION_AUDIT = True
+    if startup_arguments.watchdog: Config.WATCHDOG_ENABLED = True
+    startup_profiler = Config.get_startup_profiler() # Dibuat sebelum impor game agar waktu impor ikut tercatat
+    with startup_profiler.span("import game"):
+        from game import Game
 except ImportError as e:
     print(f"ERROR Impor Awal: {e}")
     print("Pastikan semua file .py (config.py, game.py, dll.) ada di direktori yang sama dengan main.py.")
     sys.exit()
 
 
+def create_screen(screen_width, screen_height):
+    """Membuat jendela. Dengan Config.VSYNC render mengikuti refresh monitor (butuh flag SCALED)."""
+    if Config.VSYNC:
+        try: return pygame.display.set_mode((screen_width, screen_height), pygame.SCALED, vsync=1)
+        except pygame.error as e: print(f"PERINGATAN: VSync tidak didukung ({e}). Memakai mode biasa.")
+    return pygame.display.set_mode((screen_width, screen_height))
+
 def main():
     print("Menjalankan main() dari __main__...")
     
     try:
-        pygame.init()
+        with startup_profiler.span("pygame.init"): pygame.init()
         print("Pygame berhasil diinisialisasi.")
     except pygame.error as e:
         print(f"ERROR saat pygame.init(): {e}")
@@ -38,7 +75,7 @@ def main():
 
     try:
         if pygame.mixer.get_init() is None: 
-            pygame.mixer.init() 
+            with startup_profiler.span("pygame.mixer.init"): pygame.mixer.init() 
             if pygame.mixer.get_init():
                 print("Pygame mixer berhasil diinisialisasi.")
             else:
@@ -56,7 +93,7 @@ def main():
         else:
             screen_width, screen_height = Config.SCREEN_WIDTH, Config.SCREEN_HEIGHT
 
-        screen_surface = pygame.display.set_mode((screen_width, screen_height)) # Ganti nama variabel agar tidak bentrok
+        with startup_profiler.span("display.set_mode"): screen_surface = create_screen(screen_width, screen_height) # Ganti nama variabel agar tidak bentrok
         pygame.display.set_caption("Fishing Mania (TES Ver.)") 
         print("Layar game berhasil dibuat.")
     except AttributeError as e: 
@@ -74,7 +111,7 @@ def main():
 
     game_instance = None 
     try:
-        game_instance = Game(screen_surface) # Gunakan variabel screen_surface yang baru
+        with startup_profiler.span("Game.__init__"): game_instance = Game(screen_surface) # Gunakan variabel screen_surface yang baru
         print("Instance Game berhasil dibuat. Menjalankan game...")
         game_instance.run()
     except Exception as e:
@@ -85,6 +122,14 @@ def main():
         print("Keluar dari fungsi main().")
         if game_instance and hasattr(game_instance, 'running') and game_instance.running:
             game_instance.running = False 
+        if game_instance and hasattr(game_instance, 'game_data_manager'):
+            game_instance.game_data_manager.flush() # Save yang masih antre tetap ditulis walau terjadi error
+        if game_instance and hasattr(game_instance, 'profile_capture'):
+            game_instance.profile_capture.stop() # Rekaman tetap ditulis walau terjadi error
+        if game_instance and hasattr(game_instance, 'watchdog'):
+            game_instance.watchdog.stop()
+        if game_instance and hasattr(game_instance, 'allocation_audit'):
+            game_instance.allocation_audit.stop()
         pygame.quit()
         sys.exit()
 
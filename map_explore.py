@@ -7,38 +7,12 @@ class MapExplorer:
         print("--- MapExplorer: Memulai __init__()... ---")
         self.game = game
         self.config = self.game.config # Mengambil config dari game
+        self.text_cache = self.config.get_text_cache()
+        self.surface_registry = self.config.get_surface_registry()
 
-        # Load Font
-        font_name_to_load = None
-        small_font_size = 20 # Default
-
-        if hasattr(self.config, 'DEFAULT_FONT_NAME'):
-            font_name_to_load = self.config.DEFAULT_FONT_NAME
-        if hasattr(self.config, 'FONT_SIZES'):
-            small_font_size = self.config.FONT_SIZES.get('small', small_font_size)
-        
-        actual_font_path = None
-        if font_name_to_load and font_name_to_load.strip() != "" and font_name_to_load.lower() != 'none':
-            if os.path.isabs(font_name_to_load) and os.path.exists(font_name_to_load):
-                actual_font_path = font_name_to_load
-            elif hasattr(self.config, 'FONT_PATH'): 
-                potential_path = os.path.join(self.config.FONT_PATH, font_name_to_load)
-                if os.path.exists(potential_path):
-                    actual_font_path = potential_path
-        
-        try:
-            if actual_font_path:
-                self.font = pygame.font.Font(actual_font_path, small_font_size)
-                print(f"--- MapExplorer: Font '{actual_font_path}' berhasil dimuat.")
-            elif font_name_to_load and font_name_to_load.strip().lower() != 'none':
-                self.font = pygame.font.SysFont(font_name_to_load, small_font_size)
-                print(f"--- MapExplorer: Menggunakan SysFont '{font_name_to_load}'.")
-            else:
-                self.font = pygame.font.Font(None, small_font_size)
-                print(f"--- MapExplorer: Menggunakan pygame.font.Font(None, {small_font_size}) default.")
-        except Exception as e:
-            print(f"--- MapExplorer: ERROR saat memuat font: {e}. Menggunakan default pygame.font.Font(None, 24). ---")
-            self.font = pygame.font.Font(None, 24)
+        # Load Font (dari registry bersama)
+        small_font_size = self.config.FONT_SIZES.get('small', 20) if hasattr(self.config, 'FONT_SIZES') else 20
+        self.font = self.config.get_font_registry().get(small_font_size)
 
 
         # Load World Map Background
@@ -54,19 +28,14 @@ class MapExplorer:
                     print(f"--- MapExplorer: PERINGATAN - File peta '{world_map_path}' TIDAK DITEMUKAN. Akan menggunakan warna solid.")
                     # Tidak perlu set self.world_map_image ke None di sini, fallback di bawah akan menangani
                 else:
-                    loaded_map_image = self.config.load_image(world_map_path)
+                    loaded_map_image = self.config.load_image(world_map_path, scale=(self.config.SCREEN_WIDTH, self.config.SCREEN_HEIGHT), owner="MapExplorer")
                     # Cek apakah placeholder dikembalikan oleh Config.load_image (misal, 50x50 magenta)
                     # Ini adalah contoh pengecekan placeholder default dari Config. Anda mungkin perlu menyesuaikan jika placeholder berbeda.
                     if not (loaded_map_image.get_width() == 50 and loaded_map_image.get_height() == 50 and \
                             hasattr(loaded_map_image, 'get_at') and loaded_map_image.get_at((0,0)) == self.config.create_placeholder_surface().get_at((0,0))):
                         self.world_map_image = loaded_map_image
                         self.world_map_rect = self.world_map_image.get_rect(topleft=(0,0))
-                        print(f"--- MapExplorer: Gambar peta dunia '{world_map_path}' dimuat. Ukuran asli: {self.world_map_image.get_size()} ---")
-                        
-                        if self.world_map_image.get_size() != (self.config.SCREEN_WIDTH, self.config.SCREEN_HEIGHT):
-                            print(f"--- MapExplorer: Menyesuaikan skala gambar peta ke {self.config.SCREEN_WIDTH}x{self.config.SCREEN_HEIGHT} ---")
-                            self.world_map_image = pygame.transform.scale(self.world_map_image, (self.config.SCREEN_WIDTH, self.config.SCREEN_HEIGHT))
-                            self.world_map_rect = self.world_map_image.get_rect(topleft=(0,0))
+                        print(f"--- MapExplorer: Gambar peta dunia '{world_map_path}' dimuat (diskalakan ke layar). Ukuran: {self.world_map_image.get_size()} ---")
                     else:
                          print(f"--- MapExplorer: PERINGATAN - load_image untuk '{world_map_path}' mengembalikan placeholder. Akan menggunakan warna solid.")
 
@@ -89,6 +58,7 @@ class MapExplorer:
         self.player_speed = 200 
         self.player_boat_image = None # Inisialisasi ke None
         self.player_map_rect = None 
+        self.player_map_pos = None # Posisi topleft presisi (float); player_map_rect adalah versi bulatnya
         player_boat_image_path_debug = "" # Untuk pesan error
 
         if hasattr(self.config, 'ASSET_PATH'): # PASTIKAN INI BENAR: ASSET_PATH
@@ -102,7 +72,7 @@ class MapExplorer:
                     # self.player_boat_image akan tetap None
                 else:
                     # Config.load_image akan mengembalikan placeholder jika gagal, jadi loaded_boat_image selalu Surface
-                    loaded_boat_image = self.config.load_image(player_boat_image_path_debug, scale=0.6)
+                    loaded_boat_image = self.config.load_image(player_boat_image_path_debug, scale=self.config.MAP_BOAT_IMAGE_SCALE, owner="MapExplorer")
                     self.player_boat_image = loaded_boat_image # Gunakan apa pun yang dikembalikan
                     self.player_map_rect = self.player_boat_image.get_rect(center=self.player_world_pos)
                     
@@ -173,6 +143,7 @@ class MapExplorer:
         self.land_return_spot_data['rect_area'].center = self.land_return_spot_data['pos']
         
         self.active_target_state_name = None
+        self.music_target_state_name = None # Target terakhir yang musiknya sudah diminta untuk di-decode
         self.active_prompt_text = None
         self.active_spot_map_name = None
         self.locked_spot_message = None
@@ -222,6 +193,7 @@ class MapExplorer:
                             elif self.game.wallet >= unlock_cost:
                                 self.game.wallet -= unlock_cost
                                 self.game.unlocked_locations[map_name] = True 
+                                self.game.prewarm_unlocked_locations() # Lokasi baru langsung disiapkan di latar belakang
                                 print(f"--- MapExplorer: {display_name} berhasil dibuka! Koin berkurang {unlock_cost}. Sisa koin: {self.game.wallet} ---")
                                 self.locked_spot_message = None 
                                 return True 
@@ -237,7 +209,7 @@ class MapExplorer:
         return False
 
     def update(self, dt):
-        keys = pygame.key.get_pressed()
+        keys = self.game.get_pressed_keys()
         move_x, move_y = 0, 0
         if keys[pygame.K_LEFT]: 
             move_x -= self.player_speed * dt 
@@ -249,8 +221,12 @@ class MapExplorer:
             move_y += self.player_speed * dt 
 
         if self.player_map_rect: 
-            self.player_map_rect.x += move_x 
-            self.player_map_rect.y += move_y 
+            # Rect bisa dipindah dari luar (posisi dari save); ikuti jika begitu
+            if self.player_map_pos is None or (round(self.player_map_pos[0]), round(self.player_map_pos[1])) != self.player_map_rect.topleft:
+                self.player_map_pos = [float(self.player_map_rect.x), float(self.player_map_rect.y)]
+            self.player_map_pos[0] += move_x
+            self.player_map_pos[1] += move_y
+            self.player_map_rect.topleft = (round(self.player_map_pos[0]), round(self.player_map_pos[1]))
 
             self.player_map_rect.left = max(self.sea_limit_left, self.player_map_rect.left)
             self.player_map_rect.top = max(self.sea_limit_top, self.player_map_rect.top)
@@ -259,6 +235,8 @@ class MapExplorer:
             
             if self.world_map_rect: # Seharusnya tidak diperlukan jika batas laut sudah benar
                 self.player_map_rect.clamp_ip(self.world_map_rect) 
+            if self.player_map_rect.topleft != (round(self.player_map_pos[0]), round(self.player_map_pos[1])):
+                self.player_map_pos = [float(self.player_map_rect.x), float(self.player_map_rect.y)] # Tertahan di batas laut
             
             self.active_target_state_name = None 
             self.active_prompt_text = None 
@@ -288,6 +266,10 @@ class MapExplorer:
                 if self.player_map_rect.colliderect(self.land_return_spot_data['rect_area']): 
                     self.active_target_state_name = self.land_return_spot_data['target_state'] 
                     self.active_prompt_text = f"{self.land_return_spot_data['label']}" 
+
+            if self.active_target_state_name != self.music_target_state_name:
+                self.music_target_state_name = self.active_target_state_name
+                if self.active_target_state_name: self.game.prepare_music_for_map_target(self.active_target_state_name)
         else:
             # Ini tidak seharusnya terjadi jika __init__ berhasil membuat player_map_rect (bahkan untuk placeholder merah)
             print("--- MapExplorer WARN: self.player_map_rect is None in update() ---")
@@ -295,7 +277,7 @@ class MapExplorer:
 
     def render(self, screen):
         if self.world_map_image and self.world_map_rect: 
-            screen.blit(self.world_map_image, self.world_map_rect.topleft) 
+            screen.blit(self.surface_registry.touch(self.world_map_image), self.world_map_rect.topleft) 
         
         for display_name_key, spot_data in self.fishing_spots_data.items(): 
             is_active = (spot_data['map_name'] == self.active_target_state_name) 
@@ -317,7 +299,7 @@ class MapExplorer:
             
             color_val = self.config.COLORS.get(color_key, (255,255,255)) 
             
-            spot_label = self.font.render(spot_label_text, True, color_val) 
+            spot_label = self.text_cache.render(self.font, spot_label_text, color_val) 
             label_rect = spot_label.get_rect(center=spot_data['pos']) 
             screen.blit(spot_label, label_rect) 
 
@@ -326,7 +308,7 @@ class MapExplorer:
         land_default_color_val = (255,255,0) if is_land_spot_active else (255,255,255) 
         land_color_val = self.config.COLORS.get(land_color_key, land_default_color_val) 
 
-        land_label_surface = self.font.render(self.land_return_spot_data['label'], True, land_color_val) 
+        land_label_surface = self.text_cache.render(self.font, self.land_return_spot_data['label'], land_color_val) 
         land_label_rect = land_label_surface.get_rect(center=self.land_return_spot_data['pos']) 
         screen.blit(land_label_surface, land_label_rect) 
 
@@ -334,10 +316,10 @@ class MapExplorer:
         # Jika self.player_boat_image ada (bisa jadi gambar kapal asli atau placeholder dari Config), gambar itu.
         # Jika self.player_boat_image adalah None (gagal total), maka self.player_map_rect (untuk kotak merah) akan digunakan.
         if self.player_boat_image and self.player_map_rect: 
-            screen.blit(self.player_boat_image, self.player_map_rect) 
+            screen.blit(self.surface_registry.touch(self.player_boat_image), self.player_map_rect) 
         elif self.player_map_rect: # Ini hanya akan aktif jika self.player_boat_image adalah None
             player_color_val = self.config.COLORS.get("player_map_avatar", (255,0,0)) 
-            pygame.draw.rect(screen, player_color_val, self.player_map_rect) # Gambar kotak merah
+            screen.fill(player_color_val, self.player_map_rect) # Gambar kotak merah (fill agar didukung renderer dirty-rect)
         else:
             # Ini kondisi darurat jika player_map_rect juga None, yang seharusnya tidak terjadi.
              print("--- MapExplorer RENDER WARN: player_boat_image DAN player_map_rect Keduanya None! Tidak bisa render pemain. ---")
@@ -356,7 +338,7 @@ class MapExplorer:
             current_y = info_start_y + coins_ui_height + 5 # Mulai di bawah Koin global
 
             speed_text = f"Kecepatan: {int(self.game.boat.current_speed_value)}"
-            speed_surface = self.font.render(speed_text, True, self.config.COLORS.get('white'))
+            speed_surface = self.text_cache.render(self.font, speed_text, self.config.COLORS.get('white'))
             speed_rect = speed_surface.get_rect(topright=(info_start_x, current_y)) 
             screen.blit(speed_surface, speed_rect)
             current_y += speed_surface.get_height() + 5
@@ -365,13 +347,13 @@ class MapExplorer:
             current_fish_count = len(self.game.inventory.fish_list)
             max_capacity = self.game.boat.current_capacity_value
             capacity_text = f"Ikan: {current_fish_count}/{max_capacity}"
-            capacity_surface = self.font.render(capacity_text, True, self.config.COLORS.get('white'))
+            capacity_surface = self.text_cache.render(self.font, capacity_text, self.config.COLORS.get('white'))
             capacity_rect = capacity_surface.get_rect(topright=(info_start_x, current_y))
             screen.blit(capacity_surface, capacity_rect)
             current_y += capacity_surface.get_height() + 5
 
             line_length_text = f"Panjang Kail: {int(self.game.boat.current_line_length_value)}m"
-            line_length_surface = self.font.render(line_length_text, True, self.config.COLORS.get('white'))
+            line_length_surface = self.text_cache.render(self.font, line_length_text, self.config.COLORS.get('white'))
             line_length_rect = line_length_surface.get_rect(topright=(info_start_x, current_y))
             screen.blit(line_length_surface, line_length_rect)
 
@@ -385,6 +367,6 @@ class MapExplorer:
             elif "untuk membuka" in self.active_prompt_text:
                  text_color_val = self.config.COLORS.get('text_selected', (255,255,0)) 
 
-            interaction_text_surface = self.font.render(interaction_text_str, True, text_color_val) 
+            interaction_text_surface = self.text_cache.render(self.font, interaction_text_str, text_color_val) 
             text_rect = interaction_text_surface.get_rect(midbottom=(self.config.SCREEN_WIDTH // 2, self.config.SCREEN_HEIGHT - 20)) 
             screen.blit(interaction_text_surface, text_rect)
\ No newline at end of file
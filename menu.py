@@ -6,6 +6,8 @@ class Menu:
     def __init__(self, game, background_image_filename=None):
         self.game = game
         self.config = self.game.config
+        self.text_cache = self.config.get_text_cache()
+        self.surface_registry = self.config.get_surface_registry()
         self.selected_index = 0
         self.options = []
         self.title = "Default Menu Title"
@@ -16,46 +18,25 @@ class Menu:
             bg_path = os.path.join(self.config.BACKGROUND_PATH, background_image_filename)
             if os.path.exists(bg_path):
                 try:
-                    loaded_image = self.config.load_image(bg_path, use_alpha=False)
+                    # Versi yang sudah diskalakan ke ukuran layar di-cache, jadi semua menu memakai surface yang sama
+                    loaded_image = self.config.load_image(bg_path, scale=(self.config.SCREEN_WIDTH, self.config.SCREEN_HEIGHT), use_alpha=False,
+                                                          owner=self.__class__.__name__)
                     if loaded_image.get_width() > 1 and loaded_image.get_height() > 1:
-                        self.background_image = pygame.transform.scale(loaded_image, (self.config.SCREEN_WIDTH, self.config.SCREEN_HEIGHT))
+                        self.background_image = loaded_image
                 except Exception as e:
                     # print(f"--- Menu ({self.__class__.__name__}): ERROR latar belakang: {e}") # Untuk debug
                     pass
         
-        font_name_to_load = self.config.FONT_NAME
-        actual_font_path = None
-        if font_name_to_load and font_name_to_load.strip() != "" and font_name_to_load.lower() != 'none':
-            if os.path.isabs(font_name_to_load) and os.path.exists(font_name_to_load):
-                actual_font_path = font_name_to_load
-            else:
-                potential_path = os.path.join(self.config.FONT_PATH, font_name_to_load)
-                if os.path.exists(potential_path):
-                    actual_font_path = potential_path
-        
         medium_size = self.config.FONT_SIZES.get('medium', 30)
         title_size_key = 'title' if 'title' in self.config.FONT_SIZES else 'large'
         title_size = self.config.FONT_SIZES.get(title_size_key, 50)
         small_size = self.config.FONT_SIZES.get('small', 18)
 
-        try:
-            if actual_font_path:
-                self.font = pygame.font.Font(actual_font_path, medium_size)
-                self.title_font = pygame.font.Font(actual_font_path, title_size)
-                self.small_font = pygame.font.Font(actual_font_path, small_size)
-            elif font_name_to_load and font_name_to_load.strip() != "" and font_name_to_load.lower() != 'none':
-                self.font = pygame.font.SysFont(font_name_to_load, medium_size)
-                self.title_font = pygame.font.SysFont(font_name_to_load, title_size)
-                self.small_font = pygame.font.SysFont(font_name_to_load, small_size)
-            else:
-                self.font = pygame.font.Font(None, medium_size)
-                self.title_font = pygame.font.Font(None, title_size)
-                self.small_font = pygame.font.Font(None, small_size)
-        except Exception as e:
-            # print(f"--- Menu ({self.__class__.__name__}): ERROR FONT - {e}") # Untuk debug
-            self.font = pygame.font.Font(None, medium_size)
-            self.title_font = pygame.font.Font(None, title_size)
-            self.small_font = pygame.font.Font(None, small_size)
+        # Font dibagi lewat registry, jadi semua menu memakai objek Font yang sama
+        font_registry = self.config.get_font_registry()
+        self.font = font_registry.get(medium_size)
+        self.title_font = font_registry.get(title_size)
+        self.small_font = font_registry.get(small_size)
 
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
@@ -77,12 +58,12 @@ class Menu:
 
     def render(self, screen):
         if self.background_image:
-            screen.blit(self.background_image, (0,0))
+            screen.blit(self.surface_registry.touch(self.background_image), (0,0))
         else:
             screen.fill(self.fallback_background_color)
 
         if hasattr(self, 'title_font') and self.title_font:
-            title_surface = self.title_font.render(self.title, True, self.config.COLORS.get('white', (255,255,255)))
+            title_surface = self.text_cache.render(self.title_font, self.title, self.config.COLORS.get('white', (255,255,255)))
             title_rect = title_surface.get_rect(center=(self.config.SCREEN_WIDTH // 2, self.config.SCREEN_HEIGHT // 4 - 20))
             screen.blit(title_surface, title_rect)
             option_start_y = title_rect.bottom + 70
@@ -94,16 +75,16 @@ class Menu:
             for i, (text, action) in enumerate(self.options):
                 color_key = 'text_selected' if i == self.selected_index else 'text_default'
                 color = self.config.COLORS.get(color_key, (255,255,0) if i == self.selected_index else (255,255,255))
-                option_surface = self.font.render(text, True, color)
                 shadow_color = self.config.COLORS.get('black', (0,0,0))
                 shadow_offset = 2 
-                shadow_surface = self.font.render(text, True, shadow_color)
-                option_rect = option_surface.get_rect(center=(self.config.SCREEN_WIDTH // 2, option_start_y + i * line_height ))
-                screen.blit(shadow_surface, (option_rect.x + shadow_offset, option_rect.y + shadow_offset)) 
-                screen.blit(option_surface, option_rect) 
+                # Bayangan sudah dipanggang ke surface yang sama; teks utama berada di pojok kiri atas
+                option_surface = self.text_cache.render(self.font, text, color, shadow=(shadow_color, (shadow_offset, shadow_offset)))
+                option_rect = pygame.Rect(0, 0, option_surface.get_width() - shadow_offset, option_surface.get_height() - shadow_offset)
+                option_rect.center = (self.config.SCREEN_WIDTH // 2, option_start_y + i * line_height )
+                screen.blit(option_surface, option_rect.topleft) 
 
         if hasattr(self.game, 'wallet') and hasattr(self, 'small_font') and self.small_font:
-            coins_text_surface = self.small_font.render(f"Koin: {self.game.wallet}", True, self.config.COLORS.get('text_selected', (255,255,0)))
+            coins_text_surface = self.text_cache.render(self.small_font, f"Koin: {self.game.wallet}", self.config.COLORS.get('text_selected', (255,255,0)))
             coins_text_rect = coins_text_surface.get_rect(topright=(self.config.SCREEN_WIDTH - 10, 10))
             screen.blit(coins_text_surface, coins_text_rect)
 
@@ -239,7 +220,7 @@ class MarketScreen(Menu):
 
     def update_options(self):
         total_value = 0; num_fish = 0
-        if self.game.inventory and hasattr(self.game.inventory, 'fish_list') and isinstance(self.game.inventory.fish_list, list): 
+        if self.game.inventory and hasattr(self.game.inventory, 'fish_list') and self.game.inventory.fish_list is not None: 
             for fish_item in self.game.inventory.fish_list: 
                 if hasattr(fish_item, 'value'): total_value += fish_item.value 
                 elif isinstance(fish_item, dict) and 'value' in fish_item: total_value += fish_item['value']
@@ -265,7 +246,7 @@ class InventoryScreen(Menu):
 
     def update_options(self):
         self.options = []
-        if self.game.inventory and hasattr(self.game.inventory, 'fish_list') and isinstance(self.game.inventory.fish_list, list):
+        if self.game.inventory and hasattr(self.game.inventory, 'fish_list') and self.game.inventory.fish_list is not None:
             if not self.game.inventory.fish_list: 
                 self.options.append(("Inventaris Kosong", None))
             else:
@@ -32,6 +32,7 @@ class Player:
             print(f"ERROR Player (perahu): Tidak bisa memuat sprite dari karakter.png untuk pemain perahu: {e}. Menggunakan placeholder.") 
             self.image = pygame.Surface((30, 50), pygame.SRCALPHA) 
             self.image.fill(self.config.COLORS.get("player_map_avatar", (255,0,0, 200))) 
+        self.config.get_surface_registry().register(self.image, "Player", "karakter.png")
 
         self.rect = self.image.get_rect() 
         self.update_position() 
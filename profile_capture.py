@@ -0,0 +1,135 @@
+# profile_capture.py
+import io
+import os
+import sys
+import time
+import cProfile
+import contextlib
+import pstats
+
+_NULL_CAPTURE = contextlib.nullcontext() # Dipakai capture() saat rekaman tidak aktif
+
+
+class _GroupCapture:
+    __slots__ = ("profile", "calls", "seconds", "start")
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self.calls = 0
+        self.seconds = 0.0
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profile.disable()
+        self.seconds += time.perf_counter() - self.start
+        self.calls += 1
+        return False
+
+
+class ProfileCapture:
+    """
+    Perekaman cProfile dari sesi bermain sungguhan. Selama aktif, Game.run membungkus setiap
+    pemanggilan update/render dengan `with capture.capture(state):`; tiap grup state (misal semua
+    menu menjadi "menus") punya objek cProfile sendiri. stop() menulis satu folder per perekaman
+    berisi <grup>.pstats (untuk pstats/snakeviz), <grup>.txt (fungsi teratas menurut cumulative
+    dan tottime) dan summary.txt yang merangkum semua grup.
+    """
+    TOP_FUNCTIONS = 30
+
+    def __init__(self, output_directory, state_groups=None, label=None):
+        self.output_directory = output_directory
+        self.state_groups = state_groups or {}
+        self.label = label
+        self.active = False
+        self._groups = {}   # grup -> _GroupCapture
+        self._started_at = None
+        self.last_output = None
+
+    def group_for(self, state_name):
+        return self.state_groups.get(state_name, state_name or "unknown")
+
+    def capture(self, state_name):
+        if not self.active: return _NULL_CAPTURE
+        group = self.group_for(state_name)
+        capture = self._groups.get(group)
+        if capture is None: capture = self._groups[group] = _GroupCapture()
+        return capture
+
+    def toggle(self):
+        if self.active: return self.stop()
+        self.start()
+        return None
+
+    def start(self):
+        if self.active: return
+        probe = cProfile.Profile()
+        try: # Hanya satu profiler boleh aktif (misal jika game dijalankan lewat `python -m cProfile`)
+            probe.enable(); probe.disable()
+        except ValueError as e:
+            print(f"--- ProfileCapture ERROR: cProfile tidak bisa diaktifkan ({e}). ---")
+            return
+        self._groups = {}
+        self._started_at = time.time()
+        self.active = True
+        print("--- ProfileCapture: Perekaman cProfile dimulai. ---")
+
+    def stop(self):
+        """Menghentikan perekaman dan menulis laporan. Mengembalikan folder hasil (atau None)."""
+        if not self.active: return None
+        self.active = False
+        groups = {name: capture for name, capture in self._groups.items() if capture.calls}
+        self._groups = {}
+        if not groups:
+            print("--- ProfileCapture: Perekaman dihentikan, tidak ada data. ---")
+            return None
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self._started_at))
+        folder_name = f"{stamp}-{self.label}" if self.label else stamp
+        output = os.path.join(self.output_directory, folder_name)
+        try:
+            os.makedirs(output, exist_ok=True)
+            summary_lines = self._header(groups)
+            for group, capture in sorted(groups.items(), key=lambda item: -item[1].seconds):
+                capture.profile.dump_stats(os.path.join(output, f"{group}.pstats"))
+                report = self._group_report(group, capture)
+                with open(os.path.join(output, f"{group}.txt"), "w", encoding="utf-8") as f: f.write(report)
+                summary_lines.append(self._group_summary(group, capture))
+            with open(os.path.join(output, "summary.txt"), "w", encoding="utf-8") as f: f.write("\n".join(summary_lines) + "\n")
+        except OSError as e:
+            print(f"--- ProfileCapture ERROR: Gagal menulis laporan ke '{output}': {e} ---")
+            return None
+        self.last_output = output
+        print(f"--- ProfileCapture: Perekaman disimpan ke '{output}' ({', '.join(sorted(groups))}) ---")
+        return output
+
+    # --- Laporan ---
+    def _header(self, groups):
+        duration = time.time() - self._started_at
+        return [f"Fishing Mania - rekaman cProfile {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self._started_at))}",
+                f"Label: {self.label or '-'} | Python {sys.version.split()[0]} | Durasi rekaman {duration:.1f} s",
+                "",
+                f"{'Grup':<16} {'Panggilan':>10} {'Total s':>9} {'ms/pgl':>8}  Fungsi teratas (tottime)"]
+
+    def _top_functions(self, capture, sort_key, limit):
+        stats = pstats.Stats(capture.profile)
+        rows = []
+        for (filename, line, function), (_, calls, tottime, cumtime, _) in stats.stats.items():
+            rows.append((tottime if sort_key == "tottime" else cumtime, f"{os.path.basename(filename)}:{line}({function})", calls))
+        rows.sort(key=lambda row: -row[0])
+        return rows[:limit]
+
+    def _group_summary(self, group, capture):
+        top = ", ".join(f"{name} {seconds * 1000:.0f} ms" for seconds, name, _ in self._top_functions(capture, "tottime", 3))
+        return f"{group:<16} {capture.calls:>10} {capture.seconds:>9.2f} {capture.seconds / capture.calls * 1000:>8.2f}  {top}"
+
+    def _group_report(self, group, capture):
+        buffer = io.StringIO()
+        buffer.write(f"Grup: {group} | {capture.calls} panggilan update/render | {capture.seconds:.2f} s\n\n")
+        for sort_key in ("cumulative", "tottime"):
+            buffer.write(f"=== Urut {sort_key} ===\n")
+            stats = pstats.Stats(capture.profile, stream=buffer)
+            stats.strip_dirs().sort_stats(sort_key).print_stats(self.TOP_FUNCTIONS)
+        return buffer.getvalue()
@@ -0,0 +1,18 @@
+# report_writer.py
+import os
+
+def write_report(path, text, label, description, append=False):
+    """
+    Menulis laporan teks dari alat diagnostik (log watchdog, audit alokasi, daftar surface, trace startup).
+    Folder tujuan dibuat bila perlu dan hasilnya dicetak dengan format log game ("--- label: ... ---").
+    Mengembalikan path, atau None jika gagal ditulis (kegagalan hanya dicetak, tidak menghentikan game).
+    """
+    try:
+        directory = os.path.dirname(path)
+        if directory: os.makedirs(directory, exist_ok=True)
+        with open(path, "a" if append else "w", encoding="utf-8") as f: f.write(text)
+    except OSError as e:
+        print(f"--- {label} ERROR: Gagal menulis '{path}': {e} ---")
+        return None
+    print(f"--- {label}: {description} ditulis ke '{path}' ---")
+    return path
@@ -0,0 +1,196 @@
+# save_writer.py
+import os
+import json
+import time
+import threading
+
+def write_json_atomic(path, data, indent=4):
+    """
+    Menulis JSON ke file sementara di direktori yang sama, fsync, lalu os.replace ke path tujuan.
+    Jika proses mati di tengah penulisan, file save lama tetap utuh.
+    """
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(data, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+def append_json_lines(path, records):
+    """Menambahkan record ke jurnal JSONL (satu record per baris) lalu fsync. Mengembalikan jumlah byte."""
+    payload = "".join(json.dumps(record, separators=(',', ':')) + "\n" for record in records)
+    with open(path, 'a') as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    return len(payload)
+
+def write_json_lines_atomic(path, records):
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w') as f:
+        for record in records: f.write(json.dumps(record, separators=(',', ':')) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+def write_save_batch(path, snapshot=None, journal_path=None, records=()):
+    """
+    Satu batch penulisan save. Jika ada snapshot, snapshot ditulis atomik lebih dulu lalu jurnal
+    dikosongkan; record yang sudah tercakup snapshot (seq <= journal_seq) dibuang. Sisa record
+    ditambahkan ke jurnal. Urutan ini aman: crash di tengah jalan hanya meninggalkan record lama
+    yang akan dilewati saat replay.
+    """
+    if snapshot is not None:
+        write_json_atomic(path, snapshot)
+        if journal_path:
+            write_json_lines_atomic(journal_path, ())
+            covered_seq = snapshot.get("journal_seq", 0)
+            records = [record for record in records if record.get("seq", 0) > covered_seq]
+    if journal_path and records:
+        append_json_lines(journal_path, records)
+
+def read_json_lines(path):
+    """Membaca jurnal JSONL. Baris terakhir yang terpotong (crash saat append) diabaikan."""
+    records = []
+    if not os.path.exists(path): return records
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line: continue
+            try: records.append(json.loads(line))
+            except ValueError: break
+    return records
+
+
+class SaveWriter:
+    """
+    Penulis save di thread latar belakang. Thread utama cukup memanggil submit(snapshot) dengan
+    dict yang tidak akan diubah lagi; beberapa submit dalam jendela coalesce_seconds digabung menjadi
+    satu penulisan (hanya snapshot terbaru yang ditulis). Record jurnal dari append() tidak digabung,
+    melainkan ditulis semua secara berurutan. flush() menunggu sampai semua tertulis.
+    """
+    def __init__(self, path, coalesce_seconds=0.25, journal_path=None):
+        self.path = path
+        self.journal_path = journal_path
+        self.coalesce_seconds = coalesce_seconds
+        self._condition = threading.Condition()
+        self._pending = None          # Snapshot terbaru yang belum ditulis
+        self._pending_records = []    # Record jurnal yang belum ditulis
+        self._pending_since = None    # Waktu submit pertama dari snapshot yang sedang menunggu
+        self._writing = False
+        self._flush_requested = False
+        self._closed = False
+
+        self.submitted = 0
+        self.written = 0
+        self.coalesced = 0
+        self.records_written = 0
+        self.failures = 0
+        self.last_latency = 0.0  # Detik dari submit pertama sampai data aman di disk
+        self.max_latency = 0.0
+        self.total_latency = 0.0
+        self.last_write_duration = 0.0
+        self.last_error = None
+
+        self._thread = threading.Thread(target=self._run, name="SaveWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, snapshot):
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("SaveWriter sudah ditutup")
+            if self._pending is not None:
+                self.coalesced += 1
+            else:
+                self._pending_since = time.perf_counter()
+            self._pending = snapshot
+            self.submitted += 1
+            self._condition.notify_all()
+
+    def append(self, records):
+        """Menjadwalkan record jurnal (list dict, sudah bernomor seq) untuk ditambahkan ke file jurnal."""
+        if not records: return
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("SaveWriter sudah ditutup")
+            if self._pending is None and not self._pending_records:
+                self._pending_since = time.perf_counter()
+            else:
+                self.coalesced += 1
+            self._pending_records.extend(records)
+            self.submitted += 1
+            self._condition.notify_all()
+
+    def _has_pending(self):
+        return self._pending is not None or bool(self._pending_records)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._has_pending() and not self._closed:
+                    self._condition.wait()
+                if not self._has_pending() and self._closed:
+                    return
+                # Tunggu sisa jendela coalesce agar save beruntun digabung, kecuali diminta flush
+                deadline = self._pending_since + self.coalesce_seconds
+                while not (self._flush_requested or self._closed):
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0: break
+                    self._condition.wait(remaining)
+                snapshot = self._pending; records = self._pending_records; submitted_at = self._pending_since
+                self._pending = None; self._pending_records = []; self._pending_since = None
+                self._writing = True
+
+            write_start = time.perf_counter()
+            error = None
+            try: write_save_batch(self.path, snapshot, self.journal_path, records)
+            except Exception as e: error = e
+            write_end = time.perf_counter()
+
+            with self._condition:
+                self._writing = False
+                self.last_write_duration = write_end - write_start
+                if error is None:
+                    self.written += 1
+                    self.records_written += len(records)
+                    self.last_latency = write_end - submitted_at
+                    self.max_latency = max(self.max_latency, self.last_latency)
+                    self.total_latency += self.last_latency
+                else:
+                    self.failures += 1
+                    self.last_error = error
+                    print(f"--- SaveWriter ERROR: Gagal menulis save ke {self.path}: {error} ---")
+                if not self._has_pending():
+                    self._flush_requested = False
+                self._condition.notify_all()
+
+    def flush(self, timeout=None):
+        """Menulis snapshot yang tertunda sekarang juga dan menunggu sampai selesai. True jika tuntas."""
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            done = self._condition.wait_for(lambda: not self._has_pending() and not self._writing, timeout)
+            self._flush_requested = False
+            return done
+
+    def close(self, timeout=None):
+        self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+
+    def stats(self):
+        with self._condition:
+            return {
+                "submitted": self.submitted,
+                "written": self.written,
+                "coalesced": self.coalesced,
+                "records_written": self.records_written,
+                "failures": self.failures,
+                "pending": self._has_pending() or self._writing,
+                "last_latency_ms": self.last_latency * 1000.0,
+                "max_latency_ms": self.max_latency * 1000.0,
+                "mean_latency_ms": (self.total_latency / self.written * 1000.0) if self.written else 0.0,
+                "last_write_ms": self.last_write_duration * 1000.0,
+            }
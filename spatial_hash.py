@@ -0,0 +1,100 @@
+# spatial_hash.py
+import pygame
+
+class SpatialHash:
+    """
+    Indeks grid seragam untuk objek yang punya Rect (dalam koordinat dunia).
+    Objek didaftarkan sekali lalu diperbarui secara inkremental saat bergerak; bucket hanya
+    dipindah jika rentang sel yang ditempati berubah. Query persegi/radius hanya menyentuh
+    sel di sekitar area yang ditanyakan.
+    """
+    def __init__(self, cell_size=128):
+        self.cell_size = max(1, int(cell_size))
+        self._cells = {}    # (cx, cy) -> dict objek (dict dipakai sebagai set berurutan agar hasil query deterministik)
+        self._objects = {}  # objek -> (min_cx, min_cy, max_cx, max_cy)
+
+    def _cell_range(self, rect):
+        size = self.cell_size
+        return (int(rect.left // size), int(rect.top // size),
+                int((rect.right - 1) // size), int((rect.bottom - 1) // size))
+
+    def _add_to_cells(self, obj, cell_range):
+        min_cx, min_cy, max_cx, max_cy = cell_range
+        cells = self._cells
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    bucket = cells[(cx, cy)] = {}
+                bucket[obj] = None
+
+    def _remove_from_cells(self, obj, cell_range):
+        min_cx, min_cy, max_cx, max_cy = cell_range
+        cells = self._cells
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.pop(obj, None)
+                    if not bucket: del cells[(cx, cy)]
+
+    def insert(self, obj, rect=None):
+        if obj in self._objects:
+            self.update(obj, rect)
+            return
+        cell_range = self._cell_range(rect if rect is not None else obj.rect)
+        self._objects[obj] = cell_range
+        self._add_to_cells(obj, cell_range)
+
+    def update(self, obj, rect=None):
+        old_range = self._objects.get(obj)
+        new_range = self._cell_range(rect if rect is not None else obj.rect)
+        if old_range == new_range:
+            return # Masih di sel yang sama, tidak ada yang perlu dipindah
+        if old_range is not None:
+            self._remove_from_cells(obj, old_range)
+        self._objects[obj] = new_range
+        self._add_to_cells(obj, new_range)
+
+    def remove(self, obj):
+        old_range = self._objects.pop(obj, None)
+        if old_range is not None:
+            self._remove_from_cells(obj, old_range)
+
+    def clear(self):
+        self._cells.clear()
+        self._objects.clear()
+
+    def __contains__(self, obj):
+        return obj in self._objects
+
+    def __len__(self):
+        return len(self._objects)
+
+    def query_rect(self, rect):
+        """Objek yang sel-nya bersinggungan dengan rect (kandidat kasar; cek presisi di pemanggil)."""
+        min_cx, min_cy, max_cx, max_cy = self._cell_range(rect)
+        cells = self._cells
+        found = {}
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket: found.update(bucket)
+        return found.keys()
+
+    def query_colliding(self, rect):
+        """Objek yang rect-nya benar-benar bertabrakan dengan rect."""
+        return [obj for obj in self.query_rect(rect) if rect.colliderect(obj.rect)]
+
+    def query_radius(self, x, y, radius):
+        """Objek yang rect-nya berada dalam jarak radius dari titik (x, y)."""
+        area = pygame.Rect(int(x - radius), int(y - radius), int(radius * 2) + 1, int(radius * 2) + 1)
+        radius_sq = radius * radius
+        found = []
+        for obj in self.query_rect(area):
+            obj_rect = obj.rect
+            nearest_x = min(max(x, obj_rect.left), obj_rect.right)
+            nearest_y = min(max(y, obj_rect.top), obj_rect.bottom)
+            if (nearest_x - x) ** 2 + (nearest_y - y) ** 2 <= radius_sq:
+                found.append(obj)
+        return found
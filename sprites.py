@@ -4,12 +4,15 @@ import random
 import os
 
 class Spritesheet:
-    def __init__(self, file_path):
+    def __init__(self, file_path, surface_registry=None):
+        self.surface_registry = surface_registry
+        self.source_name = os.path.basename(file_path)
         try:
             self.sheet = pygame.image.load(file_path).convert_alpha()
         except pygame.error as e:
             print(f"ERROR: Tidak dapat memuat spritesheet dari {file_path}: {e}")
             self.sheet = pygame.Surface((1,1), pygame.SRCALPHA) # Fallback
+        if surface_registry: surface_registry.register(self.sheet, "Spritesheet", self.source_name)
 
     def get_sprite(self, x, y, width, height):
         if self.sheet.get_width() <= 1: # Cek jika sheet utama gagal dimuat
@@ -19,6 +22,7 @@ class Spritesheet:
 
         sprite = pygame.Surface((width, height), pygame.SRCALPHA)
         sprite.blit(self.sheet, (0, 0), (x, y, width, height))
+        if self.surface_registry: self.surface_registry.register(sprite, "Spritesheet.get_sprite", f"{self.source_name} ({x},{y},{width},{height})")
         return sprite
     
 class Player(pygame.sprite.Sprite): # Ini adalah LandPlayer
@@ -39,7 +43,7 @@ class Player(pygame.sprite.Sprite): # Ini adalah LandPlayer
 
         self.facing = 'down'
         self.animation_loop = 0 
-        self.animation_speed = 0.1 
+        self.animation_speed = 6.0 # Frame animasi per detik
 
         self._load_frames() # Memuat semua frame animasi
 
@@ -47,6 +51,7 @@ class Player(pygame.sprite.Sprite): # Ini adalah LandPlayer
         self.image = self.animations[self.facing]['idle']
         self.rect = self.image.get_rect()
         self.rect.topleft = (self.x, self.y)
+        self.pos = [float(self.rect.x), float(self.rect.y)] # Posisi presisi; rect hanya versi bulatnya
         
     def _load_frames(self):
         self.animations = {
@@ -69,7 +74,8 @@ class Player(pygame.sprite.Sprite): # Ini adalah LandPlayer
 
         def get_scaled_sprite(x, y, w, h):
             original = ss.get_sprite(x,y,w,h)
-            return pygame.transform.scale(original, (int(w*scale), int(h*scale)))
+            scaled = pygame.transform.scale(original, (int(w*scale), int(h*scale)))
+            return self.game.config.get_surface_registry().register(scaled, "LandPlayer", f"frame ({x},{y}) x{scale}")
 
         # Koordinat berdasarkan file sprites.py asli Anda
         self.animations['down']['idle'] = get_scaled_sprite(1, 128, 30, 32)
@@ -102,7 +108,7 @@ class Player(pygame.sprite.Sprite): # Ini adalah LandPlayer
                                            get_scaled_sprite(32, 42, 30, 40), 
                                            get_scaled_sprite(0, 40, 30, 40)]
 
-    def animate(self): 
+    def animate(self, dt): 
         is_moving = self.x_change != 0 or self.y_change != 0
         if self.facing not in self.animations: self.facing = 'down' 
         current_anim_set = self.animations[self.facing]
@@ -110,15 +116,15 @@ class Player(pygame.sprite.Sprite): # Ini adalah LandPlayer
         if is_moving:
             current_walk_frames = current_anim_set['walk']
             if not current_walk_frames: self.image = current_anim_set['idle']; return
-            self.animation_loop = (self.animation_loop + self.animation_speed) % len(current_walk_frames)
+            self.animation_loop = (self.animation_loop + self.animation_speed * dt) % len(current_walk_frames)
             self.image = current_walk_frames[math.floor(self.animation_loop)]
         else: 
             self.image = current_anim_set['idle']
             self.animation_loop = 0 
         
-    def movements(self): 
-        keys = pygame.key.get_pressed()
-        speed = self.game.config.PLAYER_SPEED 
+    def movements(self, dt): 
+        keys = self.game.get_pressed_keys()
+        speed = self.game.config.PLAYER_SPEED * dt # PLAYER_SPEED dalam piksel per detik
         self.x_change = 0; self.y_change = 0
         
         if keys [pygame.K_a] or keys [pygame.K_LEFT]: 
@@ -135,12 +141,15 @@ class Player(pygame.sprite.Sprite): # Ini adalah LandPlayer
             self.y_change += speed
             self.facing = 'down'
             
-    def update(self): 
-        self.movements()
-        self.animate() # PASTIKAN INI DIPANGGIL
+    def update(self, dt): 
+        self.movements(dt)
+        self.animate(dt) # PASTIKAN INI DIPANGGIL
 
-        self.rect.x += self.x_change
-        self.rect.y += self.y_change
+        # Rect bisa dipindah dari luar (clamp batas daratan, setup scene); ikuti jika begitu
+        if (round(self.pos[0]), round(self.pos[1])) != self.rect.topleft: self.pos = [float(self.rect.x), float(self.rect.y)]
+        self.pos[0] += self.x_change
+        self.pos[1] += self.y_change
+        self.rect.topleft = (round(self.pos[0]), round(self.pos[1]))
 
 # KELAS Block DAN Ground (tetap ada tapi Player tidak berinteraksi langsung dengannya)
 class Block(pygame.sprite.Sprite): #
@@ -198,6 +207,7 @@ class Ground(pygame.sprite.Sprite): #
             print(f"--- Ground: ERROR memuat tile gambar '{ground_image_path}': {e}. Menggunakan warna hijau solid.")
             self.image = pygame.Surface((self.width, self.height))
             self.image.fill(default_color) 
+        self.game.config.get_surface_registry().register(self.image, "Ground", "Grass 1.png")
 
         self.rect = self.image.get_rect()
         self.rect.x = self.x
@@ -0,0 +1,168 @@
+# startup_profiler.py
+import os
+import json
+import time
+import contextlib
+import threading
+
+_NULL_SPAN = contextlib.nullcontext() # Dipakai span() saat profiler tidak aktif
+
+
+class _Span:
+    def __init__(self, profiler, name, category, args):
+        self.profiler = profiler
+        self.record = {"name": name, "category": category, "args": args}
+
+    def __enter__(self):
+        self.profiler._open(self.record)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler._close(self.record)
+        return False
+
+
+class StartupProfiler:
+    """
+    Timeline startup (waktu sampai frame pertama). Kode memanggil `with profiler.span("Nama"):`
+    di sekitar tiap komponen; span bisa bertingkat dan dicatat per thread. Selama aktif,
+    pygame.image.load, pygame.font.Font dan pygame.font.SysFont dibungkus agar decode gambar dan
+    pencarian font ikut tercatat. finish() mencetak tabel ringkasan (total dan self time per span)
+    dan bisa mengekspor JSON trace-event Chrome (buka di chrome://tracing atau Perfetto).
+    """
+    def __init__(self, enabled=False, trace_path=None):
+        self.enabled = enabled
+        self.active = enabled
+        self.trace_path = trace_path
+        self.origin = time.perf_counter()
+        self.finished_at = None
+        self.spans = []              # Span yang sudah selesai, urut waktu selesai
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._thread_names = {}
+        self._restore_hooks = []
+        if enabled: self._install_hooks()
+
+    # --- Perekaman span ---
+    def span(self, name, category="startup", **args):
+        if not self.active: return _NULL_SPAN
+        return _Span(self, name, category, args)
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+            thread = threading.current_thread()
+            with self._lock: self._thread_names[thread.ident] = thread.name
+        return stack
+
+    def _open(self, record):
+        stack = self._stack()
+        record["path"] = (stack[-1]["path"] if stack else ()) + (record["name"],)
+        record["tid"] = threading.get_ident()
+        record["children_time"] = 0.0
+        stack.append(record)
+        record["start"] = time.perf_counter()
+
+    def _close(self, record):
+        record["end"] = time.perf_counter()
+        stack = self._stack()
+        if stack and stack[-1] is record: stack.pop()
+        elif record in stack: stack.remove(record)
+        duration = record["end"] - record["start"]
+        if stack: stack[-1]["children_time"] += duration
+        with self._lock: self.spans.append(record)
+
+    # --- Hook pygame (decode gambar dan pencarian font) ---
+    def _install_hooks(self):
+        import pygame
+        profiler = self
+
+        original_image_load = pygame.image.load
+        def timed_image_load(file, *args, **kwargs):
+            with profiler.span("image.load", "io", file=os.path.basename(str(file))):
+                return original_image_load(file, *args, **kwargs)
+
+        original_sysfont = pygame.font.SysFont
+        def timed_sysfont(name, size, *args, **kwargs):
+            with profiler.span("font.SysFont", "font", font=str(name), size=size):
+                return original_sysfont(name, size, *args, **kwargs)
+
+        original_font = pygame.font.Font
+        class TimedFont(original_font): # Subclass agar isinstance(..., pygame.font.Font) tetap benar
+            def __init__(self, file=None, size=12, *args, **kwargs):
+                with profiler.span("font.Font", "font", file=os.path.basename(str(file)) if file else "default", size=size):
+                    super().__init__(file, size, *args, **kwargs)
+
+        pygame.image.load = timed_image_load
+        pygame.font.SysFont = timed_sysfont
+        pygame.font.Font = TimedFont
+        self._restore_hooks = [(pygame.image, "load", original_image_load),
+                               (pygame.font, "SysFont", original_sysfont),
+                               (pygame.font, "Font", original_font)]
+
+    def _uninstall_hooks(self):
+        for module, attribute, original in self._restore_hooks: setattr(module, attribute, original)
+        self._restore_hooks = []
+
+    # --- Hasil ---
+    def finish(self, print_summary=True):
+        """Menutup timeline (dipanggil setelah frame pertama), mencetak ringkasan dan mengekspor trace."""
+        if not self.active: return
+        self.active = False
+        self.finished_at = time.perf_counter()
+        self._uninstall_hooks()
+        if print_summary: print(self.format_summary())
+        if self.trace_path: self.export_chrome_trace(self.trace_path)
+
+    def total_seconds(self):
+        return (self.finished_at or time.perf_counter()) - self.origin
+
+    def summary_rows(self):
+        """Span digabung per jalur (nama bertingkat), urut kemunculan pertama. Waktu dalam milidetik."""
+        with self._lock: spans = sorted(self.spans, key=lambda record: record["start"])
+        rows = {}
+        for record in spans:
+            key = (record["tid"], record["path"])
+            row = rows.get(key)
+            if row is None:
+                row = rows[key] = {"name": record["name"], "path": "/".join(record["path"]), "depth": len(record["path"]) - 1,
+                                   "thread": self._thread_names.get(record["tid"], str(record["tid"])),
+                                   "count": 0, "total_ms": 0.0, "self_ms": 0.0}
+            duration = record["end"] - record["start"]
+            row["count"] += 1
+            row["total_ms"] += duration * 1000.0
+            row["self_ms"] += (duration - record["children_time"]) * 1000.0
+        return list(rows.values())
+
+    def format_summary(self):
+        total_ms = self.total_seconds() * 1000.0
+        lines = [f"--- StartupProfiler: {total_ms:.1f} ms sampai frame pertama ---",
+                 f"{'Span':<44} {'Total ms':>10} {'Self ms':>10} {'n':>5} {'%':>6}"]
+        main_thread = threading.main_thread().name
+        for row in self.summary_rows():
+            label = "  " * row["depth"] + row["name"]
+            if row["thread"] != main_thread: label += f" [{row['thread']}]"
+            share = (row["total_ms"] / total_ms * 100.0) if total_ms > 0 else 0.0
+            lines.append(f"{label[:44]:<44} {row['total_ms']:>10.1f} {row['self_ms']:>10.1f} {row['count']:>5} {share:>5.1f}%")
+        return "\n".join(lines)
+
+    def chrome_trace_events(self):
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans); thread_names = dict(self._thread_names)
+        events = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                  for tid, name in thread_names.items()]
+        for record in spans:
+            events.append({
+                "name": record["name"], "cat": record["category"], "ph": "X", "pid": pid, "tid": record["tid"],
+                "ts": (record["start"] - self.origin) * 1e6, "dur": (record["end"] - record["start"]) * 1e6,
+                "args": record["args"],
+            })
+        return events
+
+    def export_chrome_trace(self, path):
+        """Menulis trace-event Chrome ke `path`. Mengembalikan path atau None jika gagal."""
+        from report_writer import write_report
+        trace = json.dumps({"traceEvents": self.chrome_trace_events(), "displayTimeUnit": "ms"})
+        return write_report(path, trace, "StartupProfiler", "Trace Chrome")
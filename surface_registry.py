@@ -0,0 +1,156 @@
+# surface_registry.py
+import time
+import weakref
+import threading
+from collections import deque
+from report_writer import write_report
+
+class _SurfaceRecord:
+    __slots__ = ("ref", "owners", "source", "size", "bytes_per_pixel", "bytes", "created_frame", "last_used_frame")
+    def __init__(self, ref, owner, source, surface, frame):
+        self.ref = ref
+        self.owners = [owner]
+        self.source = source
+        self.size = surface.get_size()
+        self.bytes_per_pixel = surface.get_bytesize()
+        self.bytes = self.size[0] * self.size[1] * self.bytes_per_pixel
+        self.created_frame = frame
+        self.last_used_frame = frame
+
+
+class SurfaceRegistry:
+    """
+    Pencatatan memori surface yang dibuat oleh loader (Config.load_image, Spritesheet, GameMap, Fish, dst).
+    Setiap surface dicatat sekali (lebar x tinggi x byte per piksel) beserta pemiliknya, sumbernya dan
+    frame terakhir diminta/dipakai; surface yang dibagi (misal latar menu dari cache aset) mengumpulkan
+    beberapa pemilik tanpa dihitung dua kali. Catatan dilepas otomatis lewat weakref saat surface dibuang
+    oleh GC; pelepasan itu diproses di pemanggilan berikutnya agar callback GC tidak mengubah dict di
+    tengah iterasi. Jika total melewati budget, peringatan dicetak sekali sampai total turun lagi.
+    """
+    BUDGET_REARM_FRACTION = 0.9 # Peringatan aktif lagi setelah total turun di bawah 90% budget
+
+    def __init__(self, budget_bytes=None):
+        self.budget_bytes = budget_bytes
+        self.frame = 0
+        self.bytes = 0
+        self.peak_bytes = 0
+        self.registered = 0
+        self._records = {}        # id(surface) -> _SurfaceRecord
+        self._released = deque()  # Kunci dari callback weakref, diproses di _drain_released()
+        self._over_budget = False
+        self._lock = threading.RLock() # Loader juga dipanggil dari thread prewarm lokasi
+
+    # --- Pencatatan ---
+    def register(self, surface, owner, source=None):
+        """Mencatat surface (atau menambah pemilik jika sudah tercatat). Mengembalikan surface itu sendiri."""
+        if surface is None: return surface
+        with self._lock:
+            self._drain_released()
+            key = id(surface)
+            record = self._records.get(key)
+            if record is not None and record.ref() is surface:
+                if owner not in record.owners: record.owners.append(owner)
+                record.last_used_frame = self.frame
+                return surface
+            record = _SurfaceRecord(weakref.ref(surface, self._make_release_callback(key)), owner, source, surface, self.frame)
+            if key in self._records: self.bytes -= self._records[key].bytes # id dipakai ulang sebelum callback diproses
+            self._records[key] = record
+            self.bytes += record.bytes
+            self.registered += 1
+            self.peak_bytes = max(self.peak_bytes, self.bytes)
+            self._check_budget(record)
+        return surface
+
+    def touch(self, surface, owner=None):
+        """
+        Menandai surface dipakai di frame ini; dipanggil oleh cache hit load_image dan jalur render yang memblit surface
+        tercatat (latar menu, peta dunia, sprite daratan, chunk latar, varian ikan). owner ditambahkan jika baru.
+        """
+        record = self._records.get(id(surface))
+        if record is not None and record.ref() is surface:
+            record.last_used_frame = self.frame
+            if owner is not None and owner not in record.owners:
+                with self._lock: record.owners.append(owner)
+        return surface
+
+    def source_of(self, surface):
+        record = self._records.get(id(surface))
+        return record.source if record is not None and record.ref() is surface else None
+
+    def next_frame(self):
+        self.frame += 1
+
+    def _make_release_callback(self, key):
+        released = self._released
+        return lambda ref: released.append((key, ref))
+
+    def _drain_released(self):
+        while self._released:
+            key, ref = self._released.popleft()
+            record = self._records.get(key)
+            if record is not None and record.ref is ref:
+                del self._records[key]
+                self.bytes -= record.bytes
+        if self._over_budget and self.budget_bytes and self.bytes < self.budget_bytes * self.BUDGET_REARM_FRACTION:
+            self._over_budget = False
+
+    def _check_budget(self, record):
+        if not self.budget_bytes or self._over_budget or self.bytes <= self.budget_bytes: return
+        self._over_budget = True
+        largest = max(self._records.values(), key=lambda item: item.bytes)
+        print(f"--- SurfaceRegistry PERINGATAN: Memori surface {self.bytes / (1024*1024):.1f} MB melebihi budget "
+              f"{self.budget_bytes / (1024*1024):.1f} MB setelah {record.owners[0]} ({record.source or '-'}); "
+              f"terbesar: {largest.owners[0]} ({largest.source or '-'}, {largest.bytes / (1024*1024):.1f} MB) ---")
+
+    # --- Laporan ---
+    def stats(self):
+        """Angka ringkas tanpa mengurutkan catatan (untuk overlay debug tiap frame)."""
+        with self._lock:
+            self._drain_released()
+            return {"surfaces": len(self._records), "bytes": self.bytes, "peak_bytes": self.peak_bytes,
+                    "budget_bytes": self.budget_bytes, "over_budget": bool(self.budget_bytes) and self.bytes > self.budget_bytes}
+
+    def records(self):
+        """Catatan yang masih hidup, urut dari yang terbesar."""
+        with self._lock:
+            self._drain_released()
+            records = [record for record in self._records.values() if record.ref() is not None]
+        records.sort(key=lambda record: -record.bytes)
+        return records
+
+    def totals(self):
+        records = self.records()
+        by_owner = {}
+        for record in records:
+            owner = record.owners[0] # Surface bersama dihitung untuk pemilik pertama saja
+            count, size = by_owner.get(owner, (0, 0))
+            by_owner[owner] = (count + 1, size + record.bytes)
+        return {"surfaces": len(records), "bytes": sum(record.bytes for record in records), "peak_bytes": self.peak_bytes,
+                "budget_bytes": self.budget_bytes, "over_budget": self._over_budget, "frame": self.frame,
+                "by_owner": dict(sorted(by_owner.items(), key=lambda item: -item[1][1]))}
+
+    def format_dump(self, limit=None):
+        totals = self.totals()
+        megabyte = 1024 * 1024
+        budget = f"{totals['budget_bytes'] / megabyte:.1f} MB" if totals['budget_bytes'] else "-"
+        lines = [f"=== Fishing Mania: surface {time.strftime('%Y-%m-%d %H:%M:%S')} frame {totals['frame']} ===",
+                 f"Total {totals['surfaces']} surface, {totals['bytes'] / megabyte:.1f} MB (puncak {totals['peak_bytes'] / megabyte:.1f} MB, budget {budget})",
+                 "", "Per pemilik:"]
+        lines.extend(f"  {owner:<32} {count:>5} surface {size / megabyte:>8.2f} MB" for owner, (count, size) in totals["by_owner"].items())
+        lines.extend(["", f"{'MB':>8} {'Ukuran':>11} {'B/px':>4} {'Dibuat':>7} {'Dipakai':>7}  Pemilik / sumber"])
+        records = self.records()
+        for record in records[:limit] if limit else records:
+            size = f"{record.size[0]}x{record.size[1]}"
+            lines.append(f"{record.bytes / megabyte:>8.2f} {size:>11} {record.bytes_per_pixel:>4} {record.created_frame:>7} "
+                         f"{record.last_used_frame:>7}  {', '.join(record.owners)} / {record.source or '-'}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path=None):
+        """Mencetak ringkasan dan menulis tabel lengkap ke `path` (jika ada). Mengembalikan path atau None."""
+        totals = self.totals()
+        print(f"--- SurfaceRegistry: {totals['surfaces']} surface, {totals['bytes'] / (1024*1024):.1f} MB "
+              f"(puncak {totals['peak_bytes'] / (1024*1024):.1f} MB) ---")
+        for owner, (count, size) in list(totals["by_owner"].items())[:8]:
+            print(f"    {owner}: {count} surface, {size / (1024*1024):.2f} MB")
+        if not path: return None
+        return write_report(path, self.format_dump(), "SurfaceRegistry", "Daftar surface")
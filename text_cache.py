@@ -0,0 +1,77 @@
+# text_cache.py
+from collections import OrderedDict
+import pygame
+from allocation_audit import count_allocation
+
+class TextCache:
+    """
+    Cache surface teks hasil font.render, dibagi oleh semua layar (UI, menu, peta, daratan).
+    Kunci: (font, text, color, antialias, shadow). Teks dengan bayangan dipanggang menjadi satu
+    surface gabungan, jadi cukup satu blit per label. Entri paling lama tidak dipakai dibuang (LRU)
+    jika jumlah entri melebihi max_entries. Surface yang dikembalikan dibagi, anggap read-only.
+    """
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(font, text, color, antialias=True, shadow=None):
+        if shadow is not None:
+            shadow_color, (offset_x, offset_y) = shadow
+            shadow = (tuple(shadow_color), int(offset_x), int(offset_y))
+        return (font, str(text), tuple(color), bool(antialias), shadow)
+
+    @staticmethod
+    def _render_uncached(font, text, color, antialias, shadow):
+        text_surface = font.render(text, antialias, color)
+        if shadow is None:
+            return text_surface
+        shadow_color, offset_x, offset_y = shadow
+        shadow_surface = font.render(text, antialias, shadow_color)
+        # Teks utama tetap di pojok (0,0) jika offset positif, jadi posisi blit sama seperti tanpa bayangan
+        width = text_surface.get_width() + abs(offset_x)
+        height = text_surface.get_height() + abs(offset_y)
+        composite = pygame.Surface((width, height), pygame.SRCALPHA)
+        text_x = max(0, -offset_x); text_y = max(0, -offset_y)
+        composite.blit(shadow_surface, (text_x + offset_x, text_y + offset_y))
+        composite.blit(text_surface, (text_x, text_y))
+        return composite
+
+    def render(self, font, text, color, antialias=True, shadow=None):
+        """
+        Pengganti font.render(text, antialias, color) yang memakai cache.
+        shadow: None atau (warna_bayangan, (offset_x, offset_y)).
+        """
+        key = self.make_key(font, text, color, antialias, shadow)
+        surface = self._entries.get(key)
+        if surface is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        count_allocation("TextCache:Surface")
+        surface = self._render_uncached(font, key[1], key[2], key[3], key[4])
+        self._entries[key] = surface
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,80 @@
+# transform_cache.py
+import weakref
+import pygame
+from allocation_audit import count_allocation
+
+class OrientedFrames:
+    """
+    Kumpulan varian orientasi dari satu surface sumber: flip horizontal (kiri/kanan)
+    dan rotasi pitch terkuantisasi. Semua varian dibuat sekali di depan, jadi render
+    cukup memilih surface yang sudah ada tanpa membuat surface baru tiap frame.
+    Konvensi: gambar sumber menghadap ke kiri; angle positif = kepala naik.
+    """
+    def __init__(self, source_surface, pitch_angles=(0,)):
+        # Sumber disimpan sebagai weakref agar entri TransformCache (WeakKeyDictionary) bisa dibuang
+        self._source_ref = weakref.ref(source_surface)
+        self.pitch_angles = tuple(sorted(set(pitch_angles) | {0}))
+        self._frames = {}
+        for facing_right in (False, True):
+            base = pygame.transform.flip(source_surface, True, False) if facing_right else source_surface
+            for angle in self.pitch_angles:
+                if angle == 0:
+                    if facing_right: self._frames[(True, 0)] = base
+                else:
+                    # pygame memutar berlawanan arah jarum jam; arah "kepala naik" bergantung arah hadap
+                    rotation = angle if facing_right else -angle
+                    self._frames[(facing_right, angle)] = pygame.transform.rotate(base, rotation)
+
+    def get(self, facing_right, angle=0):
+        frame = self._frames.get((facing_right, angle))
+        if frame is None:
+            frame = self._frames[(True, 0)] if facing_right else self._source_ref()
+        return frame
+
+
+class TransformCache:
+    """
+    Cache OrientedFrames per surface sumber. Karena gambar ikan/kapal berasal dari cache aset bersama,
+    semua sprite satu spesies memakai set varian yang sama. Entri hilang otomatis saat surface sumber
+    tidak dipakai lagi (WeakKeyDictionary).
+    """
+    def __init__(self, surface_registry=None):
+        self._entries = weakref.WeakKeyDictionary()
+        self.surface_registry = surface_registry
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_pitch_angles(max_degrees, step_degrees):
+        if max_degrees <= 0 or step_degrees <= 0:
+            return (0,)
+        steps = int(max_degrees // step_degrees)
+        return tuple(i * step_degrees for i in range(-steps, steps + 1))
+
+    @staticmethod
+    def quantize_angle(angle, max_degrees, step_degrees):
+        if max_degrees <= 0 or step_degrees <= 0:
+            return 0
+        angle = max(-max_degrees, min(max_degrees, angle))
+        quantized = int(round(angle / step_degrees)) * step_degrees
+        return max(-max_degrees, min(max_degrees, quantized))
+
+    def get_frames(self, source_surface, pitch_angles=(0,)):
+        per_source = self._entries.get(source_surface)
+        if per_source is None:
+            per_source = {}
+            self._entries[source_surface] = per_source
+        key = tuple(pitch_angles)
+        frames = per_source.get(key)
+        if frames is None:
+            self.misses += 1
+            frames = OrientedFrames(source_surface, pitch_angles)
+            per_source[key] = frames
+            count_allocation("TransformCache:Surface", len(frames._frames)) # Semua varian flip/rotasi dibuat baru
+            if self.surface_registry:
+                source = f"varian {self.surface_registry.source_of(source_surface) or source_surface.get_size()}"
+                for variant_key, variant in frames._frames.items():
+                    self.surface_registry.register(variant, "TransformCache", f"{source} {variant_key}")
+        else:
+            self.hits += 1
+        return frames
@@ -1,33 +1,18 @@
 # Game PBO V5/ui.py
 # IMPROVE/ui.py
 import pygame
-import os 
 
 class UI:
     def __init__(self, game):
         self.game = game
         self.config = self.game.config
+        self.text_cache = self.config.get_text_cache()
 
-        try:
-            font_name_to_load = self.config.FONT_NAME
-            medium_font_size = self.config.FONT_SIZES.get('medium', 30)
-            small_font_size = self.config.FONT_SIZES.get('small', 18)
-
-            if font_name_to_load and os.path.exists(font_name_to_load):
-                self.font = pygame.font.Font(font_name_to_load, medium_font_size)
-                self.small_font = pygame.font.Font(font_name_to_load, small_font_size)
-            else:
-                if font_name_to_load and font_name_to_load.lower() != 'none':
-                     pass
-                fallback_font_name_ui = "arial"
-                if font_name_to_load and font_name_to_load.lower() != 'none' and font_name_to_load != "":
-                    fallback_font_name_ui = font_name_to_load
-
-                self.font = pygame.font.SysFont(fallback_font_name_ui, medium_font_size)
-                self.small_font = pygame.font.SysFont(fallback_font_name_ui, small_font_size)
-        except Exception as e:
-            self.font = pygame.font.Font(None, 30)
-            self.small_font = pygame.font.Font(None, 18)
+        # Tanpa FONT_NAME, HUD memakai SysFont "arial" (seperti sebelumnya); font dibagi lewat registry
+        font_registry = self.config.get_font_registry()
+        hud_font_name = self.config.FONT_NAME or "arial"
+        self.font = font_registry.get(self.config.FONT_SIZES.get('medium', 30), name=hud_font_name)
+        self.small_font = font_registry.get(self.config.FONT_SIZES.get('small', 18), name=hud_font_name)
 
     def update_display_info(self): # <--- TAMBAHKAN METODE INI
         """
@@ -44,7 +29,7 @@ class UI:
 
     def render(self, screen):
         # Tampilkan Koin
-        coins_text_surface = self.font.render(f"Koin: {self.game.wallet}", True, self.config.COLORS.get('text_selected', (255,255,0)))
+        coins_text_surface = self.text_cache.render(self.font, f"Koin: {self.game.wallet}", self.config.COLORS.get('text_selected', (255,255,0)))
         screen.blit(coins_text_surface, (10, 10))
 
         # Tampilkan Lokasi
@@ -65,7 +50,7 @@ class UI:
 
         location_text_surface = None # Inisialisasi untuk menghindari UnboundLocalError
         if current_location_name != "N/A":
-            location_text_surface = self.small_font.render(f"Lokasi: {current_location_name}", True, self.config.COLORS.get('white', (255,255,255)))
+            location_text_surface = self.text_cache.render(self.small_font, f"Lokasi: {current_location_name}", self.config.COLORS.get('white', (255,255,255)))
             screen.blit(location_text_surface, (10, self.font.get_height() + 15))
 
         # --- Tambahan: Informasi Kapal dan Inventaris di Fishing State ---
@@ -77,7 +62,7 @@ class UI:
 
             # Kecepatan Kapal
             speed_text = f"Kecepatan: {int(self.game.boat.current_speed_value)}"
-            speed_surface = self.small_font.render(speed_text, True, self.config.COLORS.get('white'))
+            speed_surface = self.text_cache.render(self.small_font, speed_text, self.config.COLORS.get('white'))
             screen.blit(speed_surface, (10, current_y_offset))
             current_y_offset += speed_surface.get_height() + 5
 
@@ -85,13 +70,13 @@ class UI:
             current_fish_count = len(self.game.inventory.fish_list)
             max_capacity = self.game.boat.current_capacity_value
             capacity_text = f"Ikan: {current_fish_count}/{max_capacity}"
-            capacity_surface = self.small_font.render(capacity_text, True, self.config.COLORS.get('white'))
+            capacity_surface = self.text_cache.render(self.small_font, capacity_text, self.config.COLORS.get('white'))
             screen.blit(capacity_surface, (10, current_y_offset))
             current_y_offset += capacity_surface.get_height() + 5
 
             # Panjang Kail
             line_length_text = f"Panjang Kail: {int(self.game.boat.current_line_length_value)}m"
-            line_length_surface = self.small_font.render(line_length_text, True, self.config.COLORS.get('white'))
+            line_length_surface = self.text_cache.render(self.small_font, line_length_text, self.config.COLORS.get('white'))
             screen.blit(line_length_surface, (10, current_y_offset))
             current_y_offset += line_length_surface.get_height() + 5 # Tambahkan offset untuk elemen berikutnya
 
@@ -107,7 +92,7 @@ class UI:
             fish_rarity = hooked_fish_data.get('rarity', 'N/A') if isinstance(hooked_fish_data, dict) else getattr(hooked_fish_data, 'rarity', 'N/A')
 
             fish_info_text = f"TERKAIT: {fish_name} ({fish_rarity})"
-            fish_info_surface = self.font.render(fish_info_text, True, self.config.COLORS.get('legendary'))
+            fish_info_surface = self.text_cache.render(self.font, fish_info_text, self.config.COLORS.get('legendary'))
             fish_info_rect = fish_info_surface.get_rect(midtop=(self.config.SCREEN_WIDTH // 2, 10))
             screen.blit(fish_info_surface, fish_info_rect)
 
@@ -130,5 +115,5 @@ class UI:
                 fill_width = bar_width * depth_percent
                 pygame.draw.rect(screen, self.config.COLORS.get('blue'), (bar_x, bar_y, fill_width, bar_height))
 
-                depth_text_surface = self.small_font.render("Kedalaman", True, self.config.COLORS.get('white'))
+                depth_text_surface = self.text_cache.render(self.small_font, "Kedalaman", self.config.COLORS.get('white'))
                 screen.blit(depth_text_surface, (bar_x + bar_width // 2 - depth_text_surface.get_width() // 2, bar_y + bar_height + 3))
\ No newline at end of file